@@ -16,11 +16,12 @@ class TeamAward(object):
 class IndividualAward(object):
     """An award given to an individual."""
 
-    def __init__(self, team):
-        """Initialize a TeamAward object."""
-        self.team = team
-        self.league = team.league
-        self.year = team.cosmos.year
+    def __init__(self, player, league):
+        """Initialize an IndividualAward object."""
+        self.player = player
+        self.team = player.career.team
+        self.league = league
+        self.year = league.cosmos.year
 
 
 class Pennant(TeamAward):
@@ -29,4 +30,24 @@ class Pennant(TeamAward):
     def __init__(self, team):
         """Initialize a Pennant object."""
         super(Pennant, self).__init__(team)
-        self.team.season.pennant = self
\ No newline at end of file
+        self.team.season.pennant = self
+
+
+class BattingTitle(IndividualAward):
+    """A batting title awarded to the league's qualified leader in batting average."""
+
+    def __init__(self, player, league, batting_average):
+        """Initialize a BattingTitle object."""
+        super(BattingTitle, self).__init__(player, league)
+        self.batting_average = batting_average
+        player.career.statistics.batting_titles.append(self)
+
+
+class HomeRunTitle(IndividualAward):
+    """A home-run title awarded to the league's leader in home runs."""
+
+    def __init__(self, player, league, home_runs):
+        """Initialize a HomeRunTitle object."""
+        super(HomeRunTitle, self).__init__(player, league)
+        self.home_runs = home_runs
+        player.career.statistics.home_run_titles.append(self)
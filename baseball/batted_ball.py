@@ -1,5 +1,6 @@
 import math
-import random
+import numpy
+from clock import seconds
 
 
 class BattedBall(object):
@@ -38,7 +39,7 @@ class BattedBall(object):
         self.location = [0, 0]
         self.final_location = None
         self.height = 3.5
-        self.time_since_contact = 0.0  # Adjusted by at_bat._transpire()
+        self.tick = 0  # Ticks of the playing-action clock since contact; advanced by playing_action.enact()
         self.speed = exit_speed
         self.obligated_fielder = None
         self.fielder_with_chance = None
@@ -62,12 +63,12 @@ class BattedBall(object):
         self.ground_rule_incurred = False
         # This attribute is dynamic, and used so that multiple fly outs aren't awarded by umpire.officiate()
         self.fly_out_call_given = False
-        # Prepare a dictionary that will map timesteps to batted ball
-        # x-, y-, and z-coordinates; modified by compute_full_trajectory()
-        self.position_at_timestep = {}
-        # And one that will map timesteps to batted ball velocity, in
-        # mph; modified by compute_full_trajectory()
-        self.x_velocity_at_timestep = {}
+        # Prepare a list that will hold the batted ball's x-, y-, and z-coordinates
+        # at each tick; modified by compute_full_trajectory()
+        self.position_at_tick = []
+        # And one that will hold its velocity at each tick, in mph; modified by
+        # compute_full_trajectory()
+        self.x_velocity_at_tick = []
         # This dictionary is used by players to call off other players
         # whose positions have less fielding priority
         self.fielding_priorities = {
@@ -78,158 +79,41 @@ class BattedBall(object):
         self.compute_full_trajectory()
         self.classify_self()
 
+    @property
+    def time_since_contact(self):
+        """Return the time since contact, in seconds."""
+        return seconds(self.tick)
+
     def compute_full_trajectory(self):
-        # Enact a timestep-by-timestep physics simulation of the ball's
-        # full course, recording its x-, y-, and z-coordinates at each
-        # timestep; first, set initial values at point of contact
-        x, y = 0, 1.0668  # Coordinates at point of contact, in meters
-        time_since_contact = 0.0  # Time at point of contact
-        v = self.exit_speed * 0.44704  # Convert mph to m/s
-        g = 9.81  # Standard gravitational acceleration in m/s
-        th = math.radians(self.vertical_launch_angle)
-        vx = v * math.cos(th)  # Initial horizontal component of velocity
-        vy = v * math.sin(th)  # Initial vertical component of velocity
-        m = self.ball.weight * 0.0283495  # Convert ounces to kg
-        rho = 1.2  # Air density -- TODO change depending on weather, altitude
-        C = 0.3  # Drag coefficient  -- TODO change depending on certain things
-        A = 0.004208351855042743  # Cross-sectional area of ball in meters
-        D = (rho * C * A) / 2  # Drag
-        COR = 0.48  # Coefficient of restitution TODO should be self.field.COR[(x, y)]
-        COF = 0.31  # Coefficient of friction TODO should be self.field.COF[(x, y)]
-        ax = -(D/m)*v*vx  # Initial horizontal component of acceleration
-        ay = -g-(D/m)*v*vy  # Initial vertical component of acceleration
-        timestep = 0.1
-        # Record position at the initial timestep -- [NOTE: While it is
-        # convenient for the physics computation to call the the horizontal
-        # axis 'x' and the vertical axis 'y', in the baseball simulation it
-        # makes more sense to call the vertical axis 'z', the axis moving
-        # from home plate to center field 'y', and the axis moving from
-        # third base to first base 'x'. As such, we convert the physics-
-        # sim 'y' values to coordinate 'z' values, and then consider the
-        # swing's horizontal launch angle to compute the additional
-        # coordinate 'x' and 'y' values.]
-        coordinate_x = 0.0
-        coordinate_y = 0.0  # Right over home plate still
-        coordinate_z = 3.5
-        self.position_at_timestep[0.0] = coordinate_x, coordinate_y, coordinate_z
-        self.x_velocity_at_timestep[0.0] = v * 2.23694  # Convert to mph
-        # Simulate movement of the ball up to the point that it "stops" -- to
-        # avoid computational overkill, we say that a ball has stopped once
-        # its horizontal component of velocity falls below 1 m/s and it is not
-        # six or more inches in the air -- or contacts the foul pole, in which
-        # case we know a home run will be called and the rest of the trajectory
-        # is irrelevant and thus not worth computing
-        while (vx >= 1 or y > 0.1524 or time_since_contact < 0.6) and not self.foul_pole_contact_timestep:
-            # Increment time
-            last_timestep = time_since_contact
-            time_since_contact += timestep
-            # If ball hit the ground on the last timestep, make
-            # it bounce
-            if y <= 0:
-                # If this was the first time the ball hit the ground,
-                # record distance in feet
-                if self.true_distance is None:
-                    self.true_distance = int(x * 3.28084)
-                    self.true_landing_point = int(coordinate_x), int(coordinate_y)
-                    self.hang_time = time_since_contact
-                if not self.landing_timestep:
-                    self.landing_timestep = time_since_contact-timestep  # The landing actually happened last timestep
-                elif not self.second_landing_timestep:
-                    self.second_landing_timestep = time_since_contact-timestep
-                vy *= -1  # Reverse vertical component of velocity
-                vy *= COR  # Adjust for coefficient of restitution of the turf
-                vx *= COF  # Adjust for friction of the turf
-                v = math.sqrt(vx**2 + vy**2)
-            # If a ball hit the foul pole on last timestep, make note of it -- this will be called
-            # a home run on this timestep by umpire.officiate()
-            if abs(coordinate_x) >= 226 and int(coordinate_x) == int(coordinate_y):
-                self.foul_pole_contact_timestep = last_timestep
-            else:
-                # If ball hit an outfield fence or foul fence on last timestep, make it bounce off that
-                if (abs(coordinate_x) < 227 and not
-                        (self.foul_fence_contact_timestep or self.outfield_fence_contact_timestep)):
-                    # If the absolute value of the batted ball's coordinate x is greater than 226,
-                    # we know that the ball left the playing field above the fence (I think -- otherwise,
-                    # it's a reasonable approximation anyway, I think)
-                    if coordinate_x > coordinate_y or coordinate_y < 0:
-                        # Ball is heading foul -- check for whether the ball contacted a foul fence between
-                        # the last timestep and now
-                        if coordinate_y <= self.field.playing_field_lower_bound[int(coordinate_x)]:
-                            if coordinate_z <= self.field.foul_fence_height[int(coordinate_x)]:
-                                # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
-                                # coordinate of the wall -- otherwise it would be that a ball passed the
-                                # wall and was then sucked back through it to simulate hitting it
-                                self.position_at_timestep[last_timestep] = (
-                                    coordinate_x, self.field.playing_field_lower_bound[int(coordinate_x)], coordinate_z
-                                )
-                                self.foul_fence_contact_timestep = last_timestep
-                                vx *= -1  # Reverse horizontal component of velocity
-                                # TODO should be self.field.outfield_fence_COR[x] or self.field.foul_fence_COR[x]
-                                vx *= 0.6  # Adjust for coefficient of restitution of the fence
-                                # TODO should be self.field.outfield_fence_COF[x] or self.field.foul_fence_COF[x]
-                                vy *= 0.15  # Adjust for friction of the fence
-                                v = math.sqrt(vx**2 + vy**2)
-                    else:
-                        # Ball is heading fair -- check for whether the ball contacted the outfield fence
-                        # between the last timestep and now
-                        if coordinate_y >= self.field.playing_field_upper_bound[int(coordinate_x)]:
-                            if coordinate_z <= self.field.outfield_fence_height[int(coordinate_x)]:
-                                # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
-                                # coordinate of the wall -- otherwise it would be that a ball passed the
-                                # wall and was then sucked back through it to simulate hitting it
-                                self.position_at_timestep[last_timestep] = (
-                                    coordinate_x, self.field.playing_field_upper_bound[int(coordinate_x)], coordinate_z
-                                )
-                                self.outfield_fence_contact_timestep = last_timestep
-                                vx *= -1  # Reverse horizontal component of velocity
-                                # TODO should be self.field.outfield_fence_COR[x] or self.field.foul_fence_COR[x]
-                                vx *= 0.6  # Adjust for coefficient of restitution of the fence
-                                # TODO should be self.field.outfield_fence_COF[x] or self.field.foul_fence_COF[x]
-                                vy *= 0.15  # Adjust for friction of the fence
-                                v = math.sqrt(vx**2 + vy**2)
-                # Calculate new physics x and y coordinates
-                x += (vx*timestep) + (ax * timestep**2) / 2
-                y += (vy*timestep) + (ay * timestep**2) / 2
-                if y < 0:
-                    y = 0  # A necessary approximation
-                # Calculate new acceleration components
-                ax = -(D/m)*v*vx
-                ay = -g-(D/m)*v*vy
-                # Calculate new velocity components
-                vx += ax*timestep
-                vy += ay*timestep
-                v = math.sqrt(vx**2 + vy**2)
-                # Calculate, convert, and record new actual ball x-, y-, z-coordinates
-                coordinate_x = x * math.sin(math.radians(self.horizontal_launch_angle))
-                coordinate_x *= 3.28084  # Convert meters to feet
-                coordinate_y = x * math.cos(math.radians(self.horizontal_launch_angle))
-                coordinate_y *= 3.28084
-                coordinate_z = y * 3.28084
-                self.position_at_timestep[time_since_contact] = (
-                    coordinate_x, coordinate_y, coordinate_z
-                )
-                self.x_velocity_at_timestep[time_since_contact] = v * 2.23694  # Convert to mph
-                if coordinate_z > self.apex:
-                    self.apex = coordinate_z
-        # Baseball has now stopped moving (to avoid computational overkill, we
-        # say that a ball has stopped once its horizontal component of velocity
-        # falls below 1 m/s and it is not six or more inches in the air) --
-        # record resting data for a final timestep
-        time_since_contact += timestep
-        self.position_at_timestep[time_since_contact] = (
-            coordinate_x, coordinate_y, 0.0
+        """Compute the ball's full course, recording its x-, y-, and z-coordinates at each tick.
+
+        Trajectories come from the cosmos's trajectory cache, which quantizes launch conditions;
+        we adopt the quantized launch conditions, so that everything about this batted ball is
+        consistent with its trajectory.
+        """
+        trajectory_cache = self.at_bat.game.cosmos.trajectory_cache
+        self.exit_speed, self.horizontal_launch_angle, self.vertical_launch_angle = trajectory_cache.quantize(
+            exit_speed=self.exit_speed, horizontal_launch_angle=self.horizontal_launch_angle,
+            vertical_launch_angle=self.vertical_launch_angle
         )
-        self.x_velocity_at_timestep[time_since_contact] = 0.0
-        # If the ball just landed for the first time on the last timestep, the
-        # true landing point, etc., may not have been recorded (pesky bug, but
-        # I believe this, though inelegant, should fix it)
-        if self.true_distance is None:
-            self.true_distance = int(x * 3.28084)
-            self.true_landing_point = int(coordinate_x), int(coordinate_y)
-            self.hang_time = time_since_contact
-        if not self.landing_timestep:
-            self.landing_timestep = time_since_contact-timestep
-        self.final_location = [coordinate_x, coordinate_y]
+        self.speed = self.exit_speed
+        trajectory = trajectory_cache.get(
+            field=self.field, ball_weight=self.ball.weight, exit_speed=self.exit_speed,
+            horizontal_launch_angle=self.horizontal_launch_angle, vertical_launch_angle=self.vertical_launch_angle
+        )
+        # The cached trajectory is shared and read-only, but these are lists built anew for
+        # this ball, which it's free to modify as it moves
+        self.position_at_tick, self.x_velocity_at_tick = trajectory.positions_and_velocities_by_tick()
+        self.true_distance = trajectory.true_distance
+        self.true_landing_point = trajectory.true_landing_point
+        self.hang_time = trajectory.hang_time
+        self.landing_timestep = trajectory.landing_timestep
+        self.second_landing_timestep = trajectory.second_landing_timestep
+        self.outfield_fence_contact_timestep = trajectory.outfield_fence_contact_timestep
+        self.foul_fence_contact_timestep = trajectory.foul_fence_contact_timestep
+        self.foul_pole_contact_timestep = trajectory.foul_pole_contact_timestep
+        self.apex = trajectory.apex
+        self.final_location = list(trajectory.final_location)
 
     def classify_self(self):
         """Determine batted-ball type and destination."""
@@ -352,132 +236,83 @@ class BattedBall(object):
 
     def get_read_by_fielders(self):
         """Obligate fielders to their defensive responsibilities."""
-        timesteps = self.position_at_timestep.keys()
-        timesteps.sort()
-        for fielder in self.at_bat.fielders:
-            for timestep in timesteps[6:]:  # Fielders take 0.5s to react
-                height_of_ball_at_timestep = (
-                    self.position_at_timestep[timestep][2]
-                )
-                if height_of_ball_at_timestep < fielder.fieldable_ball_max_height:
-                    # Determine distance between fielder origin location and
-                    # ball location at that timestep
-                    x1, y1 = fielder.location
-                    x2, y2 = self.position_at_timestep[timestep][:2]
-                    dist_from_fielder_origin_at_timestep = math.hypot(x1-x2, y1-y2)
-                    # Determine slope between fielder origin location and
-                    # ball location at that timestep
-                    x_change = x2-x1
-                    y_change = y2-y1
-                    slope = y_change/float(x_change)
-                    # Determine the maximum rate of speed with which the fielder could
-                    # make his approach to the ball location at this timestep while
-                    # still tracking the ball properly -- the more you are moving toward
-                    # home plate, the faster you can move; the more you are moving toward
-                    # the center field wall, the less quickly you can move
-                    if x_change < 0:
-                        # You are moving left, so invert the slope so that it
-                        # becomes intuitive for our computation here
-                        temp_slope = slope * -1
-                    else:
-                        temp_slope = slope
-                    if temp_slope <= 0:
-                        # You are moving toward home plate, so you can run much
-                        # faster -- the maximum speed will be 90% of your full speed
-                        # multiplied by your ball-tracking ability (this allows
-                        # ball-tracking wizards like Willie Mays to run faster while
-                        # fielding), and the minimum speed (for when you are running
-                        # laterally) will be that percentage less ~20%
-                        temp_slope = abs(temp_slope)
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = 15-temp_slope
-                        max_speed = 0.9 * fielder.ball_tracking_ability
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            # Enforce a 0.97 ceiling to account for time spent accelerating
-                            max_rate_of_speed_to_this_location = 0.97
-                    elif temp_slope > 0:
-                        # You are moving toward the outfield fence -- here, max speed
-                        # represents lateral movement, which was minimum speed in above
-                        # block; now, minimum speed is lateral speed less ~20%
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = abs(0-temp_slope)
-                        max_speed = (0.7 * fielder.ball_tracking_ability)
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            max_rate_of_speed_to_this_location = 0.97
-                    # Determine how long it would take fielder to get to the ball
-                    # location at that timestep -- here we consider the direction of
-                    # movement in the fielder's approach to the ball location at that
-                    # timestep, which affected the maximum rate of speed that we
-                    # calculated in the above block
-                    time_to_ball_location_at_timestep = (
-                        dist_from_fielder_origin_at_timestep *
+        fielders = self.at_bat.fielders
+        # Fielders take 0.5s to react, so they only consider ticks from then on
+        ticks, timesteps, positions = self._ticks_timesteps_and_positions(start=6)
+        if ticks:
+            distances, max_rates_of_speed, fieldable = self._survey_fielder_approaches(
+                fielders=fielders, positions=positions
+            )
+            # Determine how long it would take each fielder to get to the ball location at each
+            # timestep -- here we consider the direction of movement in the fielder's approach
+            # to the ball location at that timestep, which affected the maximum rate of speed --
+            # accounting for the fact that it takes fielders 0.5 seconds to begin moving once the
+            # ball is hit
+            full_speed_seconds_per_foot = numpy.array(
+                [fielder.person.body.full_speed_seconds_per_foot for fielder in fielders]
+            )[:, numpy.newaxis]
+            times_to_ball_location = distances * (full_speed_seconds_per_foot * max_rates_of_speed) + 0.5
+            # Check where each fielder could make it to the ball location in time to potentially field it
+            reachable = fieldable & (times_to_ball_location <= numpy.array(timesteps))
+            can_reach = reachable.any(axis=1).tolist()
+            earliest_reachable_step = reachable.argmax(axis=1).tolist()
+            last_step_is_fieldable = fieldable[:, -1].tolist()
+            for i, fielder in enumerate(fielders):
+                if can_reach[i]:
+                    k = earliest_reachable_step[i]
+                    tick, timestep = ticks[k], timesteps[k]
+                    dist_from_fielder_origin_at_timestep = float(distances[i, k])
+                    max_rate_of_speed_to_this_location = float(max_rates_of_speed[i, k])
+                    # Note whether the fielder would be attempting to record a fly out if
+                    # they do end up playing the ball in the manner decided here -- here we
+                    # allow for a two-timestep buffer, so that baserunners don't have perfect
+                    # knowledge that, e.g., an actual close one-hopper wasn't going to be fly-out attempt
+                    if timestep < self.landing_timestep+0.21:
+                        fielder.attempting_fly_out = True
+                    elif self.second_landing_timestep and timestep < self.second_landing_timestep:
+                        # Depending on the rules enforced for this game, bounding balls
+                        # could also represent fly-out opportunities
+                        if self._attempting_fly_out_on_a_bounce(location=self.position_at_tick[tick]):
+                            fielder.attempting_fly_out = True
+                    # Note how long it would take the fielder to reach the location of
+                    # the fielding chance, which is used below to determine the obligated
+                    # fielder (though this person may be called off)
+                    fielder.time_needed_to_field_ball = float(times_to_ball_location[i, k])
+                    fielder.tick_of_planned_fielding_attempt = tick
+                    # Set location where fielding attempt will occur, if this
+                    # fielder ends up playing the ball
+                    fielder.immediate_goal = self.position_at_tick[tick]
+                    # Set speed, in feet per timestep, that fielder will act
+                    # at in his approach to the immediate goal location (again,
+                    # should he end up fielding the ball)
+                    fielder.dist_per_timestep = (
+                        (dist_from_fielder_origin_at_timestep/(timestep-0.5)) * 0.1
+                    )
+                    fielder.relative_rate_of_speed = (
+                        1000 * fielder.dist_per_timestep *
                         (fielder.person.body.full_speed_seconds_per_foot * max_rate_of_speed_to_this_location)
                     )
-                    # Account for the fact that it takes fielders 0.5 seconds to begin
-                    # moving once the ball is hit
-                    time_to_ball_location_at_timestep += 0.5
-                    # Check if fielder could make it to that ball location in time
-                    # to potentially field it
-                    if time_to_ball_location_at_timestep <= timestep:
-                        # Note whether the fielder would be attempting to record a fly out if
-                        # they do end up playing the ball in the manner decided here -- here we
-                        # allow for a two-timestep buffer, so that baserunners don't have perfect
-                        # knowledge that, e.g., an actual close one-hopper wasn't going to be fly-out attempt
-                        if timestep < self.landing_timestep+0.21:
-                            fielder.attempting_fly_out = True
-                        elif self.second_landing_timestep and timestep < self.second_landing_timestep:
-                            # Depending on the rules enforced for this game, bounding balls
-                            # could also represent fly-out opportunities
-                            ball_in_foul_territory_at_this_timestep = bool(y2 < 0 or abs(x2) > y2)
-                            if ball_in_foul_territory_at_this_timestep:
-                                if self.at_bat.game.rules.foul_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                            else:
-                                if self.at_bat.game.rules.fair_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                        # Note how long it would take the fielder to reach the location of
-                        # the fielding chance, which is used below to determine the obligated
-                        # fielder (though this person may be called off)
-                        fielder.time_needed_to_field_ball = time_to_ball_location_at_timestep
-                        fielder.timestep_of_planned_fielding_attempt = timestep
-                        # Set location where fielding attempt will occur, if this
-                        # fielder ends up playing the ball
-                        fielder.immediate_goal = self.position_at_timestep[timestep]
-                        # Set speed, in feet per timestep, that fielder will act
-                        # at in his approach to the immediate goal location (again,
-                        # should he end up fielding the ball)
-                        fielder.dist_per_timestep = (
-                            (dist_from_fielder_origin_at_timestep/(timestep-0.5)) * 0.1
-                        )
-                        fielder.relative_rate_of_speed = (
-                            1000 * fielder.dist_per_timestep *
-                            (fielder.person.body.full_speed_seconds_per_foot * max_rate_of_speed_to_this_location)
-                        )
-                        break
-                    elif timestep == timesteps[-1]:
-                        # Fielder can only make it to the ball after it has stopped
-                        # moving, so the time needed to field it is simply the time
-                        # it would take the fielder to run full speed to the point
-                        # where the ball will come to a stop
-                        fielder.time_needed_to_field_ball = max(timestep, time_to_ball_location_at_timestep)
-                        actual_timestep_it_will_happen = timestep
-                        while actual_timestep_it_will_happen < fielder.time_needed_to_field_ball:
-                            actual_timestep_it_will_happen += 0.1
-                        fielder.timestep_of_planned_fielding_attempt = actual_timestep_it_will_happen
-                        # Set location where fielding attempt will occur, if this
-                        # fielder ends up playing the ball
-                        fielder.immediate_goal = self.position_at_timestep[timestep]
-                        # This fielder will act at full speed in his approach to the
-                        # immediate goal location (again, should he end up fielding
-                        # the ball)
-                        fielder.dist_per_timestep = (
-                            (0.1/fielder.person.body.full_speed_seconds_per_foot) * max_rate_of_speed_to_this_location
-                        )
-                        fielder.relative_rate_of_speed = 90
+                elif last_step_is_fieldable[i]:
+                    # Fielder can only make it to the ball after it has stopped
+                    # moving, so the time needed to field it is simply the time
+                    # it would take the fielder to run full speed to the point
+                    # where the ball will come to a stop
+                    tick, timestep = ticks[-1], timesteps[-1]
+                    max_rate_of_speed_to_this_location = float(max_rates_of_speed[i, -1])
+                    fielder.time_needed_to_field_ball = max(timestep, float(times_to_ball_location[i, -1]))
+                    fielder.tick_of_planned_fielding_attempt = self._first_tick_at_or_after(
+                        tick=tick, time=fielder.time_needed_to_field_ball
+                    )
+                    # Set location where fielding attempt will occur, if this
+                    # fielder ends up playing the ball
+                    fielder.immediate_goal = self.position_at_tick[tick]
+                    # This fielder will act at full speed in his approach to the
+                    # immediate goal location (again, should he end up fielding
+                    # the ball)
+                    fielder.dist_per_timestep = (
+                        (0.1/fielder.person.body.full_speed_seconds_per_foot) * max_rate_of_speed_to_this_location
+                    )
+                    fielder.relative_rate_of_speed = 90
         self.obligated_fielder = (
             min(self.at_bat.fielders, key=lambda f: f.time_needed_to_field_ball)
         )
@@ -487,132 +322,71 @@ class BattedBall(object):
         """Obligate a new fielder to field the ball after it was not cleanly fielded."""
         self.fielder_with_chance = None
         self.obligated_fielder = None
-        timesteps = self.position_at_timestep.keys()
-        timesteps.sort()
-        index_of_current_timestep = timesteps.index(self.time_since_contact)
         available_fielders = [f for f in self.at_bat.fielders if f not in (
             self.at_bat.playing_action.covering_first, self.at_bat.playing_action.covering_second,
             self.at_bat.playing_action.covering_third, self.at_bat.playing_action.covering_home
         )]
-        fielder_max_rates_of_speed = {}
         for fielder in available_fielders:
             fielder.attempting_fly_out = False
-            for timestep in timesteps[index_of_current_timestep+1:]:
-                # 'index_of_current_timestep+1' because the fielder won't begin moving until
-                # the while-loop iteration representing the *next* timestep -- sort of like how
-                # we had to add 0.5s to all considerations in batted_ball.get_read_by_fielders to
-                # simulate their delayed reaction time, here we have to add 0.1s to all considerations
-                # to accommodate the control sequence of playing_action._transpire()
-                height_of_ball_at_timestep = (
-                    self.position_at_timestep[timestep][2]
-                )
-                if height_of_ball_at_timestep < fielder.fieldable_ball_max_height:
-                    # Determine distance between fielder current location and
-                    # ball location at that timestep
-                    x1, y1 = fielder.location
-                    x2, y2 = self.position_at_timestep[timestep][:2]
-                    dist_from_current_fielder_location_at_timestep = math.hypot(x1-x2, y1-y2)
-                    # Determine slope between fielder origin location and
-                    # ball location at that timestep
-                    x_change = x2-x1
-                    y_change = y2-y1
-                    if x_change == 0:
-                        if random.random() > 0.5:
-                            x_change = 0.001
-                        else:
-                            x_change = -0.001
-                    while y_change == 0:
-                        if random.random() > 0.5:
-                            y_change = 0.001
-                        else:
-                            y_change = -0.001
-                    slope = y_change/float(x_change)
-                    # Determine the maximum rate of speed with which the fielder could
-                    # make his approach to the ball location at this timestep while
-                    # still tracking the ball properly -- the more you are moving toward
-                    # home plate, the faster you can move; the more you are moving toward
-                    # the center field wall, the less quickly you can move
-                    if x_change < 0:
-                        # You are moving left, so invert the slope so that it
-                        # becomes intuitive for our computation here
-                        temp_slope = slope * -1
-                    else:
-                        temp_slope = slope
-                    if temp_slope <= 0:
-                        # You are moving toward home plate, so you can run much
-                        # faster -- the maximum speed will be 90% of your full speed
-                        # multiplied by your ball-tracking ability (this allows
-                        # ball-tracking wizards like Willie Mays to run faster while
-                        # fielding), and the minimum speed (for when you are running
-                        # laterally) will be that percentage less ~20%
-                        temp_slope = abs(temp_slope)
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = 15-temp_slope
-                        max_speed = 0.9 * fielder.ball_tracking_ability
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            # Enforce a 0.97 ceiling to account for time spent accelerating
-                            max_rate_of_speed_to_this_location = 0.97
-                    elif temp_slope > 0:
-                        # You are moving toward the outfield fence -- here, max speed
-                        # represents lateral movement, which was minimum speed in above
-                        # block; now, minimum speed is lateral speed less ~20%
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = abs(0-temp_slope)
-                        max_speed = (0.7 * fielder.ball_tracking_ability)
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            max_rate_of_speed_to_this_location = 0.97
-                    fielder_max_rates_of_speed[fielder] = max_rate_of_speed_to_this_location
-                    # Determine how long it would take fielder to get to the ball
-                    # location at that timestep -- here we consider the direction of
-                    # movement in the fielder's approach to the ball location at that
-                    # timestep, which affected the maximum rate of speed that we
-                    # calculated in the above block
-                    full_speed_dist_per_timestep = 0.1/fielder.person.body.full_speed_seconds_per_foot
-                    full_speed_dist_per_timestep *= max_rate_of_speed_to_this_location
-                    time_to_ball_location_at_timestep = (
-                        dist_from_current_fielder_location_at_timestep / full_speed_dist_per_timestep
-                    )
-                    time_to_ball_location_at_timestep += fielder.reorienting_after_fielding_miss
-                    time_to_ball_location_at_timestep += 0.1  # For reason stated at beginning of for loop
-                    # Check if fielder could make it to that ball location in time
-                    # to potentially field it
-                    if time_to_ball_location_at_timestep <= timestep-self.time_since_contact:
-                        # Note whether the fielder would be attempting to record a fly out if
-                        # they do end up playing the ball in the manner decided here
-                        if timestep < self.landing_timestep:
+        # Fielders only consider ticks after the current one, because a fielder won't begin
+        # moving until the while-loop iteration representing the *next* tick -- sort of like
+        # how we had to add 0.5s to all considerations in batted_ball.get_read_by_fielders() to
+        # simulate their delayed reaction time, here we have to add 0.1s to all considerations
+        # to accommodate the control sequence of playing_action._transpire()
+        ticks, timesteps, positions = self._ticks_timesteps_and_positions(start=self.tick+1)
+        # The maximum rate of speed with which each fielder would approach the ball
+        fielder_max_rates_of_speed = {}
+        if ticks:
+            distances, max_rates_of_speed, fieldable = self._survey_fielder_approaches(
+                fielders=available_fielders, positions=positions
+            )
+            # Determine how long it would take each fielder to get to the ball location at each
+            # timestep, from where they are now
+            full_speed_dists_per_timestep = 0.1/numpy.array(
+                [fielder.person.body.full_speed_seconds_per_foot for fielder in available_fielders]
+            )[:, numpy.newaxis]
+            full_speed_dists_per_timestep = full_speed_dists_per_timestep * max_rates_of_speed
+            reorienting_after_fielding_miss = numpy.array(
+                [fielder.reorienting_after_fielding_miss for fielder in available_fielders]
+            )[:, numpy.newaxis]
+            times_to_ball_location = distances / full_speed_dists_per_timestep + reorienting_after_fielding_miss + 0.1
+            # Check where each fielder could make it to the ball location in time to potentially field it
+            reachable = fieldable & (times_to_ball_location <= numpy.array(timesteps)-self.time_since_contact)
+            can_reach = reachable.any(axis=1).tolist()
+            earliest_reachable_step = reachable.argmax(axis=1).tolist()
+            any_step_is_fieldable = fieldable.any(axis=1).tolist()
+            last_fieldable_step = (fieldable.shape[1]-1 - fieldable[:, ::-1].argmax(axis=1)).tolist()
+            for i, fielder in enumerate(available_fielders):
+                if can_reach[i]:
+                    k = earliest_reachable_step[i]
+                    tick, timestep = ticks[k], timesteps[k]
+                    fielder_max_rates_of_speed[fielder] = float(max_rates_of_speed[i, k])
+                    # Note whether the fielder would be attempting to record a fly out if
+                    # they do end up playing the ball in the manner decided here
+                    if timestep < self.landing_timestep:
+                        fielder.attempting_fly_out = True
+                    elif self.second_landing_timestep and timestep < self.second_landing_timestep:
+                        # Depending on the rules enforced for this game, bounding balls
+                        # could also represent fly-out opportunities
+                        if self._attempting_fly_out_on_a_bounce(location=self.position_at_tick[tick]):
                             fielder.attempting_fly_out = True
-                        elif self.second_landing_timestep and timestep < self.second_landing_timestep:
-                            # Depending on the rules enforced for this game, bounding balls
-                            # could also represent fly-out opportunities
-                            ball_in_foul_territory_at_this_timestep = (
-                                bool(y2 < 0 or abs(x2) > y2)
-                            )
-                            if ball_in_foul_territory_at_this_timestep:
-                                if self.at_bat.game.rules.foul_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                            else:
-                                if self.at_bat.game.rules.fair_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                        # Note how long it would take the fielder to reach the location of
-                        # the fielding chance, which is used below to determine the obligated
-                        # fielder (though this person may be called off)
-                        fielder.time_needed_to_field_ball = timestep-self.time_since_contact
-                        fielder.timestep_of_planned_fielding_attempt = timestep
-                        break
-                    elif timestep == timesteps[-1]:
-                        # Fielder can only make it to the ball after it has stopped
-                        # moving, so the time needed to field it is simply the time
-                        # it would take the fielder to run full speed to the point
-                        # where the ball will come to a stop
-                        fielder.time_needed_to_field_ball = time_to_ball_location_at_timestep+self.time_since_contact
-                        actual_timestep_it_will_happen = timestep
-                        while actual_timestep_it_will_happen < fielder.time_needed_to_field_ball:
-                            actual_timestep_it_will_happen += 0.1
-                        fielder.timestep_of_planned_fielding_attempt = actual_timestep_it_will_happen
+                    # Note how long it would take the fielder to reach the location of
+                    # the fielding chance, which is used below to determine the obligated
+                    # fielder (though this person may be called off)
+                    fielder.time_needed_to_field_ball = timestep-self.time_since_contact
+                    fielder.tick_of_planned_fielding_attempt = tick
+                    continue
+                if any_step_is_fieldable[i]:
+                    fielder_max_rates_of_speed[fielder] = float(max_rates_of_speed[i, last_fieldable_step[i]])
+                if fieldable[i, -1]:
+                    # Fielder can only make it to the ball after it has stopped
+                    # moving, so the time needed to field it is simply the time
+                    # it would take the fielder to run full speed to the point
+                    # where the ball will come to a stop
+                    fielder.time_needed_to_field_ball = float(times_to_ball_location[i, -1])+self.time_since_contact
+                    fielder.tick_of_planned_fielding_attempt = self._first_tick_at_or_after(
+                        tick=ticks[-1], time=fielder.time_needed_to_field_ball
+                    )
         self.obligated_fielder = min(available_fielders, key=lambda f: f.time_needed_to_field_ball)
         if self.obligated_fielder.playing_the_ball:
             if self.at_bat.game.trace:
@@ -631,13 +405,13 @@ class BattedBall(object):
         # goals, thereby writing over the temporary .immediate_goal, etc., set during the above
         # computation -- rather, we want them to retain their goals and only the one who now
         # will play the ball to set the goal decided in the above computation
-        if self.obligated_fielder.timestep_of_planned_fielding_attempt in self.position_at_timestep:
+        if self.obligated_fielder.tick_of_planned_fielding_attempt < len(self.position_at_tick):
             self.obligated_fielder.immediate_goal = (
-                self.position_at_timestep[self.obligated_fielder.timestep_of_planned_fielding_attempt]
+                self.position_at_tick[self.obligated_fielder.tick_of_planned_fielding_attempt]
             )
         else:
-            # Fielder is planning to field the ball after it has stopped, thus his planned timestep
-            # for the fielding attempt in not in batted_ball.position_at_timestep
+            # Fielder is planning to field the ball after it has stopped, thus his planned tick
+            # for the fielding attempt is beyond the end of batted_ball.position_at_tick
             self.obligated_fielder.immediate_goal = self.final_location
         fielder_full_speed_dist_per_timestep = 0.1/self.obligated_fielder.person.body.full_speed_seconds_per_foot
         fielder_full_speed_dist_per_timestep *= fielder_max_rates_of_speed[self.obligated_fielder]
@@ -655,8 +429,72 @@ class BattedBall(object):
                 fielder.attempting_fly_out = False
         self.obligated_fielder.decide_immediate_goal(playing_action=self.at_bat.playing_action)
 
+    def _ticks_timesteps_and_positions(self, start):
+        """Return the ticks of this ball's course from the given one on, the timesteps at them, and an array of its positions at them."""
+        ticks = range(start, len(self.position_at_tick))
+        timesteps = [seconds(tick) for tick in ticks]
+        positions = numpy.array(self.position_at_tick[start:], dtype=float)
+        return ticks, timesteps, positions
+
+    @staticmethod
+    def _survey_fielder_approaches(fielders, positions):
+        """Return how each fielder could approach the ball at each of the given positions.
+
+        This returns three (fielder, position) arrays: the distance from the fielder's location
+        to the ball's; the maximum rate of speed with which the fielder could make his approach
+        to that location while still tracking the ball properly; and whether the ball would be
+        low enough there for the fielder to field it.
+        """
+        fielder_locations = numpy.array([fielder.location for fielder in fielders], dtype=float)
+        x_change = positions[:, 0] - fielder_locations[:, 0:1]
+        y_change = positions[:, 1] - fielder_locations[:, 1:2]
+        distances = numpy.hypot(x_change, y_change)
+        # Determine the slope of each approach, as if the fielder were moving rightward (so that
+        # it's intuitive for our computation here); for a fielder directly below or above the
+        # ball, the slope is computed as if he were a hair to one side of it
+        slopes = y_change / numpy.where(x_change == 0, 0.001, numpy.abs(x_change))
+        # The more you are moving toward home plate, the faster you can move; the more you are
+        # moving toward the center field wall, the less quickly you can move
+        ball_tracking_ability = numpy.array(
+            [fielder.ball_tracking_ability for fielder in fielders]
+        )[:, numpy.newaxis]
+        steepness = numpy.minimum(numpy.abs(slopes), 15)
+        max_rates_of_speed = numpy.where(
+            slopes <= 0,
+            # You are moving toward home plate, so you can run much faster -- the maximum
+            # speed will be 90% of your full speed multiplied by your ball-tracking ability
+            # (this allows ball-tracking wizards like Willie Mays to run faster while
+            # fielding), and the minimum speed (for when you are running laterally) will
+            # be that percentage less ~20%
+            0.9*ball_tracking_ability - (0.013333333333333333 * (15-steepness)),
+            # You are moving toward the outfield fence -- here, max speed represents lateral
+            # movement, which was minimum speed above; now, minimum speed is lateral speed less ~20%
+            0.7*ball_tracking_ability - (0.013333333333333333 * steepness)
+        )
+        # Enforce a 0.97 ceiling to account for time spent accelerating
+        max_rates_of_speed = numpy.minimum(max_rates_of_speed, 0.97)
+        fieldable_ball_max_height = numpy.array(
+            [fielder.fieldable_ball_max_height for fielder in fielders]
+        )[:, numpy.newaxis]
+        fieldable = positions[:, 2] < fieldable_ball_max_height
+        return distances, max_rates_of_speed, fieldable
+
+    def _attempting_fly_out_on_a_bounce(self, location):
+        """Return whether fielding the ball at the given location, between its first and second bounces, would be a fly-out attempt."""
+        x, y = location[:2]
+        if y < 0 or abs(x) > y:  # Foul territory
+            return self.at_bat.game.rules.foul_ball_on_first_bounce_is_out
+        return self.at_bat.game.rules.fair_ball_on_first_bounce_is_out
+
+    @staticmethod
+    def _first_tick_at_or_after(tick, time):
+        """Return the first tick, counting up from the given one, at which the given time has elapsed."""
+        while seconds(tick) < time:
+            tick += 1
+        return tick
+
     def move(self):
-        """Move the batted ball along its course for one timestep."""
+        """Move the batted ball along its course for one tick."""
         if self.at_the_foul_wall or self.at_the_outfield_wall:
             # A batted ball can't be at the wall for more than a single timestep, so
             # set these to False again
@@ -682,19 +520,19 @@ class BattedBall(object):
             # Overwrite final resting location, in case someone needs to use that as their
             # immediate goal
             self.final_location = [self.location[0], self.location[1]]
-            # Overwrite self.position_at_timestep and self.x_velocity_at_timestep
-            # for what actually occurred at this timestep
-            self.position_at_timestep[self.time_since_contact] = (
-                self.location[0], self.location[1], self.height
+            # Overwrite self.position_at_tick and self.x_velocity_at_tick
+            # for what actually occurred at this tick
+            self._record_at_this_tick(
+                position=(self.location[0], self.location[1], self.height), x_velocity=self.speed
             )
-            self.x_velocity_at_timestep[self.time_since_contact] = self.speed
         elif not self.touched_by_fielder:
             # Since we've already computed the ball's full trajectory, we
-            # simply look up where it will be at this timestep
-            if self.time_since_contact in self.position_at_timestep:
-                self.location = self.position_at_timestep[self.time_since_contact][:2]
-                self.height = self.position_at_timestep[self.time_since_contact][-1]
-                self.speed = self.x_velocity_at_timestep[self.time_since_contact]
+            # simply look up where it will be at this tick
+            if self.tick < len(self.position_at_tick):
+                position = self.position_at_tick[self.tick]
+                self.location = position[:2]
+                self.height = position[-1]
+                self.speed = self.x_velocity_at_tick[self.tick]
                 # Check if the ball has stopped moving
                 if self.speed == 0 and self.height == 0:
                     self.stopped = True
@@ -735,35 +573,13 @@ class BattedBall(object):
                 # it may potentially have left the playing field at this timestep, so
                 # check for that
                 if not (self.contacted_foul_pole or self.contacted_foul_fence or self.contacted_outfield_wall):
-                    if self.location[0] < -226:
-                        # Ball crossed the plane of the playing field
-                        # sometime during the last timestep, right at the
-                        # junction of the foul and outfield walls -- we will
-                        # have to approximate where it crossed the plane, which
-                        # due to the control sequence of elifs below will
-                        # favor home runs ever so slightly
-                        playing_field_lower_bound_at_this_x = (
-                            self.field.playing_field_lower_bound[-226]
-                        )
-                        playing_field_upper_bound_at_this_x = (
-                            self.field.playing_field_upper_bound[-226]
-                        )
-                    elif self.location[0] > 226:
-                        # We will have to approximate where it crossed the plane
-                        # (see above comment block for explanation)
-                        playing_field_lower_bound_at_this_x = (
-                            self.field.playing_field_lower_bound[-226]
-                        )
-                        playing_field_upper_bound_at_this_x = (
-                            self.field.playing_field_upper_bound[-226]
-                        )
-                    else:
-                        playing_field_lower_bound_at_this_x = (
-                            self.field.playing_field_lower_bound[int(self.location[0])]
-                        )
-                        playing_field_upper_bound_at_this_x = (
-                            self.field.playing_field_upper_bound[int(self.location[0])]
-                        )
+                    # If the ball is beyond a foul pole, it crossed the plane of the playing
+                    # field sometime during the last timestep, right at the junction of the foul
+                    # and outfield walls -- the field geometry approximates where it crossed the
+                    # plane using the boundaries at the foul pole, which due to the control
+                    # sequence of elifs below will favor home runs ever so slightly
+                    playing_field_lower_bound_at_this_x = self.field.geometry.lower_bound_at(self.location[0])
+                    playing_field_upper_bound_at_this_x = self.field.geometry.upper_bound_at(self.location[0])
                     if 0 <= abs(playing_field_lower_bound_at_this_x-self.location[1]) < 1.5:
                         self.at_the_foul_wall = True
                         self.crossed_plane_foul = True
@@ -779,18 +595,26 @@ class BattedBall(object):
                 if ((int(self.location[0]), int(self.location[1])) in
                         self.at_bat.game.field.ground_rule_coords):
                     self.ground_rule_incurred = True
-            elif self.time_since_contact > max(self.position_at_timestep.keys()):
-                # Modify self.position_at_timestep and self.x_velocity_at_timestep to
-                # add these additional timesteps in which the ball is stopped
-                self.position_at_timestep[self.time_since_contact] = (
-                    self.location[0], self.location[1], self.height
-                )
-                self.stopped = True  # Ball has stopped moving, so nothing will change
-                self.x_velocity_at_timestep[self.time_since_contact] = self.speed
             else:
-                raise Exception("Call to BattedBall.move() for an invalid timestep: {}.".format(
-                    self.time_since_contact)
+                # Extend self.position_at_tick and self.x_velocity_at_tick to
+                # add these additional ticks in which the ball is stopped
+                self._record_at_this_tick(
+                    position=(self.location[0], self.location[1], self.height), x_velocity=self.speed
                 )
+                self.stopped = True  # Ball has stopped moving, so nothing will change
+
+    def _record_at_this_tick(self, position, x_velocity):
+        """Record the ball's position and velocity at the current tick, overwriting or extending its course."""
+        if self.tick < len(self.position_at_tick):
+            self.position_at_tick[self.tick] = position
+            self.x_velocity_at_tick[self.tick] = x_velocity
+        else:
+            # If the ball wasn't moved on some ticks in between, it stayed where it was on them
+            while len(self.position_at_tick) < self.tick:
+                self.position_at_tick.append(self.position_at_tick[-1])
+                self.x_velocity_at_tick.append(self.x_velocity_at_tick[-1])
+            self.position_at_tick.append(position)
+            self.x_velocity_at_tick.append(x_velocity)
 
     def __str__(self):
         return "{} hit by {} toward {}".format(self.type, self.batter.person.last_name, self.destination)
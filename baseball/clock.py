@@ -0,0 +1,34 @@
+import math
+
+
+# The duration of a tick of the playing-action clock, in seconds
+TICK = 0.1
+# The time since contact at each tick; these are accumulated tick by tick, rather than multiplied
+# out, so that they're the very same floats that timesteps have always been (e.g., the ones at
+# which batted-ball trajectories are recorded), and are extended as needed (see seconds())
+TIMESTEPS = [0.0]
+
+
+def seconds(tick):
+    """Return the time since contact, in seconds, at the given tick."""
+    if tick >= len(TIMESTEPS):
+        extend_timesteps(number_of_timesteps=tick+1)
+    return TIMESTEPS[tick]
+
+
+def tick_at(time):
+    """Return the tick at which the given time since contact (a timestep, in seconds) falls."""
+    return int(round(time/TICK))
+
+
+def ticks_to_elapse(duration):
+    """Return the number of ticks it will take for at least the given duration (in seconds) to elapse."""
+    if duration <= 0:
+        return 0
+    return int(math.ceil(duration/TICK))
+
+
+def extend_timesteps(number_of_timesteps):
+    """Extend TIMESTEPS so that it has at least the given number of timesteps."""
+    while len(TIMESTEPS) < number_of_timesteps:
+        TIMESTEPS.append(TIMESTEPS[-1] + TICK)
@@ -12,6 +12,13 @@
 # - weather and altitude stuff
 # - dampness of grass
 
+import numpy
+
+
+# Field geometries, keyed by their boundaries and fence heights, so that fields with identical
+# dimensions share one (see intern_geometry())
+INTERNED_GEOMETRIES = {}
+
 
 class Field(object):
     """A baseball playing field in a baseball cosmos.
@@ -21,6 +28,8 @@ class Field(object):
     parks or schools.
     """
 
+    generic_geometry = None  # Set by survey_geometry()
+
     def __init__(self, site):
         """Initialize a Field object.
 
@@ -43,27 +52,11 @@ class Field(object):
         self.structural_engineer = None
         self.general_contractor = None
 
-        # Get playing field boundaries, which represent the boundaries of
-        # the entire playing field, including fieldable foul territory,
-        # and thus can be used to determine whether a ball is fieldable
-        self.playing_field_lower_bound, self.playing_field_upper_bound = (
-            self.get_playing_field_boundaries()
-        )
-        # Get outfield and foul fence heights, which are necessary to
-        # determine whether a ball hits a fence or flies over it
-        self.outfield_fence_height = self.get_outfield_fence_height()
-        self.foul_fence_height = self.get_foul_fence_height()
-        # Get foul pole locations and heights
-        self.left_foul_pole_location = (
-            min(self.playing_field_upper_bound.keys()),
-            self.playing_field_upper_bound[min(self.playing_field_upper_bound.keys())]
-        )
-        self.right_foul_pole_location = (
-            min(self.playing_field_upper_bound.keys()),
-            self.playing_field_upper_bound[min(self.playing_field_upper_bound.keys())]
-        )
-        self.left_foul_pole_height = self.outfield_fence_height[self.left_foul_pole_location[0]]
-        self.right_foul_pole_height = self.outfield_fence_height[self.right_foul_pole_location[0]]
+        # Get the geometry of the playing field -- its boundaries, which include fieldable
+        # foul territory, and thus can be used to determine whether a ball is fieldable, and
+        # its fence heights, which determine whether a ball hits a fence or flies over it; this
+        # is shared by every field with the same dimensions
+        self.geometry = self.survey_geometry()
         # Set ground-rule coordinates TODO
         self.ground_rule_coords = set()
 
@@ -71,6 +64,40 @@ class Field(object):
         """Return string representation."""
         return self.name
 
+    @property
+    def left_foul_pole_location(self):
+        """Return the location of the left-field foul pole."""
+        return self.geometry.left_foul_pole_location
+
+    @property
+    def right_foul_pole_location(self):
+        """Return the location of the right-field foul pole."""
+        return self.geometry.right_foul_pole_location
+
+    @property
+    def left_foul_pole_height(self):
+        """Return the height of the left-field foul pole."""
+        return self.geometry.left_foul_pole_height
+
+    @property
+    def right_foul_pole_height(self):
+        """Return the height of the right-field foul pole."""
+        return self.geometry.right_foul_pole_height
+
+    @classmethod
+    def survey_geometry(cls):
+        """Return the geometry of the generic playing field, surveying it if it hasn't been already."""
+        # NOTE: like the methods below, this assumes the initial generic playing field
+        if cls.generic_geometry is None:
+            playing_field_lower_bound, playing_field_upper_bound = cls.get_playing_field_boundaries()
+            cls.generic_geometry = intern_geometry(
+                playing_field_lower_bound=playing_field_lower_bound,
+                playing_field_upper_bound=playing_field_upper_bound,
+                outfield_fence_height=cls.get_outfield_fence_height(),
+                foul_fence_height=cls.get_foul_fence_height()
+            )
+        return cls.generic_geometry
+
     @staticmethod
     def get_playing_field_boundaries():
         # NOTE: this method assumes the initial generic playing field that
@@ -135,4 +162,121 @@ class Field(object):
         foul_fence_height = {}
         for i in xrange(-226, 227):
             foul_fence_height[i] = 7.0
-        return foul_fence_height
\ No newline at end of file
+        return foul_fence_height
+
+class FieldGeometry(object):
+    """The immutable geometry of a playing field: its boundaries and fence heights.
+
+    These are surveyed at every integer x-coordinate from -X_OFFSET to X_OFFSET (the foul poles),
+    and stored in read-only arrays indexed by x-coordinate plus X_OFFSET; the query methods take
+    actual coordinates, as scalars or as arrays, and clamp them to the surveyed range. Geometries
+    should be obtained through intern_geometry(), so that identical parks share one instance.
+    """
+
+    X_OFFSET = 226
+
+    def __init__(self, playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height):
+        """Initialize a FieldGeometry object.
+
+        @param playing_field_lower_bound: A dictionary mapping x-coordinates to the y-coordinate of the
+                                          backstop or foul fence there.
+        @param playing_field_upper_bound: A dictionary mapping x-coordinates to the y-coordinate of the
+                                          outfield fence there.
+        @param outfield_fence_height: A dictionary mapping x-coordinates to the height of the outfield fence there.
+        @param foul_fence_height: A dictionary mapping x-coordinates to the height of the foul fence there.
+        """
+        x_coordinates = xrange(-self.X_OFFSET, self.X_OFFSET+1)
+        # The same values, as tuples, which the per-ball integrator indexes (see compute_trajectory())
+        # much more quickly than it could the arrays, and which serve as this geometry's interning key
+        self.boundaries = tuple(
+            tuple(float(boundary[x]) for x in x_coordinates) for boundary in (
+                playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height
+            )
+        )
+        self.playing_field_lower_bound = self._read_only_array(self.boundaries[0])
+        self.playing_field_upper_bound = self._read_only_array(self.boundaries[1])
+        self.outfield_fence_height = self._read_only_array(self.boundaries[2])
+        self.foul_fence_height = self._read_only_array(self.boundaries[3])
+        self.left_foul_pole_location = (-self.X_OFFSET, self.boundaries[1][0])
+        self.right_foul_pole_location = (self.X_OFFSET, self.boundaries[1][-1])
+        self.left_foul_pole_height = self.boundaries[2][0]
+        self.right_foul_pole_height = self.boundaries[2][-1]
+
+    def __reduce__(self):
+        """Return what's needed to pickle this geometry, which is re-interned when it's unpickled."""
+        return intern_geometry, tuple(self.boundary_dictionaries())
+
+    @staticmethod
+    def _read_only_array(values):
+        """Return a read-only array of the given values."""
+        array = numpy.array(values, dtype=float)
+        array.flags.writeable = False
+        return array
+
+    def boundary_dictionaries(self):
+        """Return this geometry's boundaries and fence heights as dictionaries keyed by x-coordinate."""
+        x_coordinates = range(-self.X_OFFSET, self.X_OFFSET+1)
+        return [dict(zip(x_coordinates, values)) for values in self.boundaries]
+
+    def index(self, x):
+        """Return the index (or array of indices) into this geometry's arrays for the given x-coordinate(s)."""
+        if numpy.isscalar(x):
+            return min(max(int(x), -self.X_OFFSET), self.X_OFFSET) + self.X_OFFSET
+        return numpy.clip(numpy.asarray(x).astype(int), -self.X_OFFSET, self.X_OFFSET) + self.X_OFFSET
+
+    def lower_bound_at(self, x):
+        """Return the y-coordinate of the backstop or foul fence at the given x-coordinate(s)."""
+        if numpy.isscalar(x):
+            return self.boundaries[0][self.index(x)]
+        return self.playing_field_lower_bound[self.index(x)]
+
+    def upper_bound_at(self, x):
+        """Return the y-coordinate of the outfield fence at the given x-coordinate(s)."""
+        if numpy.isscalar(x):
+            return self.boundaries[1][self.index(x)]
+        return self.playing_field_upper_bound[self.index(x)]
+
+    @staticmethod
+    def is_fair(x, y):
+        """Return whether the given location(s) are in fair territory."""
+        x, y = numpy.asarray(x), numpy.asarray(y)
+        return (y >= 0) & (numpy.abs(x) <= y)
+
+    def hits_foul_fence(self, x, y, z):
+        """Return whether a ball at the given location(s) is at or beyond the backstop or a foul fence, and below its top."""
+        index = self.index(x)
+        return (numpy.asarray(y) <= self.playing_field_lower_bound[index]) & (
+            numpy.asarray(z) <= self.foul_fence_height[index]
+        )
+
+    def hits_outfield_fence(self, x, y, z):
+        """Return whether a ball at the given location(s) is at or beyond the outfield fence, and below its top."""
+        index = self.index(x)
+        return (numpy.asarray(y) >= self.playing_field_upper_bound[index]) & (
+            numpy.asarray(z) <= self.outfield_fence_height[index]
+        )
+
+    def hits_wall(self, x, y, z):
+        """Return whether a ball at the given location(s) has hit any fence."""
+        return self.hits_foul_fence(x, y, z) | self.hits_outfield_fence(x, y, z)
+
+    def leaves_park(self, x, y, z):
+        """Return whether a ball at the given location(s) has cleared a fence, leaving the playing field."""
+        index = self.index(x)
+        y, z = numpy.asarray(y), numpy.asarray(z)
+        return (
+            ((y >= self.playing_field_upper_bound[index]) & (z > self.outfield_fence_height[index])) |
+            ((y <= self.playing_field_lower_bound[index]) & (z > self.foul_fence_height[index]))
+        )
+
+
+def intern_geometry(playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height):
+    """Return the geometry with the given boundaries and fence heights, creating it only if no identical one exists.
+
+    The arguments are dictionaries mapping x-coordinates to values (see FieldGeometry.__init__()).
+    """
+    geometry = FieldGeometry(
+        playing_field_lower_bound=playing_field_lower_bound, playing_field_upper_bound=playing_field_upper_bound,
+        outfield_fence_height=outfield_fence_height, foul_fence_height=foul_fence_height
+    )
+    return INTERNED_GEOMETRIES.setdefault(geometry.boundaries, geometry)
@@ -84,6 +84,8 @@ class Team(object):
         # employees_to_relocate being passed
         relocating = True if employees_to_relocate else False
         tradition_in_the_old_city = None if not relocating else self.history.tradition
+        # If the city has been simulated in aggregate, it needs to be simulated at full detail now
+        city.promote()
         # Set geographic attributes
         self.city = city
         self.state = city.state
@@ -179,6 +181,7 @@ class Team(object):
         """Sign the given player to play at the given position."""
         print "\t\tsigning {}...".format(player.person.name)
         player.career.team = self
+        player.update_free_agency()
         player.position = position
         self.players.add(player)
         # Actually hire the player as an employee in the organization
@@ -189,7 +192,9 @@ class Team(object):
         # Prepare some variables that we'll need
         roster_order = ('P', 'C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF')
         lineup = []
-        available_players = list(self.players)
+        # Order the players by ID, so that ties in their grades are broken the same way in any process
+        # (the order that the set of them iterates in may differ from process to process)
+        available_players = sorted(self.players, key=lambda player: player.person.id)
         # Assemble starters
         for position_to_slot in roster_order:
             available_players_at_that_position = [p for p in available_players if p.position == position_to_slot]
@@ -222,6 +227,7 @@ class Team(object):
         """Terminate the contract of a player."""
         self.players.remove(player)
         player.career.team = None
+        player.update_free_agency()
         # If this is during a season, potentially sign a replacement
         if self.season:
             self._sign_players()
@@ -287,6 +293,8 @@ class Team(object):
         """Sever ties with your players and personnel."""
         for stakeholder in self.players | self.personnel:
             stakeholder.career.team = None
+        for player in self.players:
+            player.update_free_agency()
 
     def _potentially_relocate(self):
         """Potentially _relocate this franchise to a new city."""
@@ -1,16 +1,28 @@
 import random
+import collections
 from events import Event
 from outcome import Strike, Ball, FoulBall, Single, Double, Triple, HomeRun, Run, DoublePlay, TriplePlay, FieldersChoice
 from playing_action import PitchInterim, PlayingAction
 from printout import compose_box_score as COMPOSE_BOX_SCORE
+from play_log import PlayByPlayRecorder
+from statistics import GameStatLines
+from utils.rng import RandomStream
 
 
 class Game(Event):
     """A baseball game played in a baseball cosmos."""
 
     def __init__(self, series, home_team=None, away_team=None, ballpark=None, league=None, rules=None,
-                 radio=False, trace=False, debug=False):
-        """Initialize a Game object."""
+                 radio=False, trace=False, debug=False, seed=None, headless=False):
+        """Initialize a Game object.
+
+        @param seed: The seed for this game's stream of random numbers; if None is passed, one will be
+                     derived from the league's stream (pass a game's seed to re-simulate it).
+        @param headless: Whether to play this game headlessly, i.e., with the very same on-field play,
+                         but without an audience, radio broadcast, tracing, or box score (unless one is
+                         asked for later); this is for simulating seasons in bulk, where all that's
+                         needed of a game is its compact result record (see GameResult).
+        """
         # Save metadata
         self.series = series
         self.home_team = series.home_team if series else home_team
@@ -26,56 +38,121 @@ class Game(Event):
         # Update schedule
         if series:
             series.record_game(game=self)
-        # Turn debug or trace parameters on or off
-        self.debug = debug
-        self.trace = trace
+        # Turn debug or trace parameters on or off (a headless game has neither)
+        self.headless = headless
+        self.debug = debug and not headless
+        self.trace = trace and not headless
         # Determine ballpark, league, rules of play, and umpire
         self.ballpark = self.home_team.ballpark if not ballpark else ballpark  # In case of neutral field
         self.field = self.ballpark.field
         self.league = self.home_team.league if not league else league  # In case of non-league play
         self.rules = self.league.classification.rules if not rules else rules  # In case of weird rules jazz
-        self.umpire = self.league.assign_umpire()
-        # Determine the salience of this game
-        self.salience = self._init_determine_salience()
-        # Attract an audience of people to come to the ballpark for the game
-        self._init_attract_audience()
-        # Record that audience (include stadium workers, but not players/members of the
-        # teams themselves, who can be recognized by their routine.occasion being set
-        # to 'baseball')
-        self.audience = {
-            p.fan for p in self.ballpark.people_here_now if p.routine.occasion != 'baseball'
-        }
-        for fan in self.audience:
-            fan.attend_game(game=self)
-        # Prepare for game
-        self.score = [0, 0]  # [away_team_score, home_team_score]
-        self.winner = None
-        self.loser = None
-        self.innings = []
-        self.left_on_base = {self.home_team: [], self.away_team: []}
-        self.player_composures_before = {}
-        for player in self.away_team.players | self.home_team.players:
-            self.player_composures_before[player] = player.person.mood.composure
-        # Prepare the radio broadcast, if applicable (this is my testbed for situated
-        # procedural sports commentary)
-        if radio:
-            self.radio_announcer = random.choice(list(self.ballpark.city.residents))
-        else:
-            self.radio_announcer = None
-        if self.radio_announcer:
-            self.radio_announcer.call_pregame(game=self)
-        # Play the game
-        self.transpire()
-        # TODO THIS WILL HAVE TO BE UPDATED WHEN SUBSTITUTION A THING
-        for team in (self.away_team, self.home_team):
-            for player in team.roster.lineup:
-                player.career.statistics.games_played.append(self)
-        # Save the box score
-        self.box_score = COMPOSE_BOX_SCORE(game=self)
+        # Determine this game's seed, from which its own stream of random numbers will be initialized,
+        # which allows any game to be re-simulated in isolation (given the same rosters, etc.)
+        if seed is None:
+            seed = self.derive_seed(
+                league=self.league, home_team=self.home_team, away_team=self.away_team,
+                ordinal_date=self.ordinal_date, time_of_day=self.time_of_day,
+                number_of_home_team_games=len(self.home_team.season.games) if self.home_team.season else 0
+            )
+        self.seed = seed
+        with RandomStream(seed=self.seed).activate():
+            self.umpire = self.league.assign_umpire()
+            # Compile the umpire's model of the strike zone for this game, so that calling a pitch
+            # is a matter of looking up its edges (this is released once the game is over)
+            self.strike_zone_table = self.umpire.compile_strike_zone_table(home_team=self.home_team)
+            # Determine the salience of this game
+            self.salience = self._init_determine_salience()
+            # Determine whether this game will be played out with full on-field fidelity or with at-bats
+            # whose outcomes are sampled from a surrogate model (see surrogate.py)
+            self.full_fidelity = self._init_determine_fidelity()
+            instrumentation = self.cosmos.instrumentation
+            instrumentation.count('games')
+            if self.headless:
+                instrumentation.count('headless games')
+            # Attract an audience of people to come to the ballpark for the game; this draws from its
+            # own stream, so that a game plays out identically whether or not it's played headlessly
+            if not self.headless:
+                with instrumentation.span('attract audience'):
+                    with RandomStream(seed=self.seed).spawn('audience').activate():
+                        self._init_attract_audience()
+                # Record that audience (include stadium workers, but not players/members of the
+                # teams themselves, who can be recognized by their routine.occasion being set
+                # to 'baseball')
+                self.audience = {
+                    p.fan for p in self.ballpark.people_here_now if p.routine.occasion != 'baseball'
+                }
+                for fan in self.audience:
+                    fan.attend_game(game=self)
+            else:
+                self.audience = set()
+            # Prepare for game
+            self.score = [0, 0]  # [away_team_score, home_team_score]
+            self.winner = None
+            self.loser = None
+            self.innings = []
+            self.left_on_base = {self.home_team: [], self.away_team: []}
+            self.player_composures_before = {}
+            if not self.headless:
+                for player in self.away_team.players | self.home_team.players:
+                    self.player_composures_before[player] = player.person.mood.composure
+            # Prepare the radio broadcast, if applicable (this is my testbed for situated
+            # procedural sports commentary)
+            if radio and not self.headless:
+                self.radio_announcer = random.choice(list(self.ballpark.city.residents))
+            else:
+                self.radio_announcer = None
+            if self.radio_announcer:
+                self.radio_announcer.call_pregame(game=self)
+            # Prepare to record the play-by-play of the game, if applicable
+            if self.cosmos.config.record_play_by_play:
+                self.play_by_play = PlayByPlayRecorder(game=self)
+            else:
+                self.play_by_play = None
+            # Play the game
+            with instrumentation.span('transpire'):
+                self.transpire()
+            self.strike_zone_table = None
+            if self.full_fidelity and self.cosmos.gathering_at_bat_observations:
+                self.cosmos.observe_at_bats(game=self)
+            # Append its play-by-play to the cosmos's play log, from which it may later be replayed
+            self.play_log_entry = None
+            if self.play_by_play:
+                self.play_log_entry = self.cosmos.play_log.append(record=self.play_by_play.encode())
+                self.play_by_play = None
+            # TODO THIS WILL HAVE TO BE UPDATED WHEN SUBSTITUTION A THING
+            for team in (self.away_team, self.home_team):
+                for player in team.roster.lineup:
+                    player.career.statistics.games_played.append(self)
+            # Close everyone's statistics lines for this game, keeping track of whose is whose, so
+            # that the box score can be composed from this game's lines alone
+            self.stat_lines = GameStatLines(game=self)
+            self.umpire.career.statistics.close_game(game=self)
+            # If it's a league game, bring the league's leaderboards up to date
+            if self.home_team.league is self.away_team.league:
+                self.league.update_leaderboards(players=self.away_team.players | self.home_team.players)
+            # Record a compact record of the result
+            self.result = GameResult(
+                seed=self.seed, ordinal_date=self.ordinal_date, time_of_day=self.time_of_day,
+                away_team=self.away_team.name, home_team=self.home_team.name, away_score=self.score[0],
+                home_score=self.score[1], innings=len(self.innings)
+            )
+            # Keep just the runs that each team scored in each inning, for the line score, and release the
+            # innings themselves (with their frames, at-bats, pitches, and batted balls), which the play log
+            # has an encoded record of; from here on, the at-bats of this game may only be reached by
+            # replaying it from there (see replay())
+            self.runs_by_inning = (
+                [inning.top.runs for inning in self.innings],
+                [inning.bottom.runs for inning in self.innings if inning.bottom]
+            )
+            self.innings = None
+            # Likewise release the rest of the state that was only needed while the game was being played
+            self.left_on_base = None
+            self.player_composures_before = None
         # Potentially print the box score
         if self.trace:
             print self.box_score
-        if self.cosmos.debug:
+        if self.cosmos.debug and not self.headless:
             print "{winner} defeated {loser} {winner_score}-{loser_score} (att. {attendance})".format(
                 winner=self.winner.name,
                 loser=self.loser.name,
@@ -92,6 +169,28 @@ class Game(Event):
             date=self.date
         )
 
+    @property
+    def box_score(self):
+        """Return the box score for this game, composing it from its stat lines if it isn't in the box-score cache."""
+        return self.cosmos.box_score_cache.get(game=self, compose=COMPOSE_BOX_SCORE)
+
+    def replay(self):
+        """Return this game as it's rebuilt from its record in the play log (see play_log.ReplayedGame)."""
+        if self.play_log_entry is None:
+            return None
+        return self.cosmos.play_log.replay(entry=self.play_log_entry)
+
+    @staticmethod
+    def derive_seed(league, home_team, away_team, ordinal_date, time_of_day, number_of_home_team_games):
+        """Return the seed for a game between the given teams at the given time, derived from the league's stream.
+
+        @param number_of_home_team_games: The number of games the home team will have played this season,
+                                          counting this one.
+        """
+        return league.random_stream.spawn(
+            'game', ordinal_date, time_of_day, home_team.name, away_team.name, number_of_home_team_games
+        ).seed
+
     def _init_determine_salience(self):
         """Determine the salience of this game.
 
@@ -100,6 +199,19 @@ class Game(Event):
         """
         return 1.0
 
+    def _init_determine_fidelity(self):
+        """Determine whether this game will be played out with full on-field fidelity.
+
+        Games that nobody is paying much attention to are played out with at-bats whose outcomes
+        are sampled from the cosmos's surrogate model, if it has one.
+        """
+        if self.cosmos.at_bat_surrogate is None:
+            return True
+        config = self.cosmos.config
+        return config.attention_paid_to_a_game(year=self.cosmos.year) >= (
+            config.minimum_attention_paid_to_a_game_for_full_fidelity
+        )
+
     def _init_attract_audience(self):
         """Attract an audience of people to come to the ballpark for the game."""
         # TODO USE SALIENCE HERE
@@ -163,6 +275,15 @@ class Game(Event):
                 )
 
 
+# A compact record of the result of a game, which is all that's needed of a game that was played
+# headlessly (team names are recorded, rather than the teams themselves, so that these may be
+# serialized and reported without dragging the cosmos along)
+GameResult = collections.namedtuple(
+    'GameResult',
+    ['seed', 'ordinal_date', 'time_of_day', 'away_team', 'home_team', 'away_score', 'home_score', 'innings']
+)
+
+
 class Inning(object):
     """An inning in a baseball game."""
 
@@ -241,7 +362,9 @@ class Frame(object):
     def _transpire(self):
         """Play out this frame."""
         while self.outs < 3:
-            AtBat(frame=self)
+            at_bat = AtBat(frame=self)
+            if self.game.play_by_play:
+                self.game.play_by_play.record_at_bat(at_bat=at_bat)
             if self.game.trace:
                 print "\n{}. {} outs. Score is {}-{}.\n".format(
                     self.at_bats[-1].result, self.outs, self.game.away_team.runs, self.game.home_team.runs
@@ -317,6 +440,12 @@ class AtBat(object):
         self.resolved = False
         self.result = None
         self.run_queue = []  # Potential runs; will be counted only if a third out isn't recorded during the play
+        self.runs_scored = []  # Runs that actually count, which are appended by Run objects
+        # Record the base-out state and runs that this at-bat began with (a surrogate model fitted to
+        # full-fidelity at-bats infers from these the movements of the batter and baserunners)
+        self.bases_before = (frame.on_first, frame.on_second, frame.on_third)
+        self.outs_before = frame.outs
+        self.runs_before = frame.runs
         if self.game.trace:
             print "1B: {}, 2B: {}, 3B: {}, AB: {}".format(frame.on_first, frame.on_second, frame.on_third, self.batter)
         if not self.game.radio_announcer:
@@ -328,6 +457,10 @@ class AtBat(object):
         """Play out the at-bat."""
         # TODO substitutions will change where this should be done
         assert not self.resolved, "Call to _transpire() of already resolved AtBat."
+        if not self.game.full_fidelity:
+            # Sample the outcome of this at-bat, rather than playing it out pitch by pitch
+            self.game.cosmos.at_bat_surrogate.play(at_bat=self)
+            return
         while not self.resolved:
             self.playing_action = None  # Don't retain prior playing action
             # Players get in position, pitcher decides his pitch
@@ -0,0 +1,465 @@
+import itertools
+import collections
+import multiprocessing
+from events import Event
+from game import Game
+from player import Player
+from equipment import Bat
+from play_log import PlayLog
+from statistics import GameStatLines
+
+
+# The league whose games are being played, and its series, players, umpires, and the people who may
+# be at its ballparks (its players, and whoever else is there), as they're laid out in the main process
+# when a pool's workers are forked; each worker inherits (a copy-on-write copy of) the very same objects,
+# in the very same order, and tasks and results refer to them by index
+LEAGUE = None
+SERIES = []
+PLAYERS = []
+UMPIRES = []
+PEOPLE = []
+
+# The attributes of a player that a game may change and that may carry over into his next game; a
+# player's in-play state is mostly reset before each pitch (see Player.get_in_position()), but not
+# all of it is, so all of it is synced between the main process and the workers (along with his
+# bat, which may break, and the few attributes of his person and career that games read or change;
+# see _participant_state()). Umpires need no such list, since the only state a game changes for
+# an umpire is his statistics.
+PLAYER_FIELDS = (
+    # Equipment
+    'bat',
+    # Fielding
+    'location', 'immediate_goal', 'making_goal_revision', 'dist_per_timestep', 'relative_rate_of_speed', '_slope',
+    'at_goal', '_straight_ahead_x', '_straight_ahead_y', '_moving_left', '_moving_right', 'time_needed_to_field_ball',
+    'tick_of_planned_fielding_attempt', 'playing_the_ball', 'attempting_fly_out', 'backing_up_the_catch',
+    'called_off_by', 'reorienting_after_fielding_miss',
+    # Throwing
+    'will_throw', 'throwing_to_first', 'throwing_to_second', 'throwing_to_third', 'throwing_to_home',
+    'throwing_back_to_pitcher', 'throwing_to_relay', '_throw_target', '_throw_target_coords',
+    '_throw_distance_to_target', '_throw_power', '_throw_release',
+    # Pitching and batting
+    'kind', 'intended_x', 'intended_y', 'at_the_plate', 'will_swing', 'intended_pull', '_swing_incline', '_swing_power',
+    # Baserunning
+    'percent_to_base', 'forced_to_advance', 'forced_to_retreat', 'safely_on_base', 'safely_home', 'retreating',
+    'out', 'out_on_the_throw', 'took_off_early', 'baserunning_full_speed', 'tentatively_baserunning',
+    '_done_tentatively_advancing', '_decided_finish', 'will_round_base', 'believes_he_can_beat_throw',
+    'taking_next_base', 'base_reached_on_hit', 'timestep_reached_base', 'advancing_due_to_error',
+)
+
+
+class GamePool(object):
+    """A pool of worker processes across which a league season's headless games are played, day by day.
+
+    The games on a given day are independent of one another: no player plays in more than one
+    series, and the only state that games share (the umpires' statistics, the trajectory cache)
+    doesn't affect what happens on the field. So each of today's series is shipped to a worker
+    process, which plays its games headlessly and reports back compact GameLog records. These are
+    applied here in the order of the given series, which yields exactly the same outcome as playing
+    the games serially in that order.
+
+    The workers are forked once, and then kept for the rest of the season. Each day, everything of
+    the league that games read and that may have changed since the workers were forked is sent
+    along with each series: the date, the series' schedule, the seeds of its games, and for each
+    participant, his statistics totals and the fields listed in PLAYER_FIELDS (see
+    _participant_state()), along with the people who are at the ballpark (whose minds wander between
+    pitches, drawing from the game's stream of random numbers). The rest -- the teams' rosters and
+    ballparks, the umpires, the people at the ballparks who aren't players in the league, and the
+    cosmos's surrogate at-bat model -- is only read by workers; if any of it changes (e.g., when a
+    player retires and is replaced), the workers are forked anew.
+    """
+
+    def __init__(self, league, number_of_workers):
+        """Initialize a GamePool object.
+
+        @param league: The league whose games will be played.
+        @param number_of_workers: The maximum number of worker processes to fork.
+        """
+        self.league = league
+        self.number_of_workers = number_of_workers
+        self.pool = None
+        # The layout of the league that the workers were forked with (see _layout())
+        self.layout = None
+        # The series, players, umpires, and people of the league, as they were laid out when the workers
+        # were forked, along with the indices of the series, players, and people
+        self.series = []
+        self.players = []
+        self.umpires = []
+        self.people = []
+        self.series_indices = {}
+        self.player_indices = {}
+        self.person_indices = {}
+
+    def __getstate__(self):
+        """Return the state of this pool that will be serialized when the cosmos is saved (it has no workers)."""
+        state = dict(self.__dict__)
+        state.update(
+            pool=None, layout=None, series=[], players=[], umpires=[], people=[], series_indices={}, player_indices={},
+            person_indices={}
+        )
+        return state
+
+    def play(self, series_today):
+        """Play today's games in the given series across the pool's workers.
+
+        @param series_today: A list of the series that have games scheduled for today, in the
+                             (deterministic) order that their games will be recorded.
+        @return: A list of the games that were played, as WorkerGame objects.
+        """
+        cosmos = self.league.cosmos
+        if self.pool is None or self._layout() != self.layout:
+            self._fork()
+        tasks = [self._task(series=series) for series in series_today]
+        series_logs = self.pool.map(_play_series_in_worker, tasks, chunksize=1)
+        games = []
+        for series, task, series_log in zip(series_today, tasks, series_logs):
+            participants = [self.players[i] for i in task.participant_indices]
+            for game_log in series_log.game_logs:
+                games.append(
+                    WorkerGame(
+                        series=series, participants=participants, umpire=self.umpires[game_log.umpire_index],
+                        game_log=game_log
+                    )
+                )
+            cosmos.instrumentation.absorb(*series_log.instrumentation)
+            cosmos.trajectory_cache.absorb(*series_log.trajectory_cache)
+        return games
+
+    def close(self):
+        """Shut down the workers."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def _layout(self):
+        """Return the layout of the league that the workers only read, which they must have been forked with.
+
+        The players and umpires are laid out in the order that their sets iterate in, since a set that's
+        rebuilt with the same members (as League.set_league_personnel() does) may iterate in a different
+        order, and the workers must iterate over them just as the main process would.
+        """
+        league = self.league
+        people_who_are_players = {player.person for team in league.teams for player in team.players}
+        return (
+            [
+                (
+                    team, team.roster, tuple(team.players), tuple(team.roster.batting_order), team.ballpark,
+                    frozenset(team.ballpark.people_here_now - people_who_are_players)
+                )
+                for team in league.teams
+            ],
+            tuple(league.umpires), league.season, league.cosmos.at_bat_surrogate
+        )
+
+    def _fork(self):
+        """Fork a fresh set of workers, which will inherit the league as it's laid out right now."""
+        global LEAGUE, SERIES, PLAYERS, UMPIRES, PEOPLE
+        self.close()
+        league = self.league
+        self.layout = self._layout()
+        self.series = []
+        self.series_indices = {}
+        for team in league.teams:
+            for series in team.season.schedule.upcoming_series:
+                if series not in self.series_indices:
+                    self.series_indices[series] = len(self.series)
+                    self.series.append(series)
+        self.players = [player for team in league.teams for player in team.players]
+        self.player_indices = {player: i for i, player in enumerate(self.players)}
+        self.umpires = list(league.umpires)
+        self.people = [player.person for player in self.players]
+        self.person_indices = {person: i for i, person in enumerate(self.people)}
+        for team in league.teams:
+            for person in team.ballpark.people_here_now:
+                if person not in self.person_indices:
+                    self.person_indices[person] = len(self.people)
+                    self.people.append(person)
+        LEAGUE, SERIES, PLAYERS, UMPIRES, PEOPLE = league, self.series, self.players, self.umpires, self.people
+        try:
+            self.pool = multiprocessing.Pool(
+                processes=min(self.number_of_workers, len(league.teams)//2), initializer=_prepare_worker
+            )
+        finally:
+            # The workers have their own copies now
+            LEAGUE, SERIES, PLAYERS, UMPIRES, PEOPLE = None, [], [], [], []
+
+    def _task(self, series):
+        """Return a SeriesTask for playing today's games in the given series."""
+        cosmos = self.league.cosmos
+        today = (cosmos.ordinal_date, cosmos.time_of_day)
+        number_of_games_today = sum(1 for _ in itertools.takewhile(lambda d: d == today, series.dates_scheduled))
+        number_of_home_team_games = len(series.home_team.season.games)
+        participants = list(series.away_team.players) + list(series.home_team.players)
+        return SeriesTask(
+            series_index=self.series_indices[series],
+            date=(cosmos.ordinal_date, cosmos.time_of_day, cosmos.year, cosmos.month, cosmos.day),
+            dates_scheduled=series.dates_scheduled,
+            seeds=[
+                Game.derive_seed(
+                    league=self.league, home_team=series.home_team, away_team=series.away_team,
+                    ordinal_date=cosmos.ordinal_date, time_of_day=cosmos.time_of_day,
+                    number_of_home_team_games=number_of_home_team_games+i+1
+                )
+                for i in xrange(number_of_games_today)
+            ],
+            participant_indices=[self.player_indices[player] for player in participants],
+            participant_states=[_participant_state(player=player, participants=participants) for player in participants],
+            statistics_totals=[player.career.statistics.totals for player in participants],
+            batters=[_index_of_batter(roster=team.roster) for team in (series.away_team, series.home_team)],
+            people_at_the_ballpark=[
+                self.person_indices[person] for person in series.home_team.ballpark.people_here_now
+            ]
+        )
+
+
+def _prepare_worker():
+    """Prepare a worker process, upon its being forked, to play games."""
+    # Events that happen in a worker are renumbered in the main process, so they needn't be kept
+    # here (or ever spilled, which would write segments to the main process's directory)
+    LEAGUE.cosmos.events = []
+
+
+def _play_series_in_worker(task):
+    """Play today's games in a series, in a worker process, and return a SeriesLog record of them."""
+    series = SERIES[task.series_index]
+    cosmos = LEAGUE.cosmos
+    participants = [PLAYERS[i] for i in task.participant_indices]
+    # Bring this worker's copy of the league up to date
+    cosmos.ordinal_date, cosmos.time_of_day, cosmos.year, cosmos.month, cosmos.day = task.date
+    cosmos.date = cosmos.get_date()
+    series.dates_scheduled = list(task.dates_scheduled)
+    for player, state, totals in zip(participants, task.participant_states, task.statistics_totals):
+        _restore_participant_state(player=player, state=state, participants=participants)
+        player.career.statistics.totals = totals
+    for team, index_of_batter in zip((series.away_team, series.home_team), task.batters):
+        team.roster.batter = team.roster.batting_order[index_of_batter] if index_of_batter is not None else None
+    series.home_team.ballpark.people_here_now = {PEOPLE[i] for i in task.people_at_the_ballpark}
+    # Record this worker's instrumentation and trajectory-cache fills afresh, so they can be sent back
+    cosmos.instrumentation.reset()
+    trajectory_cache = cosmos.trajectory_cache
+    trajectory_cache.computed_trajectories = []
+    trajectory_cache_hits_before, trajectory_cache_misses_before = trajectory_cache.hits, trajectory_cache.misses
+    # Games are recorded to a play log of the worker's own, and their records are sent back to be
+    # appended to the main process's play log
+    main_play_log = cosmos.play_log
+    cosmos.play_log = PlayLog()
+    game_logs = []
+    for seed in task.seeds:
+        statistics_before = [_tally_statistics(player.career.statistics) for player in participants]
+        umpire_statistics_before = {umpire: _tally_statistics(umpire.career.statistics) for umpire in UMPIRES}
+        cosmos.at_bat_observations = []
+        game = Game(series=series, headless=True, seed=seed)
+        statistics_after = [_tally_statistics(player.career.statistics) for player in participants]
+        game_logs.append(
+            GameLog(
+                result=game.result,
+                umpire_index=UMPIRES.index(game.umpire),
+                home_team_won=game.winner is game.home_team,
+                statistics=[
+                    _difference_in_tallies(before, after) for before, after in zip(statistics_before, statistics_after)
+                ],
+                umpire_statistics=_difference_in_tallies(
+                    umpire_statistics_before[game.umpire], _tally_statistics(game.umpire.career.statistics)
+                ),
+                participant_states=[
+                    _participant_state(player=player, participants=participants) for player in participants
+                ],
+                batters=[
+                    _index_of_batter(roster=team.roster) for team in (series.away_team, series.home_team)
+                ],
+                play_by_play=cosmos.play_log.read(game.play_log_entry) if game.play_log_entry is not None else None,
+                at_bat_observations=cosmos.at_bat_observations
+            )
+        )
+    cosmos.play_log.delete()
+    cosmos.play_log = main_play_log
+    del cosmos.events[:]
+    series_log = SeriesLog(
+        game_logs=game_logs,
+        instrumentation=(cosmos.instrumentation.spans_by_year, cosmos.instrumentation.counters_by_year),
+        trajectory_cache=(
+            trajectory_cache.computed_trajectories, trajectory_cache.hits-trajectory_cache_hits_before,
+            trajectory_cache.misses-trajectory_cache_misses_before
+        )
+    )
+    trajectory_cache.computed_trajectories = None
+    return series_log
+
+
+def _tally_statistics(statistics):
+    """Return a dictionary mapping the name of each column in the given statistics object to its total."""
+    return statistics.tallies()
+
+
+def _difference_in_tallies(before, after):
+    """Return a dictionary mapping the names of statistics columns that grew to the number of entries added."""
+    return {name: after[name]-before.get(name, 0) for name in after if after[name] != before.get(name, 0)}
+
+
+def _participant_state(player, participants):
+    """Return the state of a participant that's synced between the main process and the workers.
+
+    This is the value of each of his fields listed in PLAYER_FIELDS, and his age, composure,
+    confidence, retirement plans, and the number of runners he's left on base. Values are made
+    portable: references to other participants are sent as ParticipantReference records, and
+    references to the objects of a game itself (e.g., the outcome a baserunner was put out on),
+    which the other process will never see, are sent as None -- these all get reset before
+    they're next read anyway.
+    """
+    person = player.person
+    return (
+        [_portable(value=getattr(player, name, None), participants=participants) for name in PLAYER_FIELDS],
+        person.age, person.mood.composure, person.personality.confidence, player.career.planning_to_retire,
+        player.career.statistics.left_on_base
+    )
+
+
+def _restore_participant_state(player, state, participants):
+    """Set a participant's state, as it was reported by _participant_state() in another process."""
+    person = player.person
+    field_values, person.age, person.mood.composure, person.personality.confidence, \
+        player.career.planning_to_retire, player.career.statistics.left_on_base = state
+    for name, value in zip(PLAYER_FIELDS, field_values):
+        if isinstance(value, ParticipantReference):
+            value = participants[value.index]
+        setattr(player, name, value)
+
+
+def _portable(value, participants):
+    """Return a version of the given attribute value that can be sent to another process."""
+    if isinstance(value, (bool, int, long, float, basestring)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(v, (bool, int, long, float)) for v in value):
+        return value
+    if isinstance(value, Bat):
+        return value
+    if isinstance(value, Player) and value in participants:
+        return ParticipantReference(index=participants.index(value))
+    return None
+
+
+def _index_of_batter(roster):
+    """Return the index, in its batting order, of a roster's current batter (or None if it has none)."""
+    return roster.batting_order.index(roster.batter) if roster.batter else None
+
+
+# A task for a worker: playing today's games in a series, with everything of the league that the worker
+# needs to bring its copy up to date: the date, the series' schedule and the seeds of today's games in
+# it, the state and statistics totals of each participant in the series and the current batter of each
+# team, and the people at the ballpark; participants are given by their indices in PLAYERS, in the order
+# that results refer to them, and the people at the ballpark by their indices in PEOPLE
+SeriesTask = collections.namedtuple(
+    'SeriesTask',
+    [
+        'series_index', 'date', 'dates_scheduled', 'seeds', 'participant_indices', 'participant_states',
+        'statistics_totals', 'batters', 'people_at_the_ballpark'
+    ]
+)
+
+
+# A compact record of a game that was played in a worker process, with everything that the main
+# process needs to bring itself up to date: the amounts that statistics columns grew by, and the
+# new state of each participant in the series (in the order of the task's participants) and the
+# umpire, and the state of each team's lineup, along with the encoded play-by-play of the game (see
+# play_log.py) and the observations of its at-bats, if the cosmos is gathering them to fit a surrogate
+# model to (see surrogate.py)
+GameLog = collections.namedtuple(
+    'GameLog',
+    [
+        'result', 'umpire_index', 'home_team_won', 'statistics', 'umpire_statistics', 'participant_states',
+        'batters', 'play_by_play', 'at_bat_observations'
+    ]
+)
+
+
+# The records of the games a worker played in a series, along with the spans and counts that its
+# instrumentation recorded, and the trajectories its cache computed and its lookup counts
+SeriesLog = collections.namedtuple('SeriesLog', ['game_logs', 'instrumentation', 'trajectory_cache'])
+
+
+# A reference to a participant in a series, by its index in the task's participants
+ParticipantReference = collections.namedtuple('ParticipantReference', ['index'])
+
+
+class WorkerGame(Event):
+    """A game that was played in a worker process, as it's recorded in the main process.
+
+    The pitches, at-bats, and outcomes of the game stay behind in the worker, so in the statistics
+    columns of players and umpires, the entries for a game like this are the game itself (one per
+    entry that the game added); the totals of these columns, which is what gets reported, come out
+    just as they would have had the game been played here.
+    """
+
+    play_log_entry = None  # Set for games whose play-by-play was recorded
+
+    def __init__(self, series, participants, umpire, game_log):
+        """Initialize a WorkerGame object."""
+        self.series = series
+        self.home_team = series.home_team
+        self.away_team = series.away_team
+        self.cosmos = self.home_team.city.cosmos
+        super(WorkerGame, self).__init__(cosmos=self.cosmos)
+        if self.home_team.league is self.away_team.league:
+            self.home_team.season.games.append(self)
+            self.away_team.season.games.append(self)
+        series.record_game(game=self)
+        self.headless = True
+        self.ballpark = self.home_team.ballpark
+        self.field = self.ballpark.field
+        self.league = self.home_team.league
+        self.rules = self.league.classification.rules
+        self.umpire = umpire
+        self.result = game_log.result
+        self.seed = game_log.result.seed
+        self.score = [game_log.result.away_score, game_log.result.home_score]
+        self.winner = self.home_team if game_log.home_team_won else self.away_team
+        self.loser = self.away_team if game_log.home_team_won else self.home_team
+        self.audience = set()
+        # Append the game's play-by-play to the play log here, from which the game may be replayed; this
+        # comes first, so that the statistics lines closed for this game can refer to its record there
+        self.play_log_entry = None
+        if game_log.play_by_play is not None:
+            self.play_log_entry = self.cosmos.play_log.append(record=game_log.play_by_play)
+        self._apply(participants=participants, game_log=game_log)
+
+    def __str__(self):
+        """Return string representation."""
+        return "{away_team} at {home_team}, {date}".format(
+            away_team=self.away_team.name,
+            home_team=self.home_team.name,
+            date=self.date
+        )
+
+    @property
+    def box_score(self):
+        """Return the box score for this game, as it's rebuilt from the play log (if its play-by-play was recorded)."""
+        if self.play_log_entry is None:
+            return None
+        return self.cosmos.box_score_cache.get(game=self, compose=lambda game: game.replay().box_score)
+
+    def replay(self):
+        """Return this game as it's rebuilt from its record in the play log (see play_log.ReplayedGame)."""
+        if self.play_log_entry is None:
+            return None
+        return self.cosmos.play_log.replay(entry=self.play_log_entry)
+
+    def _apply(self, participants, game_log):
+        """Bring the participants, the umpire, and the teams' lineups up to date with this game."""
+        for player, state, tallies in zip(participants, game_log.participant_states, game_log.statistics):
+            _restore_participant_state(player=player, state=state, participants=participants)
+            self._record_entries(statistics=player.career.statistics, tallies=tallies)
+        self.cosmos.at_bat_observations += game_log.at_bat_observations
+        self._record_entries(statistics=self.umpire.career.statistics, tallies=game_log.umpire_statistics)
+        # Close everyone's statistics lines for this game
+        self.stat_lines = GameStatLines(game=self)
+        self.umpire.career.statistics.close_game(game=self)
+        if self.home_team.league is self.away_team.league:
+            self.league.update_leaderboards(players=participants)
+        for team, index_of_batter in zip((self.away_team, self.home_team), game_log.batters):
+            roster = team.roster
+            roster.batter = roster.batting_order[index_of_batter] if index_of_batter is not None else None
+
+    def _record_entries(self, statistics, tallies):
+        """Record this game in the given statistics columns, as many times as it added entries to each."""
+        for name, number_of_entries in tallies.iteritems():
+            getattr(statistics, name).extend([self] * number_of_entries)
@@ -1,3 +1,6 @@
+import bisect
+
+
 class LeagueHistory(object):
     """The compiled history of a baseball league."""
 
@@ -5,9 +8,10 @@ class LeagueHistory(object):
         """Initialize a LeagueHistory object."""
         self.league = league
         self.defunct_teams = set()  # Populated as teams _fold
-        self.charter_teams = set(league.teams)
+        self.charter_teams = set()  # Set by League.__init__() once the charter teams are enfranchised
         self.seasons = []  # Appended to by LeagueSeason.__init__()
         self.champions_timeline = {}  # Maps year to champion that year; updated by LeagueSeason.review()
+        self.most_recent_champion = None  # Updated by LeagueSeason.review()
         self.former_players = set()
 
     def __str__(self):
@@ -25,14 +29,38 @@ class LeagueHistory(object):
 
 
 class FranchiseHistory(object):
-    """The compiled history of a baseball franchise."""
+    """The compiled history of a baseball franchise.
+
+    Rather than rescanning every season whenever a cumulative figure is asked for, this keeps
+    running totals across the franchise's reviewed seasons (see record_season()), an index of its
+    seasons by year and city, and, for each city the franchise has played in, prefix sums of its
+    wins and losses there, so that window queries take time logarithmic in its number of seasons.
+    """
 
     def __init__(self, franchise):
         """Initialize a FranchiseHistory object."""
         self.franchise = franchise
-        self.seasons = []  # Appended to by TeamSeason.__init__()
+        self.seasons = []  # Appended to by TeamSeason.__init__() (via add_season())
         self.championships = []
         self.former_players = set()
+        self._init_aggregates()
+
+    def _init_aggregates(self):
+        """Prepare the running aggregates over this franchise's seasons."""
+        # Maps (year, city) to this franchise's season in that city that year; updated by add_season()
+        self.season_index = {}
+        # Maps cities to the first year this franchise played a season there; updated by add_season()
+        self.first_year_in_city = {}
+        # The running totals across the seasons that have been reviewed, which are always the
+        # earliest seasons; updated by record_season()
+        self.number_of_seasons_recorded = 0
+        self.recorded_wins = 0
+        self.recorded_losses = 0
+        self.recorded_games = []
+        # Maps cities to a (years, prefix_wins, prefix_losses) triple, where 'years' are the years of the
+        # reviewed seasons in that city, and prefix_wins[i] (prefix_losses[i]) is the number of wins
+        # (losses) this franchise had in that city across the first i of those seasons
+        self.city_timelines = {}
 
     def __str__(self):
         """Return string representation."""
@@ -42,11 +70,53 @@ class FranchiseHistory(object):
             ceased=self.franchise.ceased if self.franchise.ceased else ''
         )
 
+    def add_season(self, season):
+        """Add a new season to this franchise's history."""
+        self.seasons.append(season)
+        self.season_index[(season.year, season.city)] = season
+        self.first_year_in_city.setdefault(season.city, season.year)
+
+    def record_season(self, season):
+        """Fold the results of the given season, which is being reviewed, into the running aggregates.
+
+        Any earlier season that was never reviewed (e.g., because its league season was terminated)
+        is folded in too, so that the recorded seasons are always a prefix of self.seasons.
+        """
+        while self.number_of_seasons_recorded < len(self.seasons):
+            recorded_season = self.seasons[self.number_of_seasons_recorded]
+            self._record(recorded_season)
+            if recorded_season is season:
+                break
+
+    def _record(self, season):
+        """Fold the results of the given season into the running aggregates."""
+        wins = len(season.wins)
+        losses = len(season.games)-wins
+        self.number_of_seasons_recorded += 1
+        self.recorded_wins += wins
+        self.recorded_losses += losses
+        self.recorded_games += season.games
+        try:
+            years, prefix_wins, prefix_losses = self.city_timelines[season.city]
+        except KeyError:
+            years, prefix_wins, prefix_losses = self.city_timelines[season.city] = ([], [0], [0])
+        years.append(season.year)
+        prefix_wins.append(prefix_wins[-1]+wins)
+        prefix_losses.append(prefix_losses[-1]+losses)
+
+    @property
+    def unrecorded_seasons(self):
+        """Return the seasons of this franchise that haven't been reviewed yet (in practice, at most one)."""
+        return self.seasons[self.number_of_seasons_recorded:]
+
     @property
     def games(self):
         """Return all the games ever played by this franchise."""
-        games = []
-        for season in self.seasons:
+        unrecorded_seasons = self.unrecorded_seasons
+        if not unrecorded_seasons:
+            return list(self.recorded_games)
+        games = self.recorded_games[:]
+        for season in unrecorded_seasons:
             games += season.games
         return games
 
@@ -68,36 +138,31 @@ class FranchiseHistory(object):
     @property
     def cumulative_wins(self):
         """Return the cumulative number of wins this franchise has accumulated across its entire history."""
-        return sum(len(s.wins) for s in self.seasons)
+        return self.recorded_wins + sum(len(s.wins) for s in self.unrecorded_seasons)
 
     @property
     def cumulative_losses(self):
         """Return the cumulative number of losses this franchise has accumulated across its entire history."""
-        return sum(len(s.losses) for s in self.seasons)
+        return self.recorded_losses + sum(len(s.losses) for s in self.unrecorded_seasons)
 
     @property
     def cumulative_winning_percentage(self):
         """Return this franchise's cumulative winning percentage."""
-        return float(self.cumulative_wins)/(self.cumulative_wins+self.cumulative_losses)
+        cumulative_wins = self.cumulative_wins
+        return float(cumulative_wins)/(cumulative_wins+self.cumulative_losses)
 
     @property
     def number_of_years_in_town(self):
         """Return the number of years this franchise has been located in its current city."""
-        if not self.seasons:
+        year_of_first_season_in_this_town = self.first_year_in_city.get(self.franchise.city)
+        if year_of_first_season_in_this_town is None:
             return 0
-        else:
-            first_season_in_this_town = next(s for s in self.seasons if s.city is self.franchise.city)
-            year_of_that_season = first_season_in_this_town.year
-            number_of_years_in_town = self.franchise.cosmos.year-year_of_that_season
-            return number_of_years_in_town
+        return self.franchise.cosmos.year-year_of_first_season_in_this_town
 
     def get_season(self, year, city=None):
         """Return this franchise's season for the given year."""
         city = self.franchise.city if not city else city
-        try:
-            return next(s for s in self.seasons if s.year == year and s.city is city)
-        except StopIteration:
-            return None
+        return self.season_index.get((year, city))
 
     def winning_percentage_during_window(self, start_year, end_year, city=None):
         """Return this team's cumulative winning percentage across the specified window.
@@ -109,9 +174,16 @@ class FranchiseHistory(object):
         city = self.franchise.city if not city else city
         wins_during_the_window = 0
         losses_during_the_window = 0
-        for year in xrange(start_year, end_year):
-            season_that_year = self.get_season(year=year, city=city)
-            if season_that_year:
-                wins_during_the_window += season_that_year.wins
-                losses_during_the_window += season_that_year.losses
+        # Reviewed seasons are answered from the prefix sums for this city...
+        if city in self.city_timelines:
+            years, prefix_wins, prefix_losses = self.city_timelines[city]
+            i, j = bisect.bisect_left(years, start_year), bisect.bisect_left(years, end_year)
+            wins_during_the_window += prefix_wins[j]-prefix_wins[i]
+            losses_during_the_window += prefix_losses[j]-prefix_losses[i]
+        # ...and a season that's still underway is counted directly
+        for season in self.unrecorded_seasons:
+            if season.city is city and start_year <= season.year < end_year:
+                wins = len(season.wins)
+                wins_during_the_window += wins
+                losses_during_the_window += len(season.games)-wins
         return float(wins_during_the_window)/(wins_during_the_window+losses_during_the_window)
@@ -0,0 +1,122 @@
+import bisect
+
+
+# The categories that leaderboards are kept in
+CATEGORIES = ('batting_average', 'home_runs', 'rbi', 'pitching_strikeouts', 'pitching_wins')
+
+
+class Leaderboard(object):
+    """The standings of a league's players in a single statistical category.
+
+    The standings are kept sorted as players' totals change, so that reading off the leaders is
+    a matter of slicing the front of the list, rather than scanning every player's statistics.
+    """
+
+    def __init__(self, category):
+        """Initialize a Leaderboard object.
+
+        @param category: The name of the statistical category this board is kept in (see CATEGORIES).
+        """
+        self.category = category
+        # A sorted list of (negated value, person ID, player) entries; the person ID breaks ties
+        # deterministically (and keeps the players themselves from ever being compared)
+        self.standings = []
+        self.entries = {}  # Maps players to their current entries in self.standings
+
+    def __len__(self):
+        """Return the number of players on this board."""
+        return len(self.standings)
+
+    def update(self, player, value):
+        """Update the given player's standing on this board.
+
+        @param player: The player whose value in this category has (potentially) changed.
+        @param value: His new value, or None if he no longer belongs on the board (e.g., because
+                      he isn't qualified in this category).
+        """
+        entry = self.entries.get(player)
+        if entry is not None:
+            if value and entry[0] == -value:
+                return
+            del self.standings[bisect.bisect_left(self.standings, entry)]
+            del self.entries[player]
+        if value:
+            entry = (-value, player.person.id, player)
+            bisect.insort(self.standings, entry)
+            self.entries[player] = entry
+
+    def leaders(self, n):
+        """Return a list of (player, value) tuples for the top n players on this board."""
+        return [(player, -negated_value) for negated_value, _, player in self.standings[:n]]
+
+    @property
+    def leader(self):
+        """Return the player at the top of this board, if any."""
+        return self.standings[0][2] if self.standings else None
+
+
+class Leaderboards(object):
+    """A league's leaderboards in each category, either for a single season or across careers."""
+
+    def __init__(self, league, year=None):
+        """Initialize a Leaderboards object.
+
+        @param league: The league whose leaderboards these are.
+        @param year: The year of the season that these boards are kept for; if None is passed,
+                     they will be kept for players' career totals.
+        """
+        self.league = league
+        self.year = year
+        self.boards = {category: Leaderboard(category=category) for category in CATEGORIES}
+
+    def __getitem__(self, category):
+        """Return the board for the given category."""
+        return self.boards[category]
+
+    def populate(self, players):
+        """Place the given players on these boards, from their current totals."""
+        for player in players:
+            self.update(player=player)
+
+    def update(self, player):
+        """Update the given player's standings on each of these boards from his current totals.
+
+        This is called for every player on both teams once a game has ended (see
+        League.update_leaderboards()), so that qualification for the batting title, which
+        depends on the number of games the player's team has played, stays up to date.
+        """
+        statistics = player.career.statistics
+        if self.year is None:
+            totals = statistics.totals
+        else:
+            totals = statistics.seasons.get(self.year)
+            if totals is None:
+                return
+        indices = statistics.INDICES
+        at_bats = totals[indices['at_bats']]
+        hits = totals[indices['hits']]
+        plate_appearances = totals[indices['plate_appearances']]
+        if at_bats and self._qualified_for_batting_average(
+                player=player, hits=hits, plate_appearances=plate_appearances
+        ):
+            batting_average = float(hits)/at_bats
+        else:
+            batting_average = None
+        self.boards['batting_average'].update(player=player, value=batting_average)
+        for category in CATEGORIES[1:]:
+            self.boards[category].update(player=player, value=totals[indices[category]])
+
+    def _qualified_for_batting_average(self, player, hits, plate_appearances):
+        """Return whether the given player qualifies for the batting-average board."""
+        config = self.league.cosmos.config
+        if self.year is None:
+            return hits >= config.minimum_career_hits_to_qualify_for_batting_average_leaderboard
+        team = player.career.team
+        team_games = len(team.season.games) if team and team.season and team.season.year == self.year else 0
+        return plate_appearances >= (
+            config.minimum_plate_appearances_per_team_game_to_qualify_for_batting_title * team_games
+        ) > 0
+
+    def leaders(self, category, n):
+        """Return a list of (player, value) tuples for the top n players in the given category."""
+        return self.boards[category].leaders(n=n)
@@ -4,11 +4,13 @@ from random import normalvariate as normal
 from people.business import BaseballLeagueOffices
 from people.occupation import BaseballCommissioner, BaseballUmpire
 from history import LeagueHistory
+from leaderboard import Leaderboards
 from franchise import Team
 from season import LeagueSeason
 from commissioner import Commissioner
 from umpire import Umpire
 from game import Game
+from game_pool import GamePool
 
 # TODO  Make league activity bottom-up once the postal system is implemented -- I'm
 # TODO  thinking something like the commissioner sending a letter to city
@@ -24,11 +26,15 @@ class League(object):
         """Initialize a League object."""
         # Attribute geographic attributes
         self.headquarters = headquarters  # City in which the league is based
+        self.headquarters.promote()  # In case it's been simulated in aggregate
         self.state = headquarters.state
         self.country = headquarters.country
         self.cosmos = headquarters.cosmos
         # Determine official league playing rules
         self.classification = league_classification  # Level-of-play classification; this is where the rules live
+        # Prepare this league's own stream of random numbers, from which the streams of its games
+        # will be derived (its key is the number of leagues formed before it)
+        self.random_stream = self.cosmos.random_stream.spawn('league', len(self.cosmos.leagues))
         # Update city, state, country, and cosmos leagues listings
         self.headquarters.leagues.append(self)
         self.state.leagues.append(self)
@@ -53,11 +59,19 @@ class League(object):
         # This is used to hold all the games that need to be played today, because it
         # is the league object's responsibility to instantiate the actual Game object
         self.games_scheduled_for_today = set()
+        # Whether this league's seasons will play their games headlessly (see Game.__init__()); a
+        # season copies this when it's planned, and may be told otherwise itself
+        self.headless_games = self.cosmos.config.play_league_games_headlessly
+        # Instantiate history object; this comes before the charter teams are enfranchised, since
+        # signing their players may prompt other players to retire (e.g., when a player's family
+        # moves with him to a new city), which the league records in its history
+        self.history = LeagueHistory(league=self)
         # Enfranchise a group of charter teams
         self._init_enfranchise_charter_teams()
-        # Instantiate history object; do this after enfranchising charter teams so that
-        # LeagueHistory.charter_teams() can be inferred in that object's __init__ call
-        self.history = LeagueHistory(league=self)
+        self.history.charter_teams = set(self.teams)
+        # Leaderboards across players' careers, which are kept up to date as games are played (see
+        # update_leaderboards()); each season keeps its own, as well
+        self.career_leaderboards = Leaderboards(league=self)
         # Determine the date that a new season will be planned for each year
         self.date_to_plan_next_season = self.cosmos.config.date_for_league_to_plan_next_season  # (month_n, day_n)
         print (
@@ -100,11 +114,7 @@ class League(object):
     @property
     def champion(self):
         """Return the franchise that holds the most recent championship in this league."""
-        try:
-            year_of_most_recent_championship = max(self.history.champions_timeline.keys())
-            return self.history.champions_timeline[year_of_most_recent_championship]
-        except IndexError:
-            return None
+        return self.history.most_recent_champion
 
     def _init_enfranchise_charter_teams(self):
         """Enfranchise a set of charter teams."""
@@ -246,8 +256,12 @@ class League(object):
         return 2
 
     def assign_umpire(self):
-        """Assign an umpire to a game."""
-        return random.choice(list(self.umpires))
+        """Assign an umpire to a game.
+
+        The umpires are ordered by ID before one is chosen, so that the choice doesn't depend on the
+        order that the set of them iterates in, which may differ from process to process.
+        """
+        return random.choice(sorted(self.umpires, key=lambda umpire: umpire.person.id))
 
     def add_to_game_queue(self, series):
         """Add a game to the queue of games that are scheduled to be played today."""
@@ -255,35 +269,69 @@ class League(object):
 
     def operate(self):
         """Conduct the regular operations of this league."""
-        # Have teams conduct regular operations
-        for team in self.teams:
-            team.operate()  # This will populate self.games_scheduled_for_today (if season underway)
-        # Check for special dates
-        if not self.season:  # Off-season
-            self._operate_during_offseason()
-        elif self.season:
-            self._operate_during_season()
+        with self.random_stream.activate():
+            # Have teams conduct regular operations
+            with self.cosmos.instrumentation.span('operate teams'):
+                for team in self.teams:
+                    team.operate()  # This will populate self.games_scheduled_for_today (if season underway)
+            # Check for special dates
+            if not self.season:  # Off-season
+                self._operate_during_offseason()
+            elif self.season:
+                self._operate_during_season()
 
     def _operate_during_offseason(self):
         """Conduct the regular offseason operations of this league."""
         if (self.cosmos.month, self.cosmos.day) == self.date_to_plan_next_season:
-            self.conduct_offseason_activity()
-            LeagueSeason(league=self)
+            with self.cosmos.instrumentation.span('offseason activity'):
+                self.conduct_offseason_activity()
+                LeagueSeason(league=self)
 
     def _operate_during_season(self):
         """Conduct the regular in-season operations of this league."""
-        if self.cosmos.ordinal_date == self.season.schedule.regular_season_terminus:
-            self.season.review()  # Will kick into offseason mode by setting League.season to None
-        # Instantiate Game objects, which will cause the games to transpire
-        while self.games_scheduled_for_today:
-            series = self.games_scheduled_for_today.pop()
-            # Because of doubleheaders, this series may have multiple games that
-            # need to be played today
-            while (
-                    series.dates_scheduled and
-                    series.dates_scheduled[0] == (self.cosmos.ordinal_date, self.cosmos.time_of_day)
-            ):
-                Game(series=series)
+        season = self.season  # In case it's reviewed today, which will send the league into the offseason
+        if self.cosmos.ordinal_date == season.schedule.regular_season_terminus:
+            with self.cosmos.instrumentation.span('season review'):
+                season.review()  # Will kick into offseason mode by setting League.season to None
+        # Instantiate Game objects, which will cause the games to transpire; games are played in
+        # a fixed order (rather than the arbitrary order of the set they're queued in), so that
+        # whether they're played serially or in parallel, their effects are recorded identically
+        series_today = sorted(
+            self.games_scheduled_for_today, key=lambda s: (s.home_team.name, s.away_team.name)
+        )
+        self.games_scheduled_for_today = set()
+        number_of_workers = self.cosmos.config.number_of_game_worker_processes
+        with self.cosmos.instrumentation.span('play games'):
+            if season.headless_games and number_of_workers > 1 and len(series_today) > 1:
+                if not season.game_pool:
+                    season.game_pool = GamePool(league=self, number_of_workers=number_of_workers)
+                games = season.game_pool.play(series_today=series_today)
+                season.results += [game.result for game in games]
+            else:
+                for series in series_today:
+                    # Because of doubleheaders, this series may have multiple games that
+                    # need to be played today
+                    while (
+                            series.dates_scheduled and
+                            series.dates_scheduled[0] == (self.cosmos.ordinal_date, self.cosmos.time_of_day)
+                    ):
+                        game = Game(series=series, headless=season.headless_games)
+                        season.results.append(game.result)
+        # If the season was reviewed today, the workers its games were played across are done
+        if self.season is not season and season.game_pool:
+            season.game_pool.close()
+
+    def update_leaderboards(self, players):
+        """Update this league's career and season leaderboards with the new totals of the given players.
+
+        This is called once a league game has ended, for every player on both teams.
+        """
+        career_leaderboards = self.career_leaderboards
+        season_leaderboards = self.season.leaderboards if self.season else None
+        for player in players:
+            career_leaderboards.update(player=player)
+            if season_leaderboards:
+                season_leaderboards.update(player=player)
 
     def process_a_retirement(self, player):
         """Handle the retirement of a player."""
@@ -0,0 +1,92 @@
+import heapq
+from scout import Scout, MINIMUM_AGE_OF_A_PROSPECT, MAXIMUM_AGE_OF_A_PROSPECT
+
+
+class FreeAgentMarket(object):
+    """The free agents of a place, ranked at each position by how a scout would grade them.
+
+    This stands alongside the place's population registry, which lists its free agents as
+    people come and go and as players sign, are released, and retire. For each position, the
+    market keeps a heap of the free agents who are old enough to sign, keyed on their grade at
+    that position (which is computed once, when they're pushed); players who have since signed,
+    retired, moved away, or gotten too old are discarded lazily as they surface. Players who are
+    still too young to sign are held back in cohorts by birth year, which are admitted to the heaps
+    as they come of age. Securing the best free agent at a position is then a matter of peeking
+    at the top of a heap, rather than grading everyone in the place.
+    """
+
+    def __init__(self, registry, cosmos):
+        """Initialize a FreeAgentMarket object.
+
+        @param registry: The population registry of the place whose free agents these are.
+        @param cosmos: The cosmos this place is in.
+        """
+        self.registry = registry
+        self.cosmos = cosmos
+        # Maps positions to heaps of (negated grade, person ID, player) entries; a position's heap
+        # is built the first time a player is secured to play there
+        self.heaps = {}
+        # Free agents who are born after this year are too young to sign, and are held in self.cohorts
+        self.latest_birth_year_admitted = self.cosmos.year-MINIMUM_AGE_OF_A_PROSPECT
+        self.cohorts = {}  # Maps birth years to the free agents born that year, until they're admitted
+        for person in registry.free_agent_people:
+            if person.birth_year > self.latest_birth_year_admitted:
+                self.cohorts.setdefault(person.birth_year, []).append(person.player)
+
+    def add(self, player):
+        """Add a free agent who has just been listed in this place."""
+        if player.person.birth_year > self.latest_birth_year_admitted:
+            self.cohorts.setdefault(player.person.birth_year, []).append(player)
+        else:
+            for position, heap in self.heaps.iteritems():
+                heapq.heappush(heap, self._entry(player=player, position=position))
+
+    def best(self, position):
+        """Return the best free agent here who is of age to sign and play the given position, if any."""
+        self._admit_cohorts()
+        heap = self._heap(position=position)
+        free_agents_here = self.registry.free_agent_positions
+        not_of_age_quite_yet = []
+        best = None
+        while heap:
+            player = heap[0][2]
+            person = player.person
+            if person not in free_agents_here or person.age >= MAXIMUM_AGE_OF_A_PROSPECT:
+                # He's signed, retired, moved away, died, or aged out of consideration
+                heapq.heappop(heap)
+            elif person.age <= MINIMUM_AGE_OF_A_PROSPECT:
+                # He was born in the last year admitted, but his birthday hasn't come yet
+                not_of_age_quite_yet.append(heapq.heappop(heap))
+            else:
+                best = player
+                break
+        for entry in not_of_age_quite_yet:
+            heapq.heappush(heap, entry)
+        return best
+
+    def _heap(self, position):
+        """Return the heap of free agents for the given position, building it if need be."""
+        try:
+            return self.heaps[position]
+        except KeyError:
+            heap = self.heaps[position] = [
+                self._entry(player=person.player, position=position) for person in self.registry.free_agent_people
+                if person.birth_year <= self.latest_birth_year_admitted and person.age < MAXIMUM_AGE_OF_A_PROSPECT
+            ]
+            heapq.heapify(heap)
+            return heap
+
+    def _admit_cohorts(self):
+        """Admit to the heaps the cohorts of free agents that have come of age since the last admission."""
+        latest_birth_year_to_admit = self.cosmos.year-MINIMUM_AGE_OF_A_PROSPECT
+        while self.latest_birth_year_admitted < latest_birth_year_to_admit:
+            self.latest_birth_year_admitted += 1
+            for player in self.cohorts.pop(self.latest_birth_year_admitted, ()):
+                if player.person in self.registry.free_agent_positions:
+                    for position, heap in self.heaps.iteritems():
+                        heapq.heappush(heap, self._entry(player=player, position=position))
+
+    @staticmethod
+    def _entry(player, position):
+        """Return a heap entry for the given player at the given position."""
+        return -Scout.grade(prospect=player, position=position), player.person.id, player
@@ -1102,6 +1102,7 @@ class Run(object):
             else:
                 frame.game.score[1] += 1
             frame.runs += 1
+            frame.at_bats[-1].runs_scored.append(self)
             # Record statistics
             runner.career.statistics.runs.append(self)
             if batted_in_by:
@@ -1130,6 +1131,7 @@ class Run(object):
         else:
             self.frame.game.score[1] += 1
         self.frame.runs += 1
+        self.frame.at_bats[-1].runs_scored.append(self)
         # Record statistics
         self.runner.career.statistics.runs.append(self)
         if self.batted_in_by:
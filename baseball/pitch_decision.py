@@ -0,0 +1,225 @@
+import random
+import numpy
+
+
+# The horizontal edges of the true strike zone, in ball widths from the center of home plate
+TRUE_LEFT_EDGE, TRUE_RIGHT_EDGE = -2.83, 2.83
+# The counts a pitch may be delivered in (see playing_action.PitchInterim for how these are represented)
+COUNTS = (00, 01, 02, 10, 11, 12, 20, 21, 22, 30, 31, 32)
+# The probability that a batter swings at a pitch, given the count prior to its delivery and
+# his hypothesis of whether it will be a strike or a ball -- TODO: MAKE THIS ALSO CONSIDER PITCH SPEED
+SWING_PROBABILITIES = {
+    "Strike": {
+        00: 0.3, 10: 0.41, 01: 0.78, 20: 0.4, 11: 0.63, 02: 0.995,
+        30: 0.03, 21: 0.65, 12: 0.995, 31: 0.3, 22: 0.995, 32: 0.995
+    },
+    "Ball": {
+        00: 0.01, 10: 0.03, 01: 0.15, 20: 0.02, 11: 0.15, 02: 0.46,
+        30: 0.01, 21: 0.1, 12: 0.4, 31: 0.05, 22: 0.65, 32: 0.7
+    },
+}
+# The same probabilities, as arrays indexed by the position of a count in COUNTS, for batch decisions
+SWING_PROBABILITY_ARRAYS = {
+    hypothesis: numpy.array([SWING_PROBABILITIES[hypothesis][count] for count in COUNTS])
+    for hypothesis in SWING_PROBABILITIES
+}
+
+
+class StrikeZoneTable(object):
+    """An umpire's biased model of the strike zone, compiled once per game.
+
+    Where the umpire believes the edges of the strike zone to be depends on his edge biases, on the
+    count and the previous call, on the batter's strike zone and handedness, and on whether the
+    pitcher plays for the home team -- but not on the pitch itself. So rather than recomputing the
+    edges for every pitch, a table is compiled for the umpire of a game, which computes the edges
+    for a given context the first time it comes up and looks them up thereafter; calling a pitch
+    then only requires framing its location and drawing the umpire's inconsistency noise.
+    """
+
+    def __init__(self, umpire, home_team):
+        """Initialize a StrikeZoneTable object.
+
+        @param umpire: The umpire whose model of the strike zone this is.
+        @param home_team: The home team of the game this umpire is working.
+        """
+        self.umpire = umpire
+        self.home_team = home_team
+        self.edges = {}  # Maps contexts to (left, right, bottom, top) edges
+
+    def __getitem__(self, context):
+        """Return the edges of the strike zone for the given context (see context())."""
+        try:
+            return self.edges[context]
+        except KeyError:
+            edges = self.edges[context] = self._compute_edges(*context)
+            return edges
+
+    def context(self, pitch):
+        """Return the context of the given pitch that determines the umpire's model of the strike zone."""
+        # The previous call only matters when it isn't preempted by a count bias, and there's
+        # no previous call on the first pitch of an at-bat (nor is it considered on a full count)
+        if pitch.count == 00 or pitch.count == 32:
+            previous_call = None
+        else:
+            previous_call = pitch.at_bat.pitches[-1].call
+        return (
+            pitch.batter.strike_zone, pitch.batter_left_handed, pitch.count, previous_call,
+            pitch.pitcher.career.team is self.home_team
+        )
+
+    def _compute_edges(self, strike_zone, batter_left_handed, count, previous_call, home_team_pitcher):
+        """Compute the edges of the umpire's model of the strike zone in the given context."""
+        umpire = self.umpire
+        # First, start with a perfect model of the true strike zone
+        left_edge, right_edge = TRUE_LEFT_EDGE, TRUE_RIGHT_EDGE
+        bottom_edge, top_edge = strike_zone
+        # Pollute this model with edge biases
+        left_edge += umpire.pitch_call_left_edge_bias
+        right_edge += umpire.pitch_call_right_edge_bias
+        top_edge += umpire.pitch_call_top_edge_bias
+        bottom_edge += umpire.pitch_call_bottom_edge_bias
+        # Further pollute the model with count biases and previous-call biases, as appropriate;
+        # first, consider whether a count bias should be enacted, given the pitch context; if it
+        # is not applicable, consider applying a previous-call bias (they'll never both be applied
+        # simultaneously)
+        if count == 02 or count == 12 or count == 22:
+            # Constrict the strike zone
+            left_edge += umpire.pitch_call_two_strikes_bias
+            right_edge -= umpire.pitch_call_two_strikes_bias
+            top_edge -= umpire.pitch_call_two_strikes_bias
+            bottom_edge += umpire.pitch_call_two_strikes_bias
+        elif previous_call == "Strike":
+            # Constrict the strike zone
+            left_edge += umpire.pitch_call_just_called_strike_bias
+            right_edge -= umpire.pitch_call_just_called_strike_bias
+            top_edge -= umpire.pitch_call_just_called_strike_bias
+            bottom_edge += umpire.pitch_call_just_called_strike_bias
+        if count == 30 or count == 31:
+            # Expand the strike zone
+            left_edge -= umpire.pitch_call_three_balls_bias
+            right_edge += umpire.pitch_call_three_balls_bias
+            top_edge += umpire.pitch_call_three_balls_bias
+            bottom_edge -= umpire.pitch_call_three_balls_bias
+        elif previous_call == "Ball":
+            # Expand the strike zone
+            left_edge -= umpire.pitch_call_just_called_ball_bias
+            right_edge += umpire.pitch_call_just_called_ball_bias
+            top_edge += umpire.pitch_call_just_called_ball_bias
+            bottom_edge -= umpire.pitch_call_just_called_ball_bias
+        # Further pollute the model with left-handed hitter bias, if appropriate
+        if batter_left_handed:
+            left_edge += umpire.pitch_call_lefty_bias
+            right_edge += umpire.pitch_call_lefty_bias
+        # Further pollute the model with home-team--pitcher bias, if appropriate, which
+        # expands the strike zone at all edges
+        if home_team_pitcher:
+            left_edge -= umpire.pitch_call_home_team_bias
+            right_edge += umpire.pitch_call_home_team_bias
+            top_edge += umpire.pitch_call_home_team_bias
+            bottom_edge -= umpire.pitch_call_home_team_bias
+        return left_edge, right_edge, bottom_edge, top_edge
+
+    def call_pitches(self, batter, catcher, home_team_pitcher, counts, previous_calls, xs, ys,
+                     batter_left_handed=False):
+        """Call a batch of pitches that aren't swung at, all at once.
+
+        @param batter: The batter the pitches are thrown to.
+        @param catcher: The catcher receiving (and framing) the pitches.
+        @param home_team_pitcher: Whether the pitcher plays for the home team.
+        @param counts: The count prior to the delivery of each pitch.
+        @param previous_calls: The call of the pitch preceding each pitch (None for the first
+                               pitch of an at-bat).
+        @param xs: The actual x-coordinate of each pitch as it crosses the plate.
+        @param ys: The actual y-coordinate of each pitch as it crosses the plate.
+        @param batter_left_handed: Whether the batter is hitting left-handed.
+        @return: A boolean array that is True for each pitch that is called a strike.
+        """
+        edges = numpy.array([
+            self[(
+                batter.strike_zone, batter_left_handed, count,
+                None if count == 00 or count == 32 else previous_call, home_team_pitcher
+            )]
+            for count, previous_call in zip(counts, previous_calls)
+        ])
+        framed_xs, framed_ys = frame_pitch_locations(
+            xs=numpy.asarray(xs, dtype=float), ys=numpy.asarray(ys, dtype=float), pitch_framing=catcher.pitch_framing
+        )
+        # Pollute the framed locations with the umpire's inconsistency
+        noise = numpy_generator().normal(0.0, self.umpire.pitch_call_inconsistency, size=(2, len(edges)))
+        perceived_xs = framed_xs + noise[0]
+        perceived_ys = framed_ys + noise[1]
+        return (
+            (edges[:, 0] < perceived_xs) & (perceived_xs < edges[:, 1]) &
+            (edges[:, 2] < perceived_ys) & (perceived_ys < edges[:, 3])
+        )
+
+
+def frame_pitch_location(x, y, pitch_framing):
+    """Return the location of a pitch as it's presented to the umpire by a catcher with the given framing.
+
+    Good pitch framers bring the ball toward the center of the strike zone, while bad pitch framers pull
+    it away from it; this is only enacted in borderline pitches.
+    """
+    if -4 < x < -2:
+        # Pull up toward [0, 0]
+        framed_x = x + pitch_framing
+    elif 2 < x < 4:
+        # Pull down toward [0, 0]
+        framed_x = x - pitch_framing
+    else:
+        framed_x = x
+    if -5 < y < -3:
+        framed_y = y + pitch_framing
+    elif 3 < x < 5:
+        framed_y = y - pitch_framing
+    else:
+        framed_y = y
+    return framed_x, framed_y
+
+
+def frame_pitch_locations(xs, ys, pitch_framing):
+    """Return the locations of a batch of pitches as they're presented to the umpire (see frame_pitch_location())."""
+    framed_xs = numpy.where(
+        (-4 < xs) & (xs < -2), xs+pitch_framing, numpy.where((2 < xs) & (xs < 4), xs-pitch_framing, xs)
+    )
+    framed_ys = numpy.where(
+        (-5 < ys) & (ys < -3), ys+pitch_framing, numpy.where((3 < xs) & (xs < 5), ys-pitch_framing, ys)
+    )
+    return framed_xs, framed_ys
+
+
+def decide_swings(batter, counts, xs, ys):
+    """Decide, all at once, whether the given batter will swing at each of a batch of pitches.
+
+    @param batter: The batter deciding.
+    @param counts: The count prior to the delivery of each pitch.
+    @param xs: The actual x-coordinate of each pitch as it crosses the plate.
+    @param ys: The actual y-coordinate of each pitch as it crosses the plate.
+    @return: A boolean array that is True for each pitch the batter will swing at.
+    """
+    generator = numpy_generator()
+    xs = numpy.asarray(xs, dtype=float)
+    ys = numpy.asarray(ys, dtype=float)
+    # Form the batter's hypotheses of where the pitches will cross the plate, and thereby of
+    # whether they will be strikes
+    hypothesized_xs = xs + generator.normal(0.0, batter.pitch_recognition, size=len(xs))
+    hypothesized_ys = ys + generator.normal(0.0, batter.pitch_recognition, size=len(ys))
+    hypothesized_strikes = (
+        (TRUE_LEFT_EDGE < hypothesized_xs) & (hypothesized_xs < TRUE_RIGHT_EDGE) &
+        (batter.strike_zone[0] < hypothesized_ys) & (hypothesized_ys < batter.strike_zone[1])
+    )
+    count_indices = numpy.array([COUNTS.index(count) for count in counts], dtype=int)
+    swing_probabilities = numpy.where(
+        hypothesized_strikes, SWING_PROBABILITY_ARRAYS["Strike"][count_indices],
+        SWING_PROBABILITY_ARRAYS["Ball"][count_indices]
+    )
+    return generator.random_sample(len(count_indices)) < swing_probabilities
+
+
+def numpy_generator():
+    """Return a NumPy generator seeded from the global random-number generator.
+
+    Seeding it this way means that batch decisions draw from whichever random stream is active
+    (see utils.rng), just like the rest of the simulation does.
+    """
+    return numpy.random.RandomState(random.getrandbits(32))
@@ -1,6 +1,7 @@
 from random import normalvariate as normal
 from batted_ball import BattedBall, FoulTip
 from outcome import Bean
+from clock import seconds, ticks_to_elapse
 
 import os, time  # for radio
 
@@ -366,28 +367,34 @@ class Throw(object):
         self.power = power
         self.distance_to_target = distance_to_target
         self.initial_velocity = thrown_by.throwing_velocity * power
-        self.hang_time = self.determine_time_it_will_take_to_reach_target()
+        self.hang_ticks = self.determine_ticks_it_will_take_to_reach_target()
+        self.hang_time = seconds(self.hang_ticks)
         self.height_error = height_error
         self.lateral_error = lateral_error
         self.back_to_pitcher = back_to_pitcher
         if not back_to_pitcher:
             playing_action.potential_assistants.add(self.thrown_by)
-        # Dynamic; modified during play
-        self.time_until_release = release_time
-        self.time_remaining_until_target_is_reached = self.hang_time
+        # Dynamic; modified during play, tick by tick
+        self.ticks_until_release = ticks_to_elapse(release_time)
+        self.ticks_remaining_until_target_is_reached = self.hang_ticks
         self.reached_target = False
         self.timestep_reached_target = None
         self.resolved = False
 
-    def determine_time_it_will_take_to_reach_target(self):
+    @property
+    def time_remaining_until_target_is_reached(self):
+        """Return the time remaining until this throw reaches its target, in seconds."""
+        return seconds(max(self.ticks_remaining_until_target_is_reached, 0))
+
+    def determine_ticks_it_will_take_to_reach_target(self):
         distance_traveled = 0.0
-        time_elapsed = 0.0
+        ticks_elapsed = 0
         velocity = self.initial_velocity
         while distance_traveled < self.distance_to_target:
-            time_elapsed += 0.1
+            ticks_elapsed += 1
             distance_traveled += velocity/10.
             velocity *= 0.99
-        return time_elapsed
+        return ticks_elapsed
 
     def move(self):
         if not self.back_to_pitcher and not self.thrown_to.at_goal and self.distance_to_target < 100:
@@ -396,22 +403,17 @@ class Throw(object):
                     self.thrown_by.person.last_name, self.thrown_to.person.last_name, self.base,
                     self.playing_action.batted_ball.time_since_contact
                 )
-        elif self.time_until_release > 0:
-            self.time_until_release -= 0.1
-            if self.time_until_release <= 0.0:
+        elif self.ticks_until_release > 0:
+            self.ticks_until_release -= 1
+            if self.ticks_until_release == 0:
                 if self.playing_action.batted_ball.at_bat.game.trace:
                     print "-- {} has released the throw [{}]".format(
                         self.thrown_by.person.last_name, self.playing_action.batted_ball.time_since_contact
                     )
         else:
-            self.time_remaining_until_target_is_reached -= 0.1
-            if self.time_remaining_until_target_is_reached <= 0.0:
+            self.ticks_remaining_until_target_is_reached -= 1
+            if self.ticks_remaining_until_target_is_reached <= 0:
                 self.reached_target = True
-                # Record the precise time the throw reached its target, for potential use
+                # Record the time the throw reached its target, for potential use
                 # by umpire.call_play_at_base()
-                if self.time_remaining_until_target_is_reached < 0:
-                    self.timestep_reached_target = (
-                        self.playing_action.batted_ball.time_since_contact + self.time_remaining_until_target_is_reached
-                    )
-                elif self.time_remaining_until_target_is_reached == 0:
-                    self.timestep_reached_target = self.playing_action.batted_ball.time_since_contact
+                self.timestep_reached_target = self.playing_action.batted_ball.time_since_contact
@@ -0,0 +1,431 @@
+import os
+import array
+import shutil
+import struct
+import tempfile
+import collections
+from play import Pitch, Swing
+from outcome import FoulBall
+
+
+# The version of the binary format that games are encoded in, which leads each game's record
+FORMAT_VERSION = 1
+# The kinds of entries in the play-by-play of a game
+AT_BAT, PITCH, BATTED_BALL, OUTCOME = 1, 2, 3, 4
+# The layouts of the fixed-size parts of a game's record (all little-endian)
+GAME_HEADER = struct.Struct('<BQIBHHH')  # Version, seed, ordinal date, night game, away score, home score, innings
+PARTICIPANT = struct.Struct('<IBB')  # Person ID, team (0 for away, 1 for home), position
+AT_BAT_ENTRY = struct.Struct('<HBBBBBBB')  # Inning, bottom half, batter, pitcher, outs, runners on 1B, 2B, 3B
+PITCH_ENTRY = struct.Struct('<fffBB')  # x, y, speed, call, flags
+BATTED_BALL_ENTRY = struct.Struct('<fff')  # Exit speed, horizontal launch angle, vertical launch angle
+OUTCOME_ENTRY = struct.Struct('<BBBBBB')  # Outcome, outs, runners on 1B, 2B, 3B, number of runs
+RUN_ENTRY = struct.Struct('<BB')  # Runner, whether the run was batted in
+STRING_LENGTH = struct.Struct('<H')
+ENTRY_KIND = struct.Struct('<B')
+NUMBER_OF_PARTICIPANTS = struct.Struct('<B')
+# Marks an empty base (or an unknown participant)
+NOBODY = 255
+POSITIONS = ('P', 'C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF', 'DH', None)
+CALLS = (None, 'Strike', 'Ball')
+# Flags describing what the batter did with a pitch
+SWUNG, CONTACT, FOUL, BEAN = 1, 2, 4, 8
+# The outcomes an at-bat may have, by class name (or, for surrogate at-bats, by category)
+OUTCOMES = (
+    None, 'Strikeout', 'DroppedThirdStrike', 'BaseOnBalls', 'HitByPitch', 'Single', 'Double', 'AutomaticDouble',
+    'GroundRuleDouble', 'Triple', 'HomeRun', 'GrandSlam', 'FlyOut', 'ForceOut', 'TagOut', 'DoublePlay',
+    'TriplePlay', 'FieldersChoice', 'HitOnError'
+)
+HIT_BASES = {
+    'Single': 1, 'Double': 2, 'AutomaticDouble': 2, 'GroundRuleDouble': 2, 'Triple': 3, 'HomeRun': 4, 'GrandSlam': 4
+}
+# Outcomes that count as plate appearances but not as at-bats
+NOT_AT_BATS = ('BaseOnBalls', 'HitByPitch')
+
+
+class PlayLog(object):
+    """An append-only, on-disk log of the play-by-play of every game in a cosmos.
+
+    Each game is encoded (see PlayByPlayRecorder) into a compact binary record -- the location,
+    speed, and call of each pitch, what the batter did with it, the launch conditions of balls put
+    into play, and the outcome of each at-bat and the movements of the runners -- which is appended
+    to a single file, and which is found again by its entry number through an in-memory index of
+    file offsets. Since the record of a game is all that's needed to replay it (see replay()), its
+    at-bats, box score, and play-by-play call can be rebuilt on demand without keeping the object
+    graph of the game alive in memory.
+    """
+
+    def __init__(self, directory=None):
+        """Initialize a PlayLog object.
+
+        @param directory: The directory to write the log into; if this is None, a temporary
+                          directory will be created the first time a game is appended.
+        """
+        self.directory = directory
+        self.path = None
+        # The offset in the file of each entry, with a trailing offset for the end of the last entry
+        self.offsets = array.array('L', [0])
+
+    def __len__(self):
+        """Return the number of games in this log."""
+        return len(self.offsets) - 1
+
+    def __getstate__(self):
+        """Return the state of this log that will be serialized when the cosmos is saved.
+
+        The contents of the log file are included, so that the snapshot does not depend on the
+        file on disk; __setstate__() writes them out again into a new directory.
+        """
+        state = dict(self.__dict__)
+        state['contents'] = self._read(start=0, end=self.offsets[-1]) if len(self) else ''
+        state['directory'] = None
+        state['path'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore this log from its serialized state."""
+        contents = state.pop('contents')
+        self.__dict__.update(state)
+        if contents:
+            self._write(data=contents)
+
+    def append(self, record):
+        """Append the encoded record of a game to this log, and return its entry number."""
+        self._write(data=record)
+        self.offsets.append(self.offsets[-1] + len(record))
+        return len(self) - 1
+
+    def read(self, entry):
+        """Return the encoded record of the game with the given entry number."""
+        if not 0 <= entry < len(self):
+            raise IndexError("There is no game with entry number {} in the play log".format(entry))
+        return self._read(start=self.offsets[entry], end=self.offsets[entry+1])
+
+    def replay(self, entry):
+        """Return a ReplayedGame rebuilt from the record of the game with the given entry number."""
+        return ReplayedGame(record=self.read(entry=entry))
+
+    def delete(self):
+        """Delete this log's file on disk; its games will no longer be retrievable afterward."""
+        if self.directory and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.path = None
+        self.offsets = array.array('L', [0])
+
+    def _write(self, data):
+        """Append the given bytes to the log file, creating it if need be."""
+        if not self.path:
+            if not self.directory:
+                self.directory = tempfile.mkdtemp(prefix='play_log_')
+            self.path = os.path.join(self.directory, 'games.plays')
+        with open(self.path, 'ab') as log_file:
+            log_file.write(data)
+
+    def _read(self, start, end):
+        """Return the bytes of the log file in the given range."""
+        with open(self.path, 'rb') as log_file:
+            log_file.seek(start)
+            return log_file.read(end-start)
+
+
+class PlayByPlayRecorder(object):
+    """Records the play-by-play of a game as it transpires, and encodes it for a PlayLog."""
+
+    def __init__(self, game):
+        """Initialize a PlayByPlayRecorder object."""
+        self.game = game
+        self.participants = {}  # Maps players to their indices in the record
+        self.participant_records = []
+        self.entries = []  # Encoded entries, in order
+
+    def participant(self, player):
+        """Return the index of the given player in the record, registering them if need be."""
+        if player is None:
+            return NOBODY
+        try:
+            return self.participants[player]
+        except KeyError:
+            index = self.participants[player] = len(self.participant_records)
+            team = 1 if player.career.team is self.game.home_team else 0
+            position = player.position if player.position in POSITIONS else None
+            self.participant_records.append(
+                (PARTICIPANT.pack(player.person.id, team, POSITIONS.index(position)), player.person.last_name)
+            )
+            return index
+
+    def record_at_bat(self, at_bat):
+        """Record the given at-bat, which has just been resolved."""
+        frame = at_bat.frame
+        append = self.entries.append
+        append(ENTRY_KIND.pack(AT_BAT))
+        append(AT_BAT_ENTRY.pack(
+            frame.inning.number, int(frame.half == "Bottom"), self.participant(at_bat.batter),
+            self.participant(at_bat.pitcher), at_bat.outs_before, *[self.participant(r) for r in at_bat.bases_before]
+        ))
+        for pitch in at_bat.pitches:
+            if not isinstance(pitch, Pitch):  # Beans are appended to the pitches of an at-bat too
+                continue
+            flags = BEAN if pitch.bean else 0
+            batted_ball = None
+            if isinstance(pitch.result, Swing):
+                flags |= SWUNG
+                if pitch.result.contact:
+                    flags |= CONTACT
+                    batted_ball = pitch.result.result
+                    if isinstance(getattr(batted_ball, 'result', None), FoulBall):
+                        flags |= FOUL
+            append(ENTRY_KIND.pack(PITCH))
+            append(PITCH_ENTRY.pack(pitch.actual_x, pitch.actual_y, pitch.speed, CALLS.index(pitch.call), flags))
+            if batted_ball is not None and hasattr(batted_ball, 'exit_speed'):
+                append(ENTRY_KIND.pack(BATTED_BALL))
+                append(BATTED_BALL_ENTRY.pack(
+                    batted_ball.exit_speed, batted_ball.horizontal_launch_angle, batted_ball.vertical_launch_angle
+                ))
+        result_name = getattr(at_bat.result, 'category', None) or type(at_bat.result).__name__
+        append(ENTRY_KIND.pack(OUTCOME))
+        append(OUTCOME_ENTRY.pack(
+            OUTCOMES.index(result_name) if result_name in OUTCOMES else 0, frame.outs,
+            self.participant(frame.on_first), self.participant(frame.on_second), self.participant(frame.on_third),
+            len(at_bat.runs_scored)
+        ))
+        for run in at_bat.runs_scored:
+            append(RUN_ENTRY.pack(self.participant(run.runner), int(run.batted_in_by is not None)))
+
+    def encode(self):
+        """Return the encoded record of the game."""
+        game = self.game
+        parts = [
+            GAME_HEADER.pack(
+                FORMAT_VERSION, game.seed or 0, game.ordinal_date, int(game.time_of_day == "night"), game.score[0],
+                game.score[1], len(game.innings)
+            )
+        ]
+        for team in (game.away_team, game.home_team):
+            parts.append(_encode_string(team.name))
+            parts.append(_encode_string(team.city.name))
+        parts.append(NUMBER_OF_PARTICIPANTS.pack(len(self.participant_records)))
+        for packed_participant, last_name in self.participant_records:
+            parts.append(packed_participant)
+            parts.append(_encode_string(last_name))
+        parts.extend(self.entries)
+        return ''.join(parts)
+
+
+def _encode_string(string):
+    """Return the given string encoded with a length prefix."""
+    if isinstance(string, unicode):
+        string = string.encode('utf-8')
+    return STRING_LENGTH.pack(len(string)) + string
+
+
+# The pieces of a replayed game (see ReplayedGame)
+ReplayedParticipant = collections.namedtuple('ReplayedParticipant', ['person_id', 'last_name', 'team', 'position'])
+ReplayedPitch = collections.namedtuple('ReplayedPitch', ['x', 'y', 'speed', 'call', 'swung', 'contact', 'foul', 'bean'])
+ReplayedBattedBall = collections.namedtuple(
+    'ReplayedBattedBall', ['exit_speed', 'horizontal_launch_angle', 'vertical_launch_angle']
+)
+ReplayedRun = collections.namedtuple('ReplayedRun', ['runner', 'batted_in'])
+
+
+class ReplayedAtBat(object):
+    """An at-bat, as it's rebuilt from the play log."""
+
+    def __init__(self, inning, bottom, batter, pitcher, outs_before, bases_before):
+        """Initialize a ReplayedAtBat object."""
+        self.inning = inning
+        self.bottom = bottom
+        self.batter = batter
+        self.pitcher = pitcher
+        self.outs_before = outs_before
+        self.bases_before = bases_before
+        self.pitches = []
+        self.batted_balls = []  # Including foul balls
+        self.result = None  # The name of the outcome class (or surrogate outcome category)
+        self.outs_after = None
+        self.bases_after = None
+        self.runs = []
+
+    def __str__(self):
+        """Return string representation."""
+        return "{batter}: {result}".format(batter=self.batter.last_name, result=self.result)
+
+
+class ReplayedGame(object):
+    """A game, as it's rebuilt from its record in the play log."""
+
+    def __init__(self, record):
+        """Initialize a ReplayedGame object by decoding the given record."""
+        (version, self.seed, self.ordinal_date, night_game, away_score, home_score,
+         self.number_of_innings) = GAME_HEADER.unpack_from(record, 0)
+        assert version == FORMAT_VERSION, "Cannot replay a game recorded in play-log format {}.".format(version)
+        self.time_of_day = "night" if night_game else "day"
+        self.score = [away_score, home_score]
+        offset = GAME_HEADER.size
+        self.away_team, offset = _decode_string(record, offset)
+        self.away_city, offset = _decode_string(record, offset)
+        self.home_team, offset = _decode_string(record, offset)
+        self.home_city, offset = _decode_string(record, offset)
+        number_of_participants, = NUMBER_OF_PARTICIPANTS.unpack_from(record, offset)
+        offset += NUMBER_OF_PARTICIPANTS.size
+        self.participants = []
+        for _ in xrange(number_of_participants):
+            person_id, team, position = PARTICIPANT.unpack_from(record, offset)
+            last_name, offset = _decode_string(record, offset+PARTICIPANT.size)
+            self.participants.append(
+                ReplayedParticipant(person_id=person_id, last_name=last_name, team=team, position=POSITIONS[position])
+            )
+        self.at_bats = self._decode_at_bats(record=record, offset=offset)
+
+    def __str__(self):
+        """Return string representation."""
+        return "{away_team} at {home_team} (replayed)".format(away_team=self.away_team, home_team=self.home_team)
+
+    def _decode_at_bats(self, record, offset):
+        """Decode the at-bats of this game, starting at the given offset."""
+        participant = lambda index: self.participants[index] if index != NOBODY else None
+        at_bats = []
+        at_bat = None
+        while offset < len(record):
+            kind, = ENTRY_KIND.unpack_from(record, offset)
+            offset += ENTRY_KIND.size
+            if kind == AT_BAT:
+                inning, bottom, batter, pitcher, outs, first, second, third = AT_BAT_ENTRY.unpack_from(record, offset)
+                offset += AT_BAT_ENTRY.size
+                at_bat = ReplayedAtBat(
+                    inning=inning, bottom=bool(bottom), batter=participant(batter), pitcher=participant(pitcher),
+                    outs_before=outs, bases_before=tuple(participant(r) for r in (first, second, third))
+                )
+                at_bats.append(at_bat)
+            elif kind == PITCH:
+                x, y, speed, call, flags = PITCH_ENTRY.unpack_from(record, offset)
+                offset += PITCH_ENTRY.size
+                at_bat.pitches.append(ReplayedPitch(
+                    x=x, y=y, speed=speed, call=CALLS[call], swung=bool(flags & SWUNG),
+                    contact=bool(flags & CONTACT), foul=bool(flags & FOUL), bean=bool(flags & BEAN)
+                ))
+            elif kind == BATTED_BALL:
+                at_bat.batted_balls.append(ReplayedBattedBall(*BATTED_BALL_ENTRY.unpack_from(record, offset)))
+                offset += BATTED_BALL_ENTRY.size
+            elif kind == OUTCOME:
+                result, outs, first, second, third, number_of_runs = OUTCOME_ENTRY.unpack_from(record, offset)
+                offset += OUTCOME_ENTRY.size
+                at_bat.result = OUTCOMES[result]
+                at_bat.outs_after = outs
+                at_bat.bases_after = tuple(participant(r) for r in (first, second, third))
+                for _ in xrange(number_of_runs):
+                    runner, batted_in = RUN_ENTRY.unpack_from(record, offset)
+                    offset += RUN_ENTRY.size
+                    at_bat.runs.append(ReplayedRun(runner=participant(runner), batted_in=bool(batted_in)))
+            else:
+                raise ValueError("Unknown play-log entry kind {} at offset {}".format(kind, offset))
+        return at_bats
+
+    def runs_by_inning(self):
+        """Return the runs scored by the away team and by the home team in each inning."""
+        runs = [[0]*self.number_of_innings, [0]*self.number_of_innings]
+        for at_bat in self.at_bats:
+            runs[int(at_bat.bottom)][at_bat.inning-1] += len(at_bat.runs)
+        return runs
+
+    def batting_lines(self):
+        """Return, for each batter in this game, in order of appearance, their tallies for this game."""
+        lines = collections.OrderedDict()
+        blank_line = lambda: collections.Counter()
+        for at_bat in self.at_bats:
+            line = lines.setdefault(at_bat.batter, blank_line())
+            if at_bat.result not in NOT_AT_BATS:
+                line['AB'] += 1
+            bases = HIT_BASES.get(at_bat.result)
+            if bases:
+                line['H'] += 1
+                line[{1: '1B', 2: '2B', 3: '3B', 4: 'HR'}[bases]] += 1
+            elif at_bat.result == 'BaseOnBalls':
+                line['BB'] += 1
+            elif at_bat.result in ('Strikeout', 'DroppedThirdStrike'):
+                line['SO'] += 1
+            for run in at_bat.runs:
+                lines.setdefault(run.runner, blank_line())['R'] += 1
+                if run.batted_in:
+                    line['RBI'] += 1
+        return lines
+
+    @property
+    def box_score(self):
+        """Return the box score for this game, with each batter's tallies for this game alone."""
+        runs_by_inning = self.runs_by_inning()
+        box_score = '\n\n'
+        box_score += '\n\t\t' + '   '.join(str(i+1) for i in xrange(self.number_of_innings))
+        box_score += '\n\t\t__________________________________'
+        for team, (city, runs, score) in enumerate(zip(
+                (self.away_city, self.home_city), runs_by_inning, self.score)):
+            tabs_needed = '\t' if len(city) >= 8 else '\t\t'
+            innings_batted = [
+                str(r) if team == 0 or any(a.bottom and a.inning == i+1 for a in self.at_bats) else '-'
+                for i, r in enumerate(runs)
+            ]
+            box_score += '\n' + city + tabs_needed + '   '.join(innings_batted) + '\t' + str(score)
+            box_score += '\n'
+        batting_lines = self.batting_lines()
+        for team, team_name in enumerate((self.away_team, self.home_team)):
+            box_score += '\n\n\t {}\n'.format(team_name)
+            box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tAVG'
+            for batter, line in batting_lines.iteritems():
+                if batter.team != team:
+                    continue
+                batting_average = '{:.3f}'.format(float(line['H'])/line['AB']) if line['AB'] else '.000'
+                if batting_average.startswith('0'):
+                    batting_average = batting_average[1:]
+                tabs_needed = '\t' if len(batter.last_name) >= 8 else '\t\t'
+                box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
+                    batter.last_name, tabs_needed, batter.position, line['AB'], line['R'], line['H'], line['2B'],
+                    line['3B'], line['HR'], line['RBI'], line['BB'], line['SO'], batting_average
+                )
+        return box_score
+
+    def call(self):
+        """Return an announcer's play-by-play call of this game, as text."""
+        lines = []
+        score = [0, 0]
+        half = None
+        for at_bat in self.at_bats:
+            if (at_bat.inning, at_bat.bottom) != half:
+                half = (at_bat.inning, at_bat.bottom)
+                lines.append('\n{} of inning {} -- {} up to bat'.format(
+                    'Bottom' if at_bat.bottom else 'Top', at_bat.inning,
+                    self.home_team if at_bat.bottom else self.away_team
+                ))
+            lines.append('{} steps in against {} with {} out{}.'.format(
+                at_bat.batter.last_name, at_bat.pitcher.last_name if at_bat.pitcher else 'the pitcher',
+                at_bat.outs_before, '' if at_bat.outs_before == 1 else 's'
+            ))
+            batted_balls = iter(at_bat.batted_balls)
+            for pitch in at_bat.pitches:
+                description = '  {:.0f} mph -- '.format(pitch.speed)
+                if pitch.bean:
+                    description += 'hit by the pitch!'
+                elif not pitch.swung:
+                    description += (pitch.call or 'no call').lower()
+                elif not pitch.contact:
+                    description += 'swing and a miss'
+                else:
+                    batted_ball = next(batted_balls, None)
+                    description += 'fouled off' if pitch.foul else 'put in play'
+                    if batted_ball:
+                        description += ' ({:.0f} mph off the bat at {:.0f} degrees)'.format(
+                            batted_ball.exit_speed, batted_ball.vertical_launch_angle
+                        )
+                lines.append(description)
+            lines.append('  {}{}'.format(at_bat.result or 'No result', ' (simulated)' if not at_bat.pitches else ''))
+            for run in at_bat.runs:
+                score[int(at_bat.bottom)] += 1
+                lines.append('  {} scores! {} {}, {} {}'.format(
+                    run.runner.last_name, self.away_city, score[0], self.home_city, score[1]
+                ))
+        lines.append('\nFinal: {} {}, {} {}'.format(self.away_team, self.score[0], self.home_team, self.score[1]))
+        return '\n'.join(lines)
+
+
+def _decode_string(record, offset):
+    """Decode a length-prefixed string at the given offset, returning it and the offset after it."""
+    length, = STRING_LENGTH.unpack_from(record, offset)
+    offset += STRING_LENGTH.size
+    return record[offset:offset+length], offset+length
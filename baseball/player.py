@@ -8,7 +8,9 @@ from random import normalvariate as normal
 from corpora import Names
 from equipment import Bat, Baseball, Glove, Mitt
 from play import Pitch, Swing, Bunt, FieldingAct, Throw
+from pitch_decision import SWING_PROBABILITIES
 from career import PlayerCareer
+from clock import seconds
 
 
 # TODO PAIRWISE SYNERGY BETWEEN PLAYERS -- MAYBE A BASEBALL-CENTRIC CLASS RESEMBLING RELATIONSHIP()
@@ -360,6 +362,17 @@ class Player(object):
         """Return whether this player plays left-handed."""
         return self.person.body.lefty
 
+    @property
+    def free_agent(self):
+        """Return whether this player is not under contract (and hasn't retired)."""
+        return not self.career.retired and not self.career.team
+
+    def update_free_agency(self):
+        """Let the places this player lives in know that his contract status has changed (see PopulationRegistry)."""
+        city = self.person.city
+        if city is not None:
+            city.registry.update_free_agency(person=self.person)
+
     def get_in_position(self, at_bat):
         """Get into position prior to a pitch."""
         # Clamp composure
@@ -407,7 +420,7 @@ class Player(object):
             self.location = [-133, 235]
         # Reset dynamic in-play attributes
         self.time_needed_to_field_ball = None
-        self.timestep_of_planned_fielding_attempt = None
+        self.tick_of_planned_fielding_attempt = None
         self.attempting_fly_out = False
         self.immediate_goal = None
         self.dist_per_timestep = None
@@ -619,131 +632,9 @@ class Player(object):
             pitch.batter_hypothesis = "Strike"
         else:
             pitch.batter_hypothesis = "Ball"
-        # Decide whether to hit -- TODO: MAKE THIS ALSO CONSIDER PITCH SPEED
-        if pitch.batter_hypothesis == "Strike":
-            if pitch.count == 00:
-                # Count before this pitch is 0-0
-                if random.random() < 0.3:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 10:
-                if random.random() < 0.41:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 01:
-                if random.random() < 0.78:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 20:
-                if random.random() < 0.4:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 11:
-                if random.random() < 0.63:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 02:
-                if random.random() < 0.995:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 30:
-                if random.random() < 0.03:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 21:
-                if random.random() < 0.65:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 12:
-                if random.random() < 0.995:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 31:
-                if random.random() < 0.3:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 22:
-                if random.random() < 0.995:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 32:
-                if random.random() < 0.995:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-        elif pitch.batter_hypothesis == "Ball":
-            if pitch.count == 00:
-                # Count before this pitch is 0-0
-                if random.random() < 0.01:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 10:
-                if random.random() < 0.03:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 01:
-                if random.random() < 0.15:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 20:
-                if random.random() < 0.02:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 11:
-                if random.random() < 0.15:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 02:
-                if random.random() < 0.46:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 30:
-                if random.random() < 0.01:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 21:
-                if random.random() < 0.1:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 12:
-                if random.random() < 0.4:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 31:
-                if random.random() < 0.05:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 22:
-                if random.random() < 0.65:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
-            elif pitch.count == 32:
-                if random.random() < 0.7:
-                    self.will_swing = True
-                else:
-                    self.will_swing = False
+        # Decide whether to hit, by looking up the chance of swinging given the count and
+        # the batter's hypothesis (see pitch_decision.SWING_PROBABILITIES)
+        self.will_swing = random.random() < SWING_PROBABILITIES[pitch.batter_hypothesis][pitch.count]
 
     def decide_swing(self, pitch):
         # Decide whether to bunt
@@ -1004,15 +895,13 @@ class Player(object):
                         # will be four-six timesteps later on its trajectory if it were to continue
                         # on it uninterrupted by the fielder playing the ball's fielding attempt
                         fielder_playing_the_ball = next(f for f in self.team.players if f.playing_the_ball)
-                        timestep_i_will_shoot_for = fielder_playing_the_ball.timestep_of_planned_fielding_attempt
-                        for i in xrange(5):
-                            timestep_i_will_shoot_for += 0.1
-                        if timestep_i_will_shoot_for in batted_ball.position_at_timestep:
-                            self.immediate_goal = batted_ball.position_at_timestep[timestep_i_will_shoot_for][:2]
+                        tick_i_will_shoot_for = fielder_playing_the_ball.tick_of_planned_fielding_attempt + 5
+                        if tick_i_will_shoot_for < len(batted_ball.position_at_tick):
+                            self.immediate_goal = batted_ball.position_at_tick[tick_i_will_shoot_for][:2]
                         else:
                             if playing_action.at_bat.game.trace:
-                                print "timestep {} not in batted_ball.position_at_timestep".format(
-                                    timestep_i_will_shoot_for
+                                print "tick {} not in batted_ball.position_at_tick".format(
+                                    tick_i_will_shoot_for
                                 )
                             self.immediate_goal = batted_ball.final_location
                         if playing_action.at_bat.game.trace:
@@ -1046,15 +935,13 @@ class Player(object):
                         # will be four-six timesteps later on its trajectory if it were to continue
                         # on it uninterrupted by the fielder playing the ball's fielding attempt
                         fielder_playing_the_ball = next(f for f in self.team.players if f.playing_the_ball)
-                        timestep_i_will_shoot_for = fielder_playing_the_ball.timestep_of_planned_fielding_attempt
-                        for i in xrange(5):
-                            timestep_i_will_shoot_for += 0.1
-                        if timestep_i_will_shoot_for in batted_ball.position_at_timestep:
-                            self.immediate_goal = batted_ball.position_at_timestep[timestep_i_will_shoot_for][:2]
+                        tick_i_will_shoot_for = fielder_playing_the_ball.tick_of_planned_fielding_attempt + 5
+                        if tick_i_will_shoot_for < len(batted_ball.position_at_tick):
+                            self.immediate_goal = batted_ball.position_at_tick[tick_i_will_shoot_for][:2]
                         else:
                             if playing_action.at_bat.game.trace:
-                                print "timestep {} not in batted_ball.position_at_timestep".format(
-                                    timestep_i_will_shoot_for
+                                print "tick {} not in batted_ball.position_at_tick".format(
+                                    tick_i_will_shoot_for
                                 )
                             self.immediate_goal = batted_ball.final_location
                         if playing_action.at_bat.game.trace:
@@ -1089,25 +976,23 @@ class Player(object):
                         # will be four-six timesteps later on its trajectory if it were to continue
                         # on it uninterrupted by the fielder playing the ball's fielding attempt
                         fielder_playing_the_ball = next(f for f in self.team.players if f.playing_the_ball)
-                        timestep_i_will_shoot_for = fielder_playing_the_ball.timestep_of_planned_fielding_attempt
-                        for i in xrange(5):
-                            timestep_i_will_shoot_for += 0.1
-                        if timestep_i_will_shoot_for in batted_ball.position_at_timestep:
+                        tick_i_will_shoot_for = fielder_playing_the_ball.tick_of_planned_fielding_attempt + 5
+                        if tick_i_will_shoot_for < len(batted_ball.position_at_tick):
                             someone_else_already_backing_up_catch = (
                                 any(f for f in batted_ball.at_bat.fielders if f.backing_up_the_catch)
                             )
                             if not someone_else_already_backing_up_catch:
-                                self.immediate_goal = batted_ball.position_at_timestep[timestep_i_will_shoot_for][:2]
+                                self.immediate_goal = batted_ball.position_at_tick[tick_i_will_shoot_for][:2]
                             else:
                                 # If someone is already backing up the catch, go about six feet behind where
                                 # they will be standing to back it up
                                 self.immediate_goal = (
-                                    batted_ball.position_at_timestep[timestep_i_will_shoot_for][0],
-                                    batted_ball.position_at_timestep[timestep_i_will_shoot_for][1] + 6
+                                    batted_ball.position_at_tick[tick_i_will_shoot_for][0],
+                                    batted_ball.position_at_tick[tick_i_will_shoot_for][1] + 6
                                 )
                         else:
                             if playing_action.at_bat.game.trace:
-                                print "timestep {} not in batted_ball.position_at_timestep".format(timestep_i_will_shoot_for)
+                                print "tick {} not in batted_ball.position_at_tick".format(tick_i_will_shoot_for)
                             self.immediate_goal = batted_ball.final_location
                         if playing_action.at_bat.game.trace:
                             print "-- {} ({}) will back up the catch by moving toward [{}, {}] [{}]".format(
@@ -1282,7 +1167,7 @@ class Player(object):
             # the timestep that you planned to make your fielding attempt, then get
             # ready to make it
             if self.playing_the_ball and not batted_ball.fielded_by:
-                if batted_ball.time_since_contact >= self.timestep_of_planned_fielding_attempt:
+                if batted_ball.tick >= self.tick_of_planned_fielding_attempt:
                     batted_ball.fielder_with_chance = self
                     dist_from_fielder_to_bb = (
                         math.hypot(self.location[0]-batted_ball.location[0],
@@ -1705,13 +1590,13 @@ class Player(object):
             # TODO player guesses which base the throw will target
             player_fielding_the_ball = next(f for f in batted_ball.at_bat.fielders if f.playing_the_ball)
             time_expected_for_fielder_approach_to_batted_ball = (
-                player_fielding_the_ball.timestep_of_planned_fielding_attempt - batted_ball.time_since_contact
+                seconds(player_fielding_the_ball.tick_of_planned_fielding_attempt) - batted_ball.time_since_contact
             )
             if batted_ball.bobbled:
                 # Add on the time it will take for the fielder to reorient himself to pick up the bobbled
                 # ball -- if the batted ball gets reread by fielders after a total fielding miss,
                 # reorientation time will already have been factored in to player_fielding_the_ball.
-                # timestep_of_planned_fielding_attempt
+                # tick_of_planned_fielding_attempt
                 time_expected_for_fielder_approach_to_batted_ball += \
                     player_fielding_the_ball.reorienting_after_fielding_miss
             dist_from_fielding_chance_to_next_base = (
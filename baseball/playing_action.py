@@ -57,18 +57,21 @@ class PlayingAction(object):
     def enact(self):
         batted_ball = self.batted_ball
         self.throw = None
+        # Look these up once, rather than at every timestep (they'll both be off in a headless game)
+        trace = self.at_bat.game.trace
+        debug = self.at_bat.game.debug
         # Fielders read the batted ball and decide immediate goals
         batted_ball.get_read_by_fielders()
-        if self.at_bat.game.trace:
+        if trace:
             print "-- {}; Oblig: {} [0.0]".format(batted_ball, batted_ball.obligated_fielder.position)
         if self.at_bat.game.radio_announcer:
             self.at_bat.game.radio_announcer.call_batted_ball(batted_ball=batted_ball)
         for fielder in self.fielder_control_sequence:
             fielder.decide_immediate_goal(playing_action=self)
-        if self.at_bat.game.trace:
+        if trace:
             self.enumerate_defensive_responsibilities()
         for _ in xrange(4):
-            batted_ball.time_since_contact += 0.1
+            batted_ball.tick += 1
             # While defensive players and baserunners are reading the ball,
             # it starts moving and the batter starts running to first
             # (since players have a flat-rate home-to-first speed,
@@ -82,9 +85,9 @@ class PlayingAction(object):
                     baserunner.baserun(playing_action=self)
         while not self.resolved:
             assert batted_ball.time_since_contact < 100, "Playing action has fallen into infinite loop."
-            if self.at_bat.game.debug:
+            if debug:
                 self.report_baserunner_progress()
-            batted_ball.time_since_contact += 0.1
+            batted_ball.tick += 1
             if not batted_ball.fielded_by:
                 batted_ball.move()
             self.progress_all_baserunners()
@@ -130,7 +133,7 @@ class PlayingAction(object):
                                     else:
                                         # Don't retreat already or stay on base -- keep tentatively
                                         # advancing in case there is another fielding gaffe
-                                        if self.at_bat.game.trace:
+                                        if trace:
                                             print (
                                                 "-- {} still doesn't believe he can beat the throw, but "
                                                 "will tentatively advance to the next base in case of "
@@ -172,7 +175,7 @@ class PlayingAction(object):
             # If the throw was in anticipation of an advancing runner and it has
             # reached its target, resolve the play at the plate
             elif self.throw and self.throw.reached_target and not self.throw.resolved:
-                if self.at_bat.game.trace:
+                if trace:
                     print "-- Throw has reached {} ({}) [{}]".format(
                         self.throw.thrown_to.person.last_name, self.throw.thrown_to.position,
                         batted_ball.time_since_contact
@@ -186,7 +189,7 @@ class PlayingAction(object):
                     if self.throw.thrown_to is not self.cut_off_man:
                         self.resolved = True
             elif self.fielder_afoot_for_putout and self.fielder_afoot_for_putout[0].at_goal:
-                if self.at_bat.game.trace:
+                if trace:
                     print "-- {} has reached {} [{}]".format(
                         self.fielder_afoot_for_putout[0].person.last_name, self.fielder_afoot_for_putout[-1],
                         batted_ball.time_since_contact
@@ -1,82 +1,104 @@
+import collections
+
+
 def compose_box_score(game):
+    away_runs_by_inning, home_runs_by_inning = game.runs_by_inning
     box_score = ''
     box_score += '\n\n'
-    box_score += '\n\t\t' + '   '.join(str(i+1) for i in xrange(len(game.innings)))
+    box_score += '\n\t\t' + '   '.join(str(i+1) for i in xrange(len(away_runs_by_inning)))
     box_score += '\n\t\t__________________________________'
     if len(game.away_team.city.name) >= 8:
         tabs_needed = '\t'
     else:
         tabs_needed = '\t\t'
     box_score += ('\n' + game.away_team.city.name + tabs_needed +
-           '   '.join(str(inning.top.runs) for inning in game.innings) +
+           '   '.join(str(runs) for runs in away_runs_by_inning) +
            '\t' + str(game.score[0]))
     box_score += '\n'
     if len(game.home_team.city.name) >= 8:
         tabs_needed = '\t'
     else:
         tabs_needed = '\t\t'
-    if game.innings[-1].bottom:
+    if len(home_runs_by_inning) == len(away_runs_by_inning):
         box_score += ('\n' + game.home_team.city.name + tabs_needed +
-               '   '.join(str(inning.bottom.runs) for inning in game.innings) +
+               '   '.join(str(runs) for runs in home_runs_by_inning) +
                '\t' + str(game.score[1]))
     else:  # Home team didn't need to bat in bottom of the ninth inning
         box_score += ('\n' + game.home_team.city.name + tabs_needed +
-               '   '.join(str(inning.bottom.runs) for inning in game.innings[:-1]) +
+               '   '.join(str(runs) for runs in home_runs_by_inning) +
                '   -\t' + str(game.score[1]))
-    box_score += '\n\n\n\t {}\n'.format(game.away_team.name)
-    box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tSB\tAVG'
-    for p in game.away_team.players:
-        if len(p.career.statistics.at_bats) > 0:
-            batting_avg = round(len(p.career.statistics.hits)/float(len(p.career.statistics.at_bats)), 3)
-            if batting_avg == 1.0:
-                batting_avg = '1.000'
+    for team in (game.away_team, game.home_team):
+        box_score += '\n\n\n\t {}\n'.format(team.name)
+        box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tSB\tAVG'
+        # Each player's line is for this game alone
+        for p in game.stat_lines.players(team=team):
+            line = game.stat_lines[p]
+            if line['at_bats'] > 0:
+                batting_avg = round(line['hits']/float(line['at_bats']), 3)
+                if batting_avg == 1.0:
+                    batting_avg = '1.000'
+                else:
+                    batting_avg = str(batting_avg)[1:]
             else:
-                batting_avg = str(batting_avg)[1:]
-        else:
-            batting_avg = '.000'
-        while len(batting_avg) < 4:
-            batting_avg += '0'
-        if len(p.person.last_name) >= 8:
-            tabs_needed = '\t'
-        else:
-            tabs_needed = '\t\t'
-        box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
-            p.person.last_name, tabs_needed, p.position, len(p.career.statistics.at_bats), 
-            len(p.career.statistics.runs),
-            len(p.career.statistics.hits),
-            len(p.career.statistics.doubles), 
-            len(p.career.statistics.triples), len(p.career.statistics.home_runs), len(p.career.statistics.rbi),
-            len(p.career.statistics.batting_walks), len(p.career.statistics.batting_strikeouts), len(p.career.statistics.stolen_bases), batting_avg
-        )
-    box_score += '\n\n\n\t {}\n'.format(game.home_team.name)
-    box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tSB\tAVG'
-    for p in game.home_team.players:
-        if len(p.career.statistics.at_bats) > 0:  # TODO Did I screw this up by checking the career stats?
-            batting_avg = round(len(p.career.statistics.hits)/float(len(p.career.statistics.at_bats)), 3)
-            if batting_avg == 1.0:
-                batting_avg = '1.000'
+                batting_avg = '.000'
+            while len(batting_avg) < 4:
+                batting_avg += '0'
+            if len(p.person.last_name) >= 8:
+                tabs_needed = '\t'
             else:
-                batting_avg = str(batting_avg)[1:]
-        else:
-            batting_avg = '.000'
-        while len(batting_avg) < 4:
-            batting_avg += '0'
-        if len(p.person.last_name) >= 8:
-            tabs_needed = '\t'
-        else:
-            tabs_needed = '\t\t'
-        box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
-            p.person.last_name, tabs_needed, p.position, len(p.career.statistics.at_bats), len(p.career.statistics.runs),
-            len(p.career.statistics.hits),
-            len(p.career.statistics.doubles), len(p.career.statistics.triples), 
-            len(p.career.statistics.home_runs), len(p.career.statistics.rbi),
-            len(p.career.statistics.batting_walks), 
-            len(p.career.statistics.batting_strikeouts), 
-            len(p.career.statistics.stolen_bases), batting_avg
-        )
+                tabs_needed = '\t\t'
+            box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
+                p.person.last_name, tabs_needed, p.position, line['at_bats'], line['runs'], line['hits'],
+                line['doubles'], line['triples'], line['home_runs'], line['rbi'], line['batting_walks'],
+                line['batting_strikeouts'], line['stolen_bases'], batting_avg
+            )
     return box_score
 
 
+class BoxScoreCache(object):
+    """A size-bounded, least-recently-used cache of composed box scores.
+
+    Games don't hold onto their box scores, which are rarely looked at; rather, a box score is
+    composed the first time it's asked for and held here, so that a season's worth of games
+    doesn't keep thousands of unread box scores alive.
+    """
+
+    def __init__(self, max_size):
+        """Initialize a BoxScoreCache object.
+
+        @param max_size: The maximum number of box scores to hold.
+        """
+        self.max_size = max_size
+        self.box_scores = collections.OrderedDict()  # Maps games to box scores, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Return the number of box scores in this cache."""
+        return len(self.box_scores)
+
+    def __getstate__(self):
+        """Return the state of this cache that will be serialized when the cosmos is saved (it starts out empty)."""
+        state = dict(self.__dict__)
+        state['box_scores'] = collections.OrderedDict()
+        return state
+
+    def get(self, game, compose):
+        """Return the box score for the given game, composing it with the given function if need be."""
+        box_score = self.box_scores.pop(game, None)
+        if box_score is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            box_score = compose(game=game)
+            if len(self.box_scores) >= self.max_size:
+                self.box_scores.popitem(last=False)
+                self.evictions += 1
+        self.box_scores[game] = box_score
+        return box_score
+
+
 def compile_league_standings(season):
     standings = ''
     standings += "\n\n\t\t\tFinal {} {} Standings\n\n".format(season.league.cosmos.year, season.league.name)
@@ -86,35 +108,40 @@ def compile_league_standings(season):
     return standings
 
 
+def compile_league_leaders(season):
+    league_leaders = ''
+    league_leaders += "\n\n\t\t\t{} {} League Leaders\n".format(season.year, season.league_name)
+    for category, heading, decimal in (
+            ('batting_average', 'BATTING AVERAGE', True), ('home_runs', 'HOME RUNS', False), ('rbi', 'RBI', False),
+            ('pitching_strikeouts', 'STRIKEOUTS', False), ('pitching_wins', 'WINS', False)
+    ):
+        league_leaders += "\n\t\t{}\n".format(heading)
+        for i, (player, value) in enumerate(season.leaderboards.leaders(category=category, n=5)):
+            league_leaders += "\n{}\t{}\t{}\t\t{}".format(
+                i+1, round(value, 3) if decimal else value, player.person.name, player.position
+            )
+        league_leaders += '\n'
+    return league_leaders
+
+
 def compile_career_leaders(league):
     career_leaders = ''
     # Batting average leaders
     career_leaders += "\n\n\t\tBATTING AVERAGE LEADERS\n"
-    batting_averages = {}
-    for player in set(league.players) | league.history.former_players:
-        if len(player.career.statistics.hits) > 100:
-            batting_average = len(player.career.statistics.hits)/float(len(player.career.statistics.at_bats))
-            batting_averages[player] = batting_average
-    leaders = list(batting_averages.keys())
-    leaders.sort(key=lambda p: batting_averages[p], reverse=True)
-    # leaders[0].batting_titles.append(self.current_season)
-    for i in xrange(9):
+    for i, (player, batting_average) in enumerate(league.career_leaderboards.leaders(category='batting_average', n=9)):
         career_leaders += "\n{}\t{}\t{}\t\t{}\t{}-{}".format(
-            i+1, round(batting_averages[leaders[i]], 3),
-            leaders[i].person.name, leaders[i].position,
-            leaders[i].career.debut.year,
-            leaders[i].career.finale.year if leaders[i].career.finale else 'active',
+            i+1, round(batting_average, 3),
+            player.person.name, player.position,
+            player.career.debut.year,
+            player.career.finale.year if player.career.finale else 'active',
         )
     # Home run leaders
     career_leaders += "\n\n\t\tHOME RUN KINGS\n"
-    leaders = list(league.players)
-    leaders.sort(key=lambda p: len(p.career.statistics.home_runs), reverse=True)
-    # leaders[0].home_run_titles.append(self.current_season)
-    for i in xrange(9):
+    for i, (player, home_runs) in enumerate(league.career_leaderboards.leaders(category='home_runs', n=9)):
         career_leaders += "\n{}\t{}\t{}\t\t{}\t{}-{}".format(
-            i+1, len(leaders[i].career.statistics.home_runs),
-            leaders[i].person.name, leaders[i].position,
-            leaders[i].career.debut.year,
-            leaders[i].career.finale.year if leaders[i].career.finale else 'active',
+            i+1, home_runs,
+            player.person.name, player.position,
+            player.career.debut.year,
+            player.career.finale.year if player.career.finale else 'active',
         )
-    return career_leaders
\ No newline at end of file
+    return career_leaders
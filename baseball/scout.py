@@ -1,7 +1,12 @@
-import random
 from career import ScoutCareer
 
 
+# Scouts will only sign free agents who are older than this...
+MINIMUM_AGE_OF_A_PROSPECT = 16
+# ...and younger than this
+MAXIMUM_AGE_OF_A_PROSPECT = 41
+
+
 class Scout(object):
     """The baseball-scout layer of a person's being."""
 
@@ -13,12 +18,30 @@ class Scout(object):
         self.team = team
 
     def secure_a_player(self, position):
-        """Secure and sign a player to play at the given position of need."""
+        """Secure and sign a player to play at the given position of need.
+
+        The best free agent in the team's state is looked up in the state's free-agent market (see
+        market.py), and is weighed against a random sample of the free agents from around the country.
+        If the state is running short of free agents, the prospects of its cities that are being simulated
+        in aggregate are turned to, by promoting the one with the most of them to full detail.
+        """
         city = self.team.city
         state = city.state
         country = city.country
-        free_agents = state.free_agents | set(random.sample(country.free_agents, min(1000, len(country.free_agents))))
-        free_agents = {p for p in free_agents if 16 < p.person.age < 41}
+        config = self.team.cosmos.config
+        free_agents = set(country.registry.sample_free_agents(
+            k=config.number_of_free_agents_a_scout_considers_from_around_the_country
+        ))
+        free_agents = {p for p in free_agents if MINIMUM_AGE_OF_A_PROSPECT < p.person.age < MAXIMUM_AGE_OF_A_PROSPECT}
+        if len(state.registry.free_agent_people) < (
+            config.minimum_number_of_free_agents_in_a_state_before_scouting_aggregate_cities
+        ):
+            city_with_the_most_prospects = state.city_with_the_most_aggregate_prospects
+            if city_with_the_most_prospects:
+                city_with_the_most_prospects.promote()
+        best_free_agent_in_the_state = state.free_agent_market.best(position=position)
+        if best_free_agent_in_the_state:
+            free_agents.add(best_free_agent_in_the_state)
         return max(free_agents, key=lambda fa: self.grade(prospect=fa, position=position))
 
     @staticmethod
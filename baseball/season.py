@@ -3,15 +3,21 @@ import os
 import random
 from game import Game
 from schedule import LeagueSchedule
-from award import Pennant
+from award import Pennant, BattingTitle, HomeRunTitle
+from leaderboard import Leaderboards
 from printout import compile_league_standings as COMPOSE_LEAGUE_STANDINGS
+from printout import compile_league_leaders as COMPOSE_LEAGUE_LEADERS
 
 
 class LeagueSeason(object):
     """An individual season in the history of a baseball league."""
 
-    def __init__(self, league):
-        """Initialize a LeagueSeason object."""
+    def __init__(self, league, headless_games=None):
+        """Initialize a LeagueSeason object.
+
+        @param headless_games: Whether this season's games will be played headlessly (see Game.__init__());
+                               if None is passed, this will be whatever the league does by default.
+        """
         # Set basic attributes
         self.league = league
         league.season = self
@@ -23,10 +29,21 @@ class LeagueSeason(object):
         self.league_offices = league.offices
         self.commissioner = league.commissioner
         self.umpires = league.umpires
+        # Determine whether this season's games will be played headlessly, in which case the games
+        # will only report compact records of their results (appended to self.results as they're
+        # played), which is all that's needed of them for simulating a season in bulk
+        self.headless_games = league.headless_games if headless_games is None else headless_games
+        self.results = []  # Appended to by League._operate_during_season()
+        # The pool of worker processes across which this season's headless games are played, if
+        # they're played in parallel; this is set the first time they are (see game_pool.GamePool)
+        self.game_pool = None
         # These may be set by self.review()
         self.champion = None
         self.standings = None
         self.league_leaders = None
+        # The league's leaderboards for this season, which are kept up to date as games are
+        # played (see League.update_leaderboards())
+        self.leaderboards = Leaderboards(league=league, year=self.year)
         # Prepare award attributes
         self.championship_trophy = None
         self.pennants = []
@@ -53,17 +70,30 @@ class LeagueSeason(object):
         # Name a champion
         self.champion = self._name_champion()
         self.league.history.champions_timeline[self.year] = self.champion
+        self.league.history.most_recent_champion = self.champion
         print "THE {} HAVE WON THE {} {} CHAMPIONSHIP!".format(
             self.champion.team.name.upper(), self.year, self.league.name.upper()
         )
-        # Compile league leaders
-        # self.league_leaders = COMPOSE_LEAGUE_LEADERS(season=self)
+        # Compile league leaders, and award the batting and home-run titles
+        self.league_leaders = COMPOSE_LEAGUE_LEADERS(season=self)
+        self._award_titles()
         # Have each team review its season, as well
         for team_season in self.teams:
             team_season.review()
         # Send the league into the offseason
         self.league.season = None
 
+    def _award_titles(self):
+        """Award the batting title and the home-run title to this season's leaders."""
+        batting_average_leaders = self.leaderboards.leaders(category='batting_average', n=1)
+        if batting_average_leaders:
+            player, batting_average = batting_average_leaders[0]
+            BattingTitle(player=player, league=self.league, batting_average=batting_average)
+        home_run_leaders = self.leaderboards.leaders(category='home_runs', n=1)
+        if home_run_leaders:
+            player, home_runs = home_run_leaders[0]
+            HomeRunTitle(player=player, league=self.league, home_runs=home_runs)
+
     def _name_champion(self):
         """Name the league champion for this season."""
         # TODO BREAK TIES
@@ -84,7 +114,6 @@ class TeamSeason(object):
         # Set basic attributes
         self.team = team
         team.season = self
-        team.history.seasons.append(self)
         self.league = team.league
         self.year = team.cosmos.year
         # Record city, nickname, and organization, since this could change later (i.e.,
@@ -96,6 +125,7 @@ class TeamSeason(object):
         self.manager = team.manager
         self.scout = team.scout
         self.players = team.players
+        team.history.add_season(self)  # Indexed by year and city, so this has to come after those are set
         # Prepare attributes
         self.games = []
         # Prepare award attributes
@@ -139,6 +169,7 @@ class TeamSeason(object):
 
     def review(self):
         """Review this season to effect outcomes and record statistics."""
+        self.team.history.record_season(self)
         for player in self.team.players:
             player.career.potentially_retire()
 
@@ -1,65 +1,260 @@
-class PlayerStatistics(object):
+import array
+import collections
+
+
+class Statistics(object):
+    """A columnar store of integer counters for a person's statistics.
+
+    Each statistic (hits, putouts, games umpired, etc.) is a column, and rather than holding
+    every outcome object that was ever recorded for it, the store keeps counts: career totals,
+    totals for each season, and a sparse line for each game (along with a reference to the
+    game's record in the play log, from which its particulars can be replayed). This keeps the
+    memory held by the statistics of a long career bounded, and makes reading a statistic O(1).
+
+    The statistics are still exposed as attributes that behave like the lists they used to be
+    (see StatisticView): outcomes append() to them and reports take their len(). Only the first
+    and last entries of the columns in REFERENCED_COLUMNS are retained, for reports like a
+    player's debut and finale.
+    """
+
+    COLUMNS = ()  # Set by subclasses
+    REFERENCED_COLUMNS = ()
+
+    def __init__(self):
+        """Initialize a Statistics object."""
+        number_of_columns = len(self.COLUMNS)
+        # Career totals for each column
+        self.totals = array.array('L', [0]) * number_of_columns
+        # Counts recorded since the end of the last game (see close_game())
+        self.pending = array.array('L', [0]) * number_of_columns
+        # Maps years to arrays of the totals for each column in that year
+        self.seasons = {}
+        # Game lines: for each game, its year, the entry number of its record in the play log (or -1),
+        # and the offset into game_line_entries of its line, which is a flattened run of (column, count)
+        # pairs for the columns that the game added to
+        self.game_years = array.array('H')
+        self.game_play_log_entries = array.array('l')
+        self.game_line_offsets = array.array('L', [0])
+        self.game_line_entries = array.array('L')
+        # Maps the indices of referenced columns to [first entry, last entry]
+        self.ends = {}
+
+    def record(self, index, entry):
+        """Record an entry in the column with the given index."""
+        self.totals[index] += 1
+        self.pending[index] += 1
+        if index in self.REFERENCED_INDICES:
+            ends = self.ends.get(index)
+            if ends is None:
+                self.ends[index] = [entry, entry]
+            else:
+                ends[1] = entry
+
+    def close_game(self, game):
+        """Close the line for the given game, which has just ended, rolling its counts into its season's totals.
+
+        @return: The number of the game line that was closed, or None if nothing was recorded in the game.
+        """
+        pending = self.pending
+        if not any(pending):
+            return None
+        year = game.year
+        try:
+            season = self.seasons[year]
+        except KeyError:
+            season = self.seasons[year] = array.array('L', [0]) * len(self.COLUMNS)
+        for index, count in enumerate(pending):
+            if count:
+                season[index] += count
+                self.game_line_entries.append(index)
+                self.game_line_entries.append(count)
+        self.game_line_offsets.append(len(self.game_line_entries))
+        self.game_years.append(year)
+        play_log_entry = getattr(game, 'play_log_entry', None)
+        self.game_play_log_entries.append(play_log_entry if play_log_entry is not None else -1)
+        self.pending = array.array('L', [0]) * len(self.COLUMNS)
+        return len(self.game_years)-1
+
+    def tallies(self):
+        """Return a dictionary mapping the name of each column to its career total."""
+        return {name: self.totals[index] for index, name in enumerate(self.COLUMNS)}
+
+    def in_season(self, year, name):
+        """Return the total for the given column in the given year."""
+        season = self.seasons.get(year)
+        return season[self.INDICES[name]] if season else 0
+
+    def season_line(self, year):
+        """Return a dictionary mapping the name of each column to its total in the given year."""
+        season = self.seasons.get(year)
+        return {name: season[index] if season else 0 for index, name in enumerate(self.COLUMNS)}
+
+    @property
+    def number_of_game_lines(self):
+        """Return the number of games for which a line has been recorded."""
+        return len(self.game_years)
+
+    def game_line(self, i):
+        """Return the year, play-log entry number (or None), and counts (by column name) of the i-th game line."""
+        start, end = self.game_line_offsets[i], self.game_line_offsets[i+1]
+        entries = self.game_line_entries
+        counts = {self.COLUMNS[entries[j]]: entries[j+1] for j in xrange(start, end, 2)}
+        play_log_entry = self.game_play_log_entries[i]
+        return self.game_years[i], play_log_entry if play_log_entry != -1 else None, counts
+
+
+class GameStatLines(object):
+    """The statistics lines of the players in a single game.
+
+    A player's counts for a game are gathered in his Statistics store while it's played, and are
+    closed into a game line of that store once it ends; this closes those lines for everyone on both
+    teams, and records which line is whose (and whose team they played for), so that a box score
+    can be composed from the game alone, whenever it's asked for.
+    """
+
+    def __init__(self, game):
+        """Initialize a GameStatLines object, closing the statistics lines of everyone on both teams."""
+        # A (team, {player: line number}) pair for each team, away team first; the line number
+        # is None for a player who recorded nothing in the game
+        self.teams = []
+        for team in (game.away_team, game.home_team):
+            line_numbers = collections.OrderedDict(
+                (player, player.career.statistics.close_game(game=game)) for player in team.players
+            )
+            self.teams.append((team, line_numbers))
+
+    def __getitem__(self, player):
+        """Return a Counter mapping the names of statistics columns to the given player's counts in this game."""
+        for _, line_numbers in self.teams:
+            if player in line_numbers:
+                line_number = line_numbers[player]
+                if line_number is None:
+                    break
+                _, _, counts = player.career.statistics.game_line(line_number)
+                return collections.Counter(counts)
+        return collections.Counter()
+
+    def players(self, team):
+        """Return the players who were on the given team for this game."""
+        for a_team, line_numbers in self.teams:
+            if a_team is team:
+                return line_numbers.keys()
+        return []
+
+
+class StatisticView(object):
+    """A list-like view of a column in a Statistics store.
+
+    Supports append(), extend(), len(), and truth testing, like the lists that statistics used
+    to be kept in; indexing is supported only for the first and last entries of referenced columns.
+    """
+
+    __slots__ = ('statistics', 'index')
+
+    def __init__(self, statistics, index):
+        """Initialize a StatisticView object."""
+        self.statistics = statistics
+        self.index = index
+
+    def __len__(self):
+        """Return the total for this column."""
+        return self.statistics.totals[self.index]
+
+    def __nonzero__(self):
+        """Return whether anything has been recorded in this column."""
+        return self.statistics.totals[self.index] > 0
+
+    def __getitem__(self, i):
+        """Return the first (i == 0) or last (i == -1) entry in this column, if it's a referenced column."""
+        ends = self.statistics.ends.get(self.index)
+        if ends is None:
+            if self.index not in self.statistics.REFERENCED_INDICES:
+                raise TypeError("Only the ends of referenced statistics columns can be indexed.")
+            raise IndexError("No entries have been recorded for this statistic.")
+        if i == 0:
+            return ends[0]
+        if i == -1:
+            return ends[1]
+        raise IndexError("Only the first and last entries of a statistics column are retained.")
+
+    def __iter__(self):
+        """Refuse iteration, since the entries themselves aren't retained."""
+        raise TypeError("Statistics columns keep counts only; the play log holds the particulars.")
+
+    def append(self, entry):
+        """Record an entry in this column."""
+        self.statistics.record(self.index, entry)
+
+    def extend(self, entries):
+        """Record each of the given entries in this column."""
+        for entry in entries:
+            self.statistics.record(self.index, entry)
+
+
+class StatisticColumn(object):
+    """A descriptor that exposes a column of a Statistics store as a StatisticView."""
+
+    def __init__(self, index):
+        """Initialize a StatisticColumn object."""
+        self.index = index
+
+    def __get__(self, statistics, owner):
+        """Return a view of this column in the given store."""
+        if statistics is None:
+            return self
+        return StatisticView(statistics=statistics, index=self.index)
+
+
+def columnar(cls):
+    """Class decorator that exposes each of a Statistics subclass's columns as a StatisticColumn attribute."""
+    cls.INDICES = {name: index for index, name in enumerate(cls.COLUMNS)}
+    cls.REFERENCED_INDICES = frozenset(cls.INDICES[name] for name in cls.REFERENCED_COLUMNS)
+    for name, index in cls.INDICES.iteritems():
+        setattr(cls, name, StatisticColumn(index=index))
+    return cls
+
+
+@columnar
+class PlayerStatistics(Statistics):
     """A person's playing statistics over the course of a life."""
 
-    def __init__(self, player):
-        """Initialize a PlayingStatistics object."""
-        self.player = player  # The player to whom these statistics pertain
+    COLUMNS = (
         # Service
-        self.games_played = []
+        'games_played',
         # Pitching
-        self.innings_pitched = []
-        self.pitches = []
-        self.strikes = []
-        self.balls = []
-        self.beans = []
-        self.pitching_strikeouts = []
-        self.pitching_walks = []
-        self.hits_allowed = []
-        self.home_runs_allowed = []
-        self.grand_slams_allowed = []
-        self.pitching_wins = []
-        self.pitching_losses = []
+        'innings_pitched', 'pitches', 'strikes', 'balls', 'beans', 'pitching_strikeouts', 'pitching_walks',
+        'hits_allowed', 'home_runs_allowed', 'grand_slams_allowed', 'pitching_wins', 'pitching_losses',
         # Batting
-        self.batting_strikeouts = []
-        self.batting_walks = []
-        self.plate_appearances = []
-        self.at_bats = []
-        self.hits = []
-        self.singles = []
-        self.doubles = []
-        self.triples = []
-        self.home_runs = []
-        self.grand_slams = []
-        self.rbi = []
-        self.runs = []
-        self.outs = []  # Instances where a player was called out
-        self.double_plays_grounded_into = []
-        self.left_on_base = 0
-        self.stolen_bases = []
+        'batting_strikeouts', 'batting_walks', 'plate_appearances', 'at_bats', 'hits', 'singles', 'doubles',
+        'triples', 'home_runs', 'grand_slams', 'rbi', 'runs', 'outs', 'double_plays_grounded_into', 'stolen_bases',
         # Fielding
-        self.putouts = []
-        self.assists = []
-        self.double_plays_participated_in = []
-        self.triple_plays_participated_in = []
+        'putouts', 'assists', 'double_plays_participated_in', 'triple_plays_participated_in',
+        # Career
+        'career_hits', 'career_at_bats', 'career_home_runs',
+        # Non-statistical minutiae
+        'throws', 'fielding_acts',
+    )
+    REFERENCED_COLUMNS = ('games_played',)  # For a player's debut and finale (see PlayerCareer)
+
+    def __init__(self, player):
+        """Initialize a PlayingStatistics object."""
+        super(PlayerStatistics, self).__init__()
+        self.player = player  # The player to whom these statistics pertain
+        self.left_on_base = 0
         # Career
-        self.career_hits = []
-        self.career_at_bats = []
-        self.career_home_runs = []
         self.yearly_batting_averages = {}
         self.yearly_home_runs = {}
         self.home_run_titles = []
         self.batting_titles = []
-        # Non-statistical minutiae
-        self.throws = []
-        self.fielding_acts = []
 
 
-class UmpireStatistics(object):
+@columnar
+class UmpireStatistics(Statistics):
     """A person's umpiring statistics over the course of a life."""
 
+    COLUMNS = ('games_umpired', 'play_at_base_calls', 'fly_out_calls')
+
     def __init__(self, umpire):
         """Initialize an UmpireStatistics object."""
+        super(UmpireStatistics, self).__init__()
         self.umpire = umpire  # The umpire to whom these statistics pertain
-        self.games_umpired = []
-        self.play_at_base_calls = []
-        self.fly_out_calls = []
\ No newline at end of file
@@ -0,0 +1,426 @@
+import random
+import collections
+import numpy
+from outcome import Run
+
+
+# The attributes of the batter and the pitcher on which the surrogate model conditions its
+# at-bat outcomes
+BATTER_ATTRIBUTES = (
+    'swing_timing_error', 'swing_contact_error', 'batting_power', 'pitch_recognition', 'speed_home_to_first'
+)
+PITCHER_ATTRIBUTES = ('pitch_control', 'pitch_speed', 'pitch_speed_sd')
+# Maps the outcome classes that may be the result of a full-fidelity at-bat to the outcome
+# categories that the surrogate model samples from
+OUTCOME_CATEGORIES = {
+    'Strikeout': 'Strikeout', 'BaseOnBalls': 'BaseOnBalls', 'HitByPitch': 'HitByPitch',
+    'Single': 'Single', 'Double': 'Double', 'AutomaticDouble': 'Double', 'GroundRuleDouble': 'Double',
+    'Triple': 'Triple', 'HomeRun': 'HomeRun', 'GrandSlam': 'HomeRun', 'FlyOut': 'FlyOut',
+    'ForceOut': 'ForceOut', 'TagOut': 'TagOut', 'DoublePlay': 'DoublePlay', 'TriplePlay': 'TriplePlay',
+    'FieldersChoice': 'FieldersChoice', 'HitOnError': 'HitOnError'
+}
+CATEGORIES = tuple(sorted(set(OUTCOME_CATEGORIES.values())))
+HITS = {'Single': 1, 'Double': 2, 'Triple': 3, 'HomeRun': 4}
+# Outcome categories for which runs that score aren't credited to the batter as RBI
+CATEGORIES_WITHOUT_RBI = ('DoublePlay', 'TriplePlay', 'HitOnError')
+# The changes to the composures of the batter and pitcher effected by each outcome category (these
+# are the ones effected by the corresponding classes in outcome.py)
+COMPOSURE_EFFECTS = {
+    'Strikeout': (-0.015, 0.01), 'BaseOnBalls': (0.008, -0.01), 'HitByPitch': (0.005, -0.25),
+    'Single': (0.015, -0.005), 'Double': (0.022, -0.01), 'Triple': (0.028, -0.015), 'HomeRun': (0.033, -0.025),
+    'FlyOut': (-0.005, 0.0), 'ForceOut': (-0.005, 0.0), 'TagOut': (-0.005, 0.0), 'DoublePlay': (-0.015, 0.0),
+    'TriplePlay': (-0.02, 0.0), 'FieldersChoice': (-0.005, 0.0), 'HitOnError': (0.0, 0.0)
+}
+# The destinations of the batter and baserunners in a transition (None marks an empty base)
+BASES = ('1B', '2B', '3B')
+SCORED = 'H'
+PUT_OUT = 'X'
+
+
+class AtBatSurrogate(object):
+    """A surrogate model of at-bat outcomes, fitted from many full-fidelity at-bats.
+
+    Playing out an at-bat with full fidelity (pitch, swing, batted ball, playing action) is
+    the right thing for salient games, but for games that nobody is paying close attention to
+    (e.g., those of a 17th-century league), this model instead samples the outcome of an at-bat
+    directly. The outcome category (Single, Strikeout, DoublePlay, etc.) is drawn from a
+    multinomial logistic regression on the attributes of the batter and pitcher and the base-out
+    state, and the movements of the batter and baserunners are then drawn from the transitions
+    that were observed for that category in that base-out state.
+    """
+
+    def __init__(self, weights, feature_means, feature_scales, transitions, number_of_observations):
+        """Initialize an AtBatSurrogate object.
+
+        @param weights: A (number of features + 1) x (number of categories) array of regression
+                        weights, the last row of which holds the intercepts.
+        @param feature_means: The means of the (raw) features, for standardizing them.
+        @param feature_scales: The standard deviations of the (raw) features, for standardizing them.
+        @param transitions: A dictionary mapping base-out states to dictionaries mapping outcome
+                            categories to dictionaries mapping transitions to their counts.
+        @param number_of_observations: The number of full-fidelity at-bats the model was fitted from.
+        """
+        self.weights = weights
+        self.feature_means = feature_means
+        self.feature_scales = feature_scales
+        self.transitions = transitions
+        self.number_of_observations = number_of_observations
+
+    @classmethod
+    def fit(cls, observations, iterations=500, learning_rate=0.5, regularization=1e-3):
+        """Fit a surrogate model from the given observations of full-fidelity at-bats.
+
+        @param observations: A list of AtBatObservation records (see collect_observations()).
+        @param iterations: The number of gradient-descent steps to take in fitting the regression.
+        @param learning_rate: The size of those steps.
+        @param regularization: The strength of the L2 penalty on the (non-intercept) weights.
+        """
+        assert observations, "Cannot fit an at-bat surrogate without any full-fidelity at-bats."
+        features = numpy.array([observation.features for observation in observations])
+        feature_means = features.mean(axis=0)
+        feature_scales = features.std(axis=0)
+        feature_scales[feature_scales == 0] = 1.0
+        design = _design_matrix(features=features, feature_means=feature_means, feature_scales=feature_scales)
+        targets = numpy.zeros((len(observations), len(CATEGORIES)))
+        targets[numpy.arange(len(observations)), [CATEGORIES.index(o.category) for o in observations]] = 1.0
+        weights = numpy.zeros((design.shape[1], len(CATEGORIES)))
+        penalty = numpy.ones_like(weights)
+        penalty[-1] = 0.0  # Don't penalize the intercepts
+        for _ in xrange(iterations):
+            probabilities = _softmax(design.dot(weights))
+            gradient = design.T.dot(probabilities-targets) / len(observations) + regularization*penalty*weights
+            weights -= learning_rate * gradient
+        transitions = {}
+        for observation in observations:
+            transitions_in_this_state = transitions.setdefault(observation.state, {})
+            counts = transitions_in_this_state.setdefault(observation.category, collections.Counter())
+            counts[observation.transition] += 1
+        return cls(
+            weights=weights, feature_means=feature_means, feature_scales=feature_scales,
+            transitions=transitions, number_of_observations=len(observations)
+        )
+
+    def play(self, at_bat):
+        """Play out the given at-bat by sampling its outcome."""
+        frame = at_bat.frame
+        runners = (at_bat.batter, frame.on_first, frame.on_second, frame.on_third)
+        state = _base_out_state(runners=runners, outs=frame.outs)
+        category, transition = self._sample(
+            features=_features(batter=at_bat.batter, pitcher=at_bat.pitcher, state=state), state=state,
+            runners=runners
+        )
+        SurrogateOutcome(at_bat=at_bat, category=category, runners=runners, transition=transition)
+
+    def probabilities(self, batter, pitcher, state):
+        """Return the probability of each outcome category for an at-bat between the given batter
+        and pitcher in the given base-out state, before ruling out what was never observed there."""
+        features = numpy.array([_features(batter=batter, pitcher=pitcher, state=state)])
+        design = _design_matrix(
+            features=features, feature_means=self.feature_means, feature_scales=self.feature_scales
+        )
+        return _softmax(design.dot(self.weights))[0]
+
+    def _sample(self, features, state, runners):
+        """Sample an outcome category and a transition for an at-bat."""
+        design = _design_matrix(
+            features=numpy.array([features]), feature_means=self.feature_means, feature_scales=self.feature_scales
+        )
+        probabilities = _softmax(design.dot(self.weights))[0]
+        # Only categories that were actually observed in this base-out state are possible (e.g., a double
+        # play with the bases empty); if this state was never observed at all, fall back to default
+        # transitions for every category that wouldn't make for too many outs
+        observed_transitions = self.transitions.get(state, {})
+        if observed_transitions:
+            candidates = {
+                category: observed_transitions[category].items() for category in observed_transitions
+            }
+        else:
+            outs_remaining = 3 - state[1]
+            candidates = {}
+            for category in CATEGORIES:
+                transition = _default_transition(category=category, runners=runners)
+                if transition is not None and transition.count(PUT_OUT) <= outs_remaining:
+                    candidates[category] = [(transition, 1)]
+        weights = [
+            probabilities[i] if category in candidates else 0.0 for i, category in enumerate(CATEGORIES)
+        ]
+        category = CATEGORIES[_weighted_choice(weights)]
+        transitions, counts = zip(*sorted(candidates[category]))
+        return category, transitions[_weighted_choice(counts)]
+
+
+class SurrogateOutcome(object):
+    """The outcome of an at-bat that was played out by the surrogate model."""
+
+    def __init__(self, at_bat, category, runners, transition):
+        """Initialize a SurrogateOutcome object."""
+        self.at_bat = at_bat
+        self.category = category
+        self.batter = at_bat.batter
+        self.pitcher = at_bat.pitcher
+        self.catcher = at_bat.catcher
+        self.result = None
+        at_bat.result = self
+        at_bat.resolved = True
+        frame = at_bat.frame
+        # Effect consequences
+        batter_composure_change, pitcher_composure_change = COMPOSURE_EFFECTS[category]
+        if self.batter.position == "P" and batter_composure_change < 0:
+            batter_composure_change /= 3.0
+        self.batter.person.mood.composure += batter_composure_change
+        self.pitcher.person.mood.composure += pitcher_composure_change
+        # Move the batter and baserunners
+        new_bases = [None, None, None]
+        batted_in_by = self.batter if category not in CATEGORIES_WITHOUT_RBI else None
+        self.runs = []
+        self.runners_put_out = []
+        for runner, destination in zip(runners, transition):
+            if runner is None:
+                continue
+            if destination in BASES:
+                new_bases[BASES.index(destination)] = runner
+            elif destination == PUT_OUT and frame.outs < 3:
+                frame.outs += 1
+                at_bat.outs.append(self)
+                self.runners_put_out.append(runner)
+                runner.career.statistics.outs.append(self)
+        # Runs only count if the play didn't end with the third out being made
+        if frame.outs < 3 or not self.runners_put_out:
+            for runner, destination in zip(runners, transition):
+                if runner is not None and destination == SCORED:
+                    self.runs.append(Run(frame=frame, runner=runner, batted_in_by=batted_in_by))
+        frame.on_first, frame.on_second, frame.on_third = new_bases
+        # Record statistics
+        self._record_statistics()
+
+    def __str__(self):
+        """Return string representation."""
+        return "{category} (simulated)".format(category=self.category)
+
+    def _record_statistics(self):
+        """Record statistics for the batter, pitcher, and fielders."""
+        category = self.category
+        batter_statistics = self.batter.career.statistics
+        pitcher_statistics = self.pitcher.career.statistics
+        batter_statistics.plate_appearances.append(self.at_bat)
+        if category in ('BaseOnBalls', 'HitByPitch'):
+            batter_statistics.batting_walks.append(self)
+            pitcher_statistics.pitching_walks.append(self)
+            return
+        batter_statistics.at_bats.append(self.at_bat)
+        if category == 'Strikeout':
+            batter_statistics.batting_strikeouts.append(self)
+            pitcher_statistics.pitching_strikeouts.append(self)
+            self.catcher.career.statistics.putouts.append(self)
+        elif category in HITS:
+            batter_statistics.hits.append(self)
+            pitcher_statistics.hits_allowed.append(self)
+            if category == 'Single':
+                batter_statistics.singles.append(self)
+            elif category == 'Double':
+                batter_statistics.doubles.append(self)
+            elif category == 'Triple':
+                batter_statistics.triples.append(self)
+            else:
+                batter_statistics.home_runs.append(self)
+                pitcher_statistics.home_runs_allowed.append(self)
+                if len(self.runs) == 4:
+                    batter_statistics.grand_slams.append(self)
+                    pitcher_statistics.grand_slams_allowed.append(self)
+        else:
+            # Since the surrogate doesn't model the play itself, putouts (and participation in
+            # double and triple plays) are credited to fielders chosen at random
+            for _ in self.runners_put_out:
+                random.choice(self.at_bat.fielders).career.statistics.putouts.append(self)
+            if category in ('DoublePlay', 'TriplePlay'):
+                batter_statistics.double_plays_grounded_into.append(self)
+                for participant in random.sample(self.at_bat.fielders, len(self.runners_put_out)):
+                    participant.career.statistics.double_plays_participated_in.append(self)
+                    if category == 'TriplePlay':
+                        participant.career.statistics.triple_plays_participated_in.append(self)
+
+
+# A full-fidelity at-bat, as observed for fitting a surrogate model: its features (see _features()),
+# its base-out state, its outcome category, and its transition, which gives the destination of the
+# batter and of the runners on first, second, and third (None for an empty base)
+AtBatObservation = collections.namedtuple('AtBatObservation', ['features', 'state', 'category', 'transition'])
+
+
+def collect_observations(games):
+    """Return observations of all the at-bats in the given full-fidelity games.
+
+    This has to be called as a game ends, since its at-bats are released after that (see Game.__init__()).
+    """
+    observations = []
+    for game in games:
+        if not getattr(game, 'full_fidelity', False) or not getattr(game, 'innings', None):
+            continue
+        for inning in game.innings:
+            for frame in inning.frames:
+                for i, at_bat in enumerate(frame.at_bats):
+                    if i+1 < len(frame.at_bats):
+                        next_at_bat = frame.at_bats[i+1]
+                        state_after = (next_at_bat.bases_before, next_at_bat.outs_before, next_at_bat.runs_before)
+                    else:
+                        state_after = ((frame.on_first, frame.on_second, frame.on_third), frame.outs, frame.runs)
+                    observation = _observe(at_bat=at_bat, state_after=state_after)
+                    if observation:
+                        observations.append(observation)
+    return observations
+
+
+def _observe(at_bat, state_after):
+    """Return an observation of the given at-bat, or None if it can't be made sense of."""
+    if at_bat.result is None or type(at_bat.result).__name__ not in OUTCOME_CATEGORIES:
+        return None
+    bases_after, outs_after, runs_after = state_after
+    runners = (at_bat.batter,) + tuple(at_bat.bases_before)
+    runs_scored = runs_after - at_bat.runs_before
+    outs_made = outs_after - at_bat.outs_before
+    destinations = [None, None, None, None]
+    missing = []
+    for i, runner in enumerate(runners):
+        if runner is None:
+            continue
+        if runner in bases_after:
+            destinations[i] = BASES[list(bases_after).index(runner)]
+        else:
+            missing.append(i)
+    number_unaccounted_for = len(missing) - (runs_scored+outs_made)
+    # On plays that end the frame, the bases may be cleared of runners who neither scored nor were
+    # put out; since the frame is over, these can be taken to have stayed put, but otherwise, a
+    # mismatch means we can't make sense of the at-bat
+    if number_unaccounted_for < 0 or (number_unaccounted_for > 0 and outs_after < 3):
+        return None
+    # We can't tell which of the runners who left the bases scored and which were put out, but
+    # lead runners are the likeliest to have scored, and trailing runners (the batter foremost)
+    # the likeliest to have been put out, so we attribute the runs and outs accordingly
+    for n, i in enumerate(sorted(missing, reverse=True)):
+        if n < runs_scored:
+            destinations[i] = SCORED
+        elif n < runs_scored + number_unaccounted_for:
+            destinations[i] = BASES[i-1]
+        else:
+            destinations[i] = PUT_OUT
+    state = _base_out_state(runners=runners, outs=at_bat.outs_before)
+    return AtBatObservation(
+        features=_features(batter=at_bat.batter, pitcher=at_bat.pitcher, state=state), state=state,
+        category=OUTCOME_CATEGORIES[type(at_bat.result).__name__], transition=tuple(destinations)
+    )
+
+
+def _base_out_state(runners, outs):
+    """Return the base-out state (a bitmask of the occupied bases, and the number of outs) given the
+    batter and baserunners on first, second, and third."""
+    return sum(1 << i for i, runner in enumerate(runners[1:]) if runner is not None), outs
+
+
+def _features(batter, pitcher, state):
+    """Return the (raw) features of an at-bat between the given batter and pitcher in the given state."""
+    bases_occupied, outs = state
+    return (
+        [getattr(batter, attribute) for attribute in BATTER_ATTRIBUTES] +
+        [getattr(pitcher, attribute) for attribute in PITCHER_ATTRIBUTES] +
+        [batter.person.mood.composure, pitcher.person.mood.composure, float(batter.position == "P")] +
+        [float(bases_occupied >> i & 1) for i in xrange(3)] + [float(outs)]
+    )
+
+
+def _design_matrix(features, feature_means, feature_scales):
+    """Return a design matrix of standardized features, with a trailing column for the intercept."""
+    standardized = (features-feature_means) / feature_scales
+    return numpy.hstack([standardized, numpy.ones((len(features), 1))])
+
+
+def _softmax(scores):
+    """Return the row-wise softmax of the given scores."""
+    exponentiated = numpy.exp(scores - scores.max(axis=1)[:, numpy.newaxis])
+    return exponentiated / exponentiated.sum(axis=1)[:, numpy.newaxis]
+
+
+def _weighted_choice(weights):
+    """Return an index chosen at random with probability proportional to its weight."""
+    total = sum(weights)
+    threshold = random.random() * total
+    cumulative = 0.0
+    for i, weight in enumerate(weights):
+        cumulative += weight
+        if threshold < cumulative:
+            return i
+    return max(i for i, weight in enumerate(weights) if weight > 0)
+
+
+def _default_transition(category, runners):
+    """Return a plausible transition for an outcome category in a base-out state that was never
+    observed, or None if the category isn't possible there."""
+    batter, on_first, on_second, on_third = runners
+    occupied = [runner is not None for runner in runners[1:]]
+    destinations = [None, None, None, None]
+    if category in HITS or category in ('BaseOnBalls', 'HitByPitch', 'HitOnError'):
+        if category in ('BaseOnBalls', 'HitByPitch'):
+            # Runners only advance if forced
+            destinations[0] = '1B'
+            for i in xrange(3):
+                if not occupied[i]:
+                    break
+                destinations[i+1] = BASES[i+1] if i < 2 else SCORED
+            for i in xrange(3):
+                if occupied[i] and destinations[i+1] is None:
+                    destinations[i+1] = BASES[i]
+        else:
+            bases_advanced = HITS.get(category, 1)
+            for i, runner in enumerate(runners):
+                if runner is not None:
+                    destination = i + bases_advanced
+                    destinations[i] = BASES[destination-1] if destination <= 3 else SCORED
+        return tuple(destinations)
+    # Otherwise, the batter is out (except on a fielder's choice), and the lead runners are put
+    # out on double plays and triple plays
+    runners_on_base = [i+1 for i in xrange(3) if occupied[i]]
+    if category in ('DoublePlay', 'TriplePlay', 'FieldersChoice'):
+        number_of_runners_put_out = {'DoublePlay': 1, 'TriplePlay': 2, 'FieldersChoice': 1}[category]
+        if len(runners_on_base) < number_of_runners_put_out:
+            return None
+        for i in sorted(runners_on_base, reverse=True)[:number_of_runners_put_out]:
+            destinations[i] = PUT_OUT
+    destinations[0] = '1B' if category == 'FieldersChoice' else PUT_OUT
+    for i in runners_on_base:
+        if destinations[i] is None:
+            destinations[i] = BASES[i-1]
+    return tuple(destinations)
+
+
+def compose_calibration_report(full_fidelity_games, surrogate_games):
+    """Return a report comparing the at-bat outcomes of full-fidelity games with those of surrogate games.
+
+    The at-bats of each game are replayed from the play log, so games whose play-by-play wasn't
+    recorded are left out.
+    """
+    tallies = []
+    for games in (full_fidelity_games, surrogate_games):
+        replayed_games = filter(None, (game.replay() for game in games))
+        category_counts = collections.Counter()
+        plate_appearances = 0
+        runs = 0
+        for replayed_game in replayed_games:
+            runs += sum(replayed_game.score)
+            for at_bat in replayed_game.at_bats:
+                if at_bat.result is None:
+                    continue
+                plate_appearances += 1
+                category_counts[OUTCOME_CATEGORIES.get(at_bat.result)] += 1
+        tallies.append((len(replayed_games), plate_appearances, runs, category_counts))
+    report = '\n\t\t\tFull\tSurrogate'
+    report += '\nGames\t\t\t{}\t{}'.format(tallies[0][0], tallies[1][0])
+    report += '\nPlate appearances\t{}\t{}'.format(tallies[0][1], tallies[1][1])
+    report += '\nRuns per game\t\t{}\t{}'.format(
+        *[round(float(runs)/max(number_of_games, 1), 2) for number_of_games, _, runs, _ in tallies]
+    )
+    for category in CATEGORIES:
+        rates = [
+            round(float(category_counts[category])/max(plate_appearances, 1), 3)
+            for _, plate_appearances, _, category_counts in tallies
+        ]
+        tabs_needed = '\t' if len(category) >= 8 else '\t\t'
+        report += '\n{}{}\t{}\t{}'.format(category, tabs_needed, rates[0], rates[1])
+    return report
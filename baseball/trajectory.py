@@ -0,0 +1,594 @@
+import sys
+import math
+import numpy
+from collections import OrderedDict
+from clock import TICK, TIMESTEPS, extend_timesteps
+
+
+# Physical constants of the trajectory simulation (see compute_trajectory() for units)
+TIMESTEP = TICK
+GRAVITY = 9.81
+AIR_DENSITY = 1.2  # TODO change depending on weather, altitude
+DRAG_COEFFICIENT = 0.3  # TODO change depending on certain things
+CROSS_SECTIONAL_AREA = 0.004208351855042743
+DRAG = (AIR_DENSITY * DRAG_COEFFICIENT * CROSS_SECTIONAL_AREA) / 2
+TURF_COR = 0.48  # Coefficient of restitution TODO should be field.COR[(x, y)]
+TURF_COF = 0.31  # Coefficient of friction TODO should be field.COF[(x, y)]
+FENCE_COR = 0.6  # TODO should be field.outfield_fence_COR[x] or field.foul_fence_COR[x]
+FENCE_COF = 0.15  # TODO should be field.outfield_fence_COF[x] or field.foul_fence_COF[x]
+# Unit conversions
+MPH_TO_METERS_PER_SECOND = 0.44704
+METERS_PER_SECOND_TO_MPH = 2.23694
+OUNCES_TO_KILOGRAMS = 0.0283495
+METERS_TO_FEET = 3.28084
+# The bookkeeping overhead of a small NumPy array, beyond its data, in bytes
+ARRAY_OVERHEAD_IN_BYTES = sys.getsizeof(numpy.zeros(0))
+
+
+class Trajectory(object):
+    """The full course of a batted ball, from contact until it stops (or hits a foul pole).
+
+    These are produced by compute_trajectory() and compute_trajectories(), and their attributes
+    are the ones a BattedBall takes on (see BattedBall.compute_full_trajectory()). To keep them
+    small enough to be cached by the thousands, a trajectory stores its course as arrays -- the
+    indices of its timesteps (into TIMESTEPS), its positions, and its velocities -- and builds
+    timestep dictionaries only when asked for them. Trajectories computed in a batch don't even
+    build the arrays until they're needed, since the batch's own arrays hold everything.
+    """
+
+    def __init__(self):
+        """Initialize a Trajectory object."""
+        self._steps = None  # Indices into TIMESTEPS
+        self._positions = None  # An (n, 3) array of x-, y-, and z-coordinates, in feet
+        self._x_velocities = None  # Velocities, in mph
+        # If this trajectory was computed in a batch, a (history, index, final step) tuple
+        # from which its arrays can be built (see compute_trajectories())
+        self._batch = None
+        self.true_distance = None
+        self.true_landing_point = None
+        self.hang_time = None
+        self.landing_timestep = None
+        self.second_landing_timestep = None
+        self.outfield_fence_contact_timestep = None
+        self.foul_fence_contact_timestep = None
+        self.foul_pole_contact_timestep = None
+        self.apex = 0.0
+        self.final_location = None
+
+    @property
+    def steps(self):
+        """Return the indices (into TIMESTEPS), i.e., the ticks, of this trajectory's timesteps."""
+        if self._batch:
+            self._unpack_batch()
+        return self._steps
+
+    @property
+    def positions(self):
+        """Return an (n, 3) array of the ball's x-, y-, and z-coordinates at each timestep, in feet."""
+        if self._batch:
+            self._unpack_batch()
+        return self._positions
+
+    @property
+    def x_velocities(self):
+        """Return an array of the ball's velocity at each timestep, in mph."""
+        if self._batch:
+            self._unpack_batch()
+        return self._x_velocities
+
+    @property
+    def position_at_timestep(self):
+        """Return a new dictionary mapping timesteps to the ball's x-, y-, and z-coordinates, in feet."""
+        timesteps = [TIMESTEPS[k] for k in self.steps.tolist()]
+        return dict(zip(timesteps, [tuple(position) for position in self.positions.tolist()]))
+
+    @property
+    def x_velocity_at_timestep(self):
+        """Return a new dictionary mapping timesteps to the ball's velocity, in mph."""
+        timesteps = [TIMESTEPS[k] for k in self.steps.tolist()]
+        return dict(zip(timesteps, self.x_velocities.tolist()))
+
+    def positions_and_velocities_by_tick(self):
+        """Return new lists of the ball's positions and velocities at every tick, from contact until it stops.
+
+        A ball that hits a foul pole has no recorded timestep between the contact and its final
+        one; for that tick, it's given its position and velocity from the tick before.
+        """
+        steps = self.steps
+        recorded_step = numpy.searchsorted(steps, numpy.arange(steps[-1]+1), side='right') - 1
+        positions = [tuple(position) for position in self.positions[recorded_step].tolist()]
+        x_velocities = self.x_velocities[recorded_step].tolist()
+        return positions, x_velocities
+
+    @property
+    def nbytes(self):
+        """Return the number of bytes taken up by this trajectory's arrays."""
+        return self.steps.nbytes + self.positions.nbytes + self.x_velocities.nbytes
+
+    def _set_arrays(self, steps, positions, x_velocities):
+        """Set this trajectory's (read-only) arrays."""
+        self._steps = numpy.array(steps, dtype=numpy.int16)
+        self._positions = numpy.array(positions, dtype=float)
+        self._x_velocities = numpy.array(x_velocities, dtype=float)
+        for array in (self._steps, self._positions, self._x_velocities):
+            array.flags.writeable = False
+
+    def _unpack_batch(self):
+        """Build this trajectory's arrays from the arrays of the batch it was computed in."""
+        history, i, final_step = self._batch
+        self._batch = None
+        coordinate_x_history, coordinate_y_history, coordinate_z_history, velocity_history, moved_history = history
+        steps = numpy.flatnonzero(moved_history[:final_step, i])
+        final_coordinate_x, final_coordinate_y = self.final_location
+        positions = numpy.empty((len(steps)+1, 3))
+        positions[:-1, 0] = coordinate_x_history[steps, i]
+        positions[:-1, 1] = coordinate_y_history[steps, i]
+        positions[:-1, 2] = coordinate_z_history[steps, i]
+        positions[-1] = final_coordinate_x, final_coordinate_y, 0.0
+        x_velocities = numpy.append(velocity_history[steps, i], 0.0)
+        self._set_arrays(steps=numpy.append(steps, final_step), positions=positions, x_velocities=x_velocities)
+
+
+def compute_trajectory(field, ball_weight, exit_speed, horizontal_launch_angle, vertical_launch_angle):
+    """Return the Trajectory of a single batted ball.
+
+    This enacts a timestep-by-timestep physics simulation of the ball's full course, recording
+    its x-, y-, and z-coordinates at each timestep. [NOTE: While it is convenient for the physics
+    computation to call the the horizontal axis 'x' and the vertical axis 'y', in the baseball
+    simulation it makes more sense to call the vertical axis 'z', the axis moving from home plate
+    to center field 'y', and the axis moving from third base to first base 'x'. As such, we convert
+    the physics-sim 'y' values to coordinate 'z' values, and then consider the swing's horizontal
+    launch angle to compute the additional coordinate 'x' and 'y' values.]
+
+    @param field: The Field on which the ball was batted.
+    @param ball_weight: The weight of the ball, in ounces.
+    @param exit_speed: The exit speed of the ball, in mph.
+    @param horizontal_launch_angle: The horizontal launch angle of the ball, in degrees.
+    @param vertical_launch_angle: The vertical launch angle of the ball, in degrees.
+    """
+    trajectory = Trajectory()
+    # The indices (into TIMESTEPS) of the timesteps recorded, and the ball's positions and
+    # velocities at them
+    steps, positions, x_velocities = [], [], []
+    # The field's boundaries and fence heights, indexed by x-coordinate plus x_offset
+    playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height = (
+        field.geometry.boundaries
+    )
+    x_offset = field.geometry.X_OFFSET
+    # Everything that doesn't change from timestep to timestep gets computed up front
+    timestep = TIMESTEP
+    timestep_squared = timestep**2
+    sin_of_horizontal_launch_angle = math.sin(math.radians(horizontal_launch_angle))
+    cos_of_horizontal_launch_angle = math.cos(math.radians(horizontal_launch_angle))
+    m = ball_weight * OUNCES_TO_KILOGRAMS
+    drag_over_mass = DRAG/m
+    # Set initial values at point of contact
+    x, y = 0, 1.0668  # Coordinates at point of contact, in meters
+    step = 0
+    time_since_contact = 0.0
+    v = exit_speed * MPH_TO_METERS_PER_SECOND
+    th = math.radians(vertical_launch_angle)
+    vx = v * math.cos(th)  # Initial horizontal component of velocity
+    vy = v * math.sin(th)  # Initial vertical component of velocity
+    ax = -drag_over_mass*v*vx  # Initial horizontal component of acceleration
+    ay = -GRAVITY-drag_over_mass*v*vy  # Initial vertical component of acceleration
+    coordinate_x = 0.0
+    coordinate_y = 0.0  # Right over home plate still
+    coordinate_z = 3.5
+    steps.append(step)
+    positions.append((coordinate_x, coordinate_y, coordinate_z))
+    x_velocities.append(v * METERS_PER_SECOND_TO_MPH)
+    # Simulate movement of the ball up to the point that it "stops" -- to avoid computational
+    # overkill, we say that a ball has stopped once its horizontal component of velocity falls
+    # below 1 m/s and it is not six or more inches in the air -- or contacts the foul pole, in
+    # which case we know a home run will be called and the rest of the trajectory is irrelevant
+    while (vx >= 1 or y > 0.1524 or time_since_contact < 0.6) and not trajectory.foul_pole_contact_timestep:
+        # Increment time
+        last_timestep = time_since_contact
+        time_since_contact += timestep
+        step += 1
+        # If ball hit the ground on the last timestep, make it bounce
+        if y <= 0:
+            # If this was the first time the ball hit the ground, record distance in feet
+            if trajectory.true_distance is None:
+                trajectory.true_distance = int(x * METERS_TO_FEET)
+                trajectory.true_landing_point = int(coordinate_x), int(coordinate_y)
+                trajectory.hang_time = time_since_contact
+            if not trajectory.landing_timestep:
+                trajectory.landing_timestep = time_since_contact-timestep  # The landing actually happened last timestep
+            elif not trajectory.second_landing_timestep:
+                trajectory.second_landing_timestep = time_since_contact-timestep
+            vy *= -1  # Reverse vertical component of velocity
+            vy *= TURF_COR  # Adjust for coefficient of restitution of the turf
+            vx *= TURF_COF  # Adjust for friction of the turf
+            v = math.sqrt(vx*vx + vy*vy)
+        # If a ball hit the foul pole on last timestep, make note of it -- this will be called
+        # a home run on this timestep by umpire.officiate()
+        if abs(coordinate_x) >= 226 and int(coordinate_x) == int(coordinate_y):
+            trajectory.foul_pole_contact_timestep = last_timestep
+            continue
+        # If ball hit an outfield fence or foul fence on last timestep, make it bounce off that
+        if (abs(coordinate_x) < 227 and not
+                (trajectory.foul_fence_contact_timestep or trajectory.outfield_fence_contact_timestep)):
+            # If the absolute value of the batted ball's coordinate x is greater than 226,
+            # we know that the ball left the playing field above the fence (I think -- otherwise,
+            # it's a reasonable approximation anyway, I think)
+            if coordinate_x > coordinate_y or coordinate_y < 0:
+                # Ball is heading foul -- check for whether the ball contacted a foul fence between
+                # the last timestep and now
+                wall = playing_field_lower_bound[int(coordinate_x)+x_offset]
+                if coordinate_y <= wall and coordinate_z <= foul_fence_height[int(coordinate_x)+x_offset]:
+                    # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
+                    # coordinate of the wall -- otherwise it would be that a ball passed the
+                    # wall and was then sucked back through it to simulate hitting it
+                    positions[-1] = coordinate_x, wall, coordinate_z
+                    trajectory.foul_fence_contact_timestep = last_timestep
+                    vx *= -1  # Reverse horizontal component of velocity
+                    vx *= FENCE_COR  # Adjust for coefficient of restitution of the fence
+                    vy *= FENCE_COF  # Adjust for friction of the fence
+                    v = math.sqrt(vx*vx + vy*vy)
+            else:
+                # Ball is heading fair -- check for whether the ball contacted the outfield fence
+                # between the last timestep and now
+                wall = playing_field_upper_bound[int(coordinate_x)+x_offset]
+                if coordinate_y >= wall and coordinate_z <= outfield_fence_height[int(coordinate_x)+x_offset]:
+                    positions[-1] = coordinate_x, wall, coordinate_z
+                    trajectory.outfield_fence_contact_timestep = last_timestep
+                    vx *= -1
+                    vx *= FENCE_COR
+                    vy *= FENCE_COF
+                    v = math.sqrt(vx*vx + vy*vy)
+        # Calculate new physics x and y coordinates
+        x += (vx*timestep) + (ax * timestep_squared) / 2
+        y += (vy*timestep) + (ay * timestep_squared) / 2
+        if y < 0:
+            y = 0  # A necessary approximation
+        # Calculate new acceleration components
+        ax = -drag_over_mass*v*vx
+        ay = -GRAVITY-drag_over_mass*v*vy
+        # Calculate new velocity components
+        vx += ax*timestep
+        vy += ay*timestep
+        v = math.sqrt(vx*vx + vy*vy)
+        # Calculate, convert, and record new actual ball x-, y-, z-coordinates
+        coordinate_x = x * sin_of_horizontal_launch_angle
+        coordinate_x *= METERS_TO_FEET
+        coordinate_y = x * cos_of_horizontal_launch_angle
+        coordinate_y *= METERS_TO_FEET
+        coordinate_z = y * METERS_TO_FEET
+        steps.append(step)
+        positions.append((coordinate_x, coordinate_y, coordinate_z))
+        x_velocities.append(v * METERS_PER_SECOND_TO_MPH)
+        if coordinate_z > trajectory.apex:
+            trajectory.apex = coordinate_z
+    # Baseball has now stopped moving -- record resting data for a final timestep
+    time_since_contact += timestep
+    step += 1
+    steps.append(step)
+    positions.append((coordinate_x, coordinate_y, 0.0))
+    x_velocities.append(0.0)
+    extend_timesteps(number_of_timesteps=step+1)
+    trajectory._set_arrays(steps=steps, positions=positions, x_velocities=x_velocities)
+    # If the ball just landed for the first time on the last timestep, the
+    # true landing point, etc., may not have been recorded
+    if trajectory.true_distance is None:
+        trajectory.true_distance = int(x * METERS_TO_FEET)
+        trajectory.true_landing_point = int(coordinate_x), int(coordinate_y)
+        trajectory.hang_time = time_since_contact
+    if not trajectory.landing_timestep:
+        trajectory.landing_timestep = time_since_contact-timestep
+    trajectory.final_location = [coordinate_x, coordinate_y]
+    return trajectory
+
+
+def compute_trajectories(field, ball_weight, launch_conditions):
+    """Return the Trajectory of each of many batted balls, which are integrated all at once.
+
+    This carries out the same simulation as compute_trajectory(), but with the state of every
+    ball held in NumPy arrays, so that each timestep is a handful of array operations across all
+    the balls that are still moving, rather than a pass through the Python loop per ball. It pays
+    off for batches (e.g., tabulating trajectories over a grid of launch conditions); for a single
+    ball, compute_trajectory() is faster.
+
+    @param field: The Field on which the balls were batted.
+    @param ball_weight: The weight of the balls, in ounces.
+    @param launch_conditions: A sequence of (exit speed, horizontal launch angle, vertical
+                              launch angle) tuples, in mph and degrees.
+    """
+    n = len(launch_conditions)
+    if not n:
+        return []
+    geometry = field.geometry
+    timestep = TIMESTEP
+    timestep_squared = timestep**2
+    drag_over_mass = DRAG/(ball_weight * OUNCES_TO_KILOGRAMS)
+    # The trigonometry is done with the math module, ball by ball, so that the results match
+    # compute_trajectory()'s exactly
+    exit_speeds, horizontal_launch_angles, vertical_launch_angles = zip(*launch_conditions)
+    sin_of_horizontal_launch_angle = numpy.array([math.sin(math.radians(a)) for a in horizontal_launch_angles])
+    cos_of_horizontal_launch_angle = numpy.array([math.cos(math.radians(a)) for a in horizontal_launch_angles])
+    v = numpy.array(exit_speeds, dtype=float) * MPH_TO_METERS_PER_SECOND
+    vx = v * numpy.array([math.cos(math.radians(a)) for a in vertical_launch_angles])
+    vy = v * numpy.array([math.sin(math.radians(a)) for a in vertical_launch_angles])
+    ax = -drag_over_mass*v*vx
+    ay = -GRAVITY-drag_over_mass*v*vy
+    x = numpy.zeros(n)
+    y = numpy.full(n, 1.0668)
+    coordinate_x = numpy.zeros(n)
+    coordinate_y = numpy.zeros(n)
+    coordinate_z = numpy.full(n, 3.5)
+    apex = numpy.zeros(n)
+    # Timesteps at which things happened to each ball; as in compute_trajectory(), where these
+    # are tested for truthiness, 0.0 means that it hasn't happened (yet)
+    landing_timestep = numpy.zeros(n)
+    second_landing_timestep = numpy.zeros(n)
+    foul_fence_contact_timestep = numpy.zeros(n)
+    outfield_fence_contact_timestep = numpy.zeros(n)
+    foul_pole_contact_timestep = numpy.zeros(n)
+    landed = numpy.zeros(n, dtype=bool)
+    true_distance = numpy.zeros(n, dtype=int)
+    true_landing_x = numpy.zeros(n, dtype=int)
+    true_landing_y = numpy.zeros(n, dtype=int)
+    hang_time = numpy.zeros(n)
+    # The timestep on which each ball stopped (or hit a foul pole), as an index into 'timesteps'
+    final_step = numpy.zeros(n, dtype=int)
+    # Time is accumulated exactly as in compute_trajectory(), so that the timesteps (which are
+    # used as dictionary keys) are the very same floats, i.e., the ones in TIMESTEPS
+    timesteps = [0.0]
+    # For each timestep, the coordinates and velocities of all the balls, and which of them moved
+    history = [(coordinate_x, coordinate_y, coordinate_z, v * METERS_PER_SECOND_TO_MPH, numpy.ones(n, dtype=bool))]
+    moving = numpy.ones(n, dtype=bool)
+    step = 0
+    while True:
+        moving &= ((vx >= 1) | (y > 0.1524) | (timesteps[-1] < 0.6)) & (foul_pole_contact_timestep == 0)
+        step += 1
+        last_timestep = timesteps[-1]
+        time_since_contact = last_timestep + timestep
+        timesteps.append(time_since_contact)
+        # Balls that stopped (or hit a foul pole) last timestep get their final timestep now
+        final_step[(final_step == 0) & ~moving] = step
+        if not moving.any():
+            break
+        # Make balls that hit the ground on the last timestep bounce
+        bouncing = moving & (y <= 0)
+        if bouncing.any():
+            first_landing = bouncing & ~landed
+            landed |= first_landing
+            true_distance[first_landing] = (x[first_landing] * METERS_TO_FEET).astype(int)
+            true_landing_x[first_landing] = coordinate_x[first_landing].astype(int)
+            true_landing_y[first_landing] = coordinate_y[first_landing].astype(int)
+            hang_time[first_landing] = time_since_contact
+            landing_now = bouncing & (landing_timestep == 0)
+            second_landing_now = bouncing & ~landing_now & (second_landing_timestep == 0)
+            landing_timestep[landing_now] = time_since_contact-timestep
+            second_landing_timestep[second_landing_now] = time_since_contact-timestep
+            vy[bouncing] *= -1
+            vy[bouncing] *= TURF_COR
+            vx[bouncing] *= TURF_COF
+            v[bouncing] = numpy.sqrt(vx[bouncing]*vx[bouncing] + vy[bouncing]*vy[bouncing])
+        # Note balls that hit a foul pole on the last timestep; these don't move any further
+        hitting_foul_pole = moving & (numpy.abs(coordinate_x) >= 226) & (
+            coordinate_x.astype(int) == coordinate_y.astype(int)
+        )
+        foul_pole_contact_timestep[hitting_foul_pole] = last_timestep
+        moving_on = moving & ~hitting_foul_pole
+        # Make balls that hit an outfield fence or foul fence on the last timestep bounce off it
+        may_hit_a_fence = moving_on & (numpy.abs(coordinate_x) < 227) & (
+            (foul_fence_contact_timestep == 0) & (outfield_fence_contact_timestep == 0)
+        )
+        if may_hit_a_fence.any():
+            heading_foul = (coordinate_x > coordinate_y) | (coordinate_y < 0)
+            hitting_foul_fence = may_hit_a_fence & heading_foul & geometry.hits_foul_fence(
+                x=coordinate_x, y=coordinate_y, z=coordinate_z
+            )
+            hitting_outfield_fence = may_hit_a_fence & ~heading_foul & geometry.hits_outfield_fence(
+                x=coordinate_x, y=coordinate_y, z=coordinate_z
+            )
+            hitting_a_fence = hitting_foul_fence | hitting_outfield_fence
+            if hitting_a_fence.any():
+                # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
+                # coordinate of the wall (see compute_trajectory())
+                last_coordinate_y = history[-1][1]
+                last_coordinate_y[hitting_foul_fence] = geometry.lower_bound_at(coordinate_x[hitting_foul_fence])
+                last_coordinate_y[hitting_outfield_fence] = geometry.upper_bound_at(coordinate_x[hitting_outfield_fence])
+                foul_fence_contact_timestep[hitting_foul_fence] = last_timestep
+                outfield_fence_contact_timestep[hitting_outfield_fence] = last_timestep
+                vx[hitting_a_fence] *= -1
+                vx[hitting_a_fence] *= FENCE_COR
+                vy[hitting_a_fence] *= FENCE_COF
+                v[hitting_a_fence] = numpy.sqrt(vx[hitting_a_fence]*vx[hitting_a_fence] + vy[hitting_a_fence]*vy[hitting_a_fence])
+        # Calculate new physics x and y coordinates, accelerations, and velocities
+        x = numpy.where(moving_on, x + ((vx*timestep) + (ax * timestep_squared) / 2), x)
+        y = numpy.where(moving_on, y + ((vy*timestep) + (ay * timestep_squared) / 2), y)
+        y[y < 0] = 0  # A necessary approximation
+        ax = numpy.where(moving_on, -drag_over_mass*v*vx, ax)
+        ay = numpy.where(moving_on, -GRAVITY-drag_over_mass*v*vy, ay)
+        vx = numpy.where(moving_on, vx + ax*timestep, vx)
+        vy = numpy.where(moving_on, vy + ay*timestep, vy)
+        v = numpy.where(moving_on, numpy.sqrt(vx*vx + vy*vy), v)
+        # Calculate, convert, and record new actual ball x-, y-, z-coordinates
+        coordinate_x = numpy.where(moving_on, (x * sin_of_horizontal_launch_angle) * METERS_TO_FEET, coordinate_x)
+        coordinate_y = numpy.where(moving_on, (x * cos_of_horizontal_launch_angle) * METERS_TO_FEET, coordinate_y)
+        coordinate_z = numpy.where(moving_on, y * METERS_TO_FEET, coordinate_z)
+        apex = numpy.where(moving_on & (coordinate_z > apex), coordinate_z, apex)
+        history.append((coordinate_x, coordinate_y, coordinate_z, v * METERS_PER_SECOND_TO_MPH, moving_on))
+    # Package up each ball's trajectory, stacking the history into (timestep, ball) arrays
+    extend_timesteps(number_of_timesteps=len(timesteps))
+    history = tuple(numpy.array(component) for component in zip(*history))
+    final_coordinate_xs, final_coordinate_ys = coordinate_x.tolist(), coordinate_y.tolist()
+    x_in_feet = (x * METERS_TO_FEET).astype(int).tolist()
+    final_step = final_step.tolist()
+    trajectories = []
+    for i in xrange(n):
+        trajectory = Trajectory()
+        last_step = final_step[i]
+        trajectory._batch = (history, i, last_step)
+        final_coordinate_x, final_coordinate_y = final_coordinate_xs[i], final_coordinate_ys[i]
+        if landed[i]:
+            trajectory.true_distance = int(true_distance[i])
+            trajectory.true_landing_point = int(true_landing_x[i]), int(true_landing_y[i])
+            trajectory.hang_time = float(hang_time[i])
+        else:
+            trajectory.true_distance = x_in_feet[i]
+            trajectory.true_landing_point = int(final_coordinate_x), int(final_coordinate_y)
+            trajectory.hang_time = timesteps[last_step]
+        trajectory.landing_timestep = float(landing_timestep[i]) or timesteps[last_step]-timestep
+        trajectory.second_landing_timestep = float(second_landing_timestep[i]) or None
+        trajectory.outfield_fence_contact_timestep = float(outfield_fence_contact_timestep[i]) or None
+        trajectory.foul_fence_contact_timestep = float(foul_fence_contact_timestep[i]) or None
+        trajectory.foul_pole_contact_timestep = float(foul_pole_contact_timestep[i]) or None
+        trajectory.apex = float(apex[i])
+        trajectory.final_location = [final_coordinate_x, final_coordinate_y]
+        trajectories.append(trajectory)
+    return trajectories
+
+
+class TrajectoryCache(object):
+    """A size-bounded, least-recently-used cache of batted-ball trajectories.
+
+    A trajectory is fully determined by its launch conditions, the weight of the ball, and the
+    field's geometry (which every field with the same dimensions shares), so there's no need to
+    compute the same one twice. Launch conditions are quantized to the resolutions given (the
+    caller should adopt the quantized values; see quantize()), which makes repeats common enough
+    to be worth caching. The trajectories handed out are shared, and
+    so must be treated as read-only.
+    """
+
+    def __init__(self, max_size, exit_speed_resolution, launch_angle_resolution):
+        """Initialize a TrajectoryCache object.
+
+        @param max_size: The maximum number of trajectories to hold.
+        @param exit_speed_resolution: The resolution (in mph) to which exit speeds are quantized.
+        @param launch_angle_resolution: The resolution (in degrees) to which launch angles are quantized.
+        """
+        self.max_size = max_size
+        self.exit_speed_resolution = exit_speed_resolution
+        self.launch_angle_resolution = launch_angle_resolution
+        # Maps (exit speed, horizontal launch angle, vertical launch angle, ball weight, field geometry) keys
+        # to trajectories, least recently used first
+        self.trajectories = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # If this is set to a list, the (key, trajectory) pairs that this cache computes on misses are
+        # appended to it, so that they may be handed to another cache (see absorb())
+        self.computed_trajectories = None
+
+    def __len__(self):
+        """Return the number of trajectories in this cache."""
+        return len(self.trajectories)
+
+    def __getstate__(self):
+        """Return the state of this cache that will be serialized when the cosmos is saved (it starts out empty)."""
+        state = dict(self.__dict__)
+        state['trajectories'] = OrderedDict()
+        return state
+
+    def quantize(self, exit_speed, horizontal_launch_angle, vertical_launch_angle):
+        """Return the given launch conditions, quantized to this cache's resolutions."""
+        return (
+            _quantize(exit_speed, self.exit_speed_resolution),
+            _quantize(horizontal_launch_angle, self.launch_angle_resolution),
+            _quantize(vertical_launch_angle, self.launch_angle_resolution),
+        )
+
+    def get(self, field, ball_weight, exit_speed, horizontal_launch_angle, vertical_launch_angle):
+        """Return the (shared, read-only) trajectory for the given launch conditions, computing it if need be.
+
+        The launch conditions should already have been quantized.
+        """
+        key = (exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, field.geometry)
+        trajectory = self.trajectories.pop(key, None)
+        if trajectory is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            trajectory = compute_trajectory(
+                field=field, ball_weight=ball_weight, exit_speed=exit_speed,
+                horizontal_launch_angle=horizontal_launch_angle, vertical_launch_angle=vertical_launch_angle
+            )
+            if self.computed_trajectories is not None:
+                self.computed_trajectories.append((key, trajectory))
+        self._insert(key=key, trajectory=trajectory)
+        return trajectory
+
+    def absorb(self, computed_trajectories, hits, misses):
+        """Take in the trajectories computed by another cache (e.g., one in a worker process), and its lookup counts.
+
+        @param computed_trajectories: A list of (key, trajectory) pairs, as collected in the other
+                                      cache's computed_trajectories.
+        @param hits: The number of hits in the other cache, to be counted toward this one's.
+        @param misses: The number of misses in the other cache, to be counted toward this one's.
+        """
+        for key, trajectory in computed_trajectories:
+            if key not in self.trajectories:
+                self._insert(key=key, trajectory=trajectory)
+        self.hits += hits
+        self.misses += misses
+
+    def warm(self, field, ball_weight, launch_conditions):
+        """Compute and cache, all at once, the trajectories for a table of launch conditions.
+
+        @param field: The field the trajectories will be for (e.g., the standard park).
+        @param ball_weight: The weight of the ball, in ounces.
+        @param launch_conditions: A sequence of (exit speed, horizontal launch angle, vertical
+                                  launch angle) tuples, which will be quantized.
+        """
+        launch_conditions_to_compute = []
+        for exit_speed, horizontal_launch_angle, vertical_launch_angle in launch_conditions:
+            quantized_launch_conditions = self.quantize(exit_speed, horizontal_launch_angle, vertical_launch_angle)
+            if quantized_launch_conditions + (ball_weight, field.geometry) not in self.trajectories:
+                launch_conditions_to_compute.append(quantized_launch_conditions)
+        launch_conditions_to_compute = sorted(set(launch_conditions_to_compute))
+        trajectories = compute_trajectories(
+            field=field, ball_weight=ball_weight, launch_conditions=launch_conditions_to_compute
+        )
+        for quantized_launch_conditions, trajectory in zip(launch_conditions_to_compute, trajectories):
+            self._insert(key=quantized_launch_conditions + (ball_weight, field.geometry), trajectory=trajectory)
+
+    def _insert(self, key, trajectory):
+        """Insert a trajectory as the most recently used one, evicting the least recently used one if need be."""
+        self.trajectories[key] = trajectory
+        while len(self.trajectories) > self.max_size:
+            self.trajectories.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        """Return the fraction of lookups in this cache that have been hits."""
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def approximate_memory_footprint(self):
+        """Return an estimate of the number of bytes taken up by the trajectories in this cache."""
+        total = sys.getsizeof(self.trajectories)
+        for key, trajectory in self.trajectories.iteritems():
+            total += sys.getsizeof(key) + sys.getsizeof(trajectory) + sys.getsizeof(trajectory.__dict__)
+            total += trajectory.nbytes + 3*ARRAY_OVERHEAD_IN_BYTES
+        return total
+
+    def stats(self):
+        """Return a dictionary of statistics about this cache, for tuning its quantization and size."""
+        return {
+            'entries': len(self.trajectories),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'approximate_bytes': self.approximate_memory_footprint(),
+            'exit_speed_resolution': self.exit_speed_resolution,
+            'launch_angle_resolution': self.launch_angle_resolution,
+        }
+
+    def clear(self):
+        """Empty this cache and reset its statistics."""
+        self.trajectories.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+def _quantize(value, resolution):
+    """Return the given value snapped to the nearest multiple of the given resolution (if it's nonzero)."""
+    if not resolution:
+        return value
+    return round(value/resolution) * resolution
@@ -3,6 +3,7 @@ import random
 from random import normalvariate as normal
 from career import UmpireCareer
 from call import PlayAtBaseCall, FlyOutCall
+from pitch_decision import StrikeZoneTable, frame_pitch_location
 from outcome import FoulBall, FlyOut, HomeRun, GrandSlam, AutomaticDouble, GroundRuleDouble
 
 
@@ -36,7 +37,8 @@ class Umpire(object):
     def _init_umpire_biases(self):
         """Initialize umpire biases for a person.
 
-        These biases are triggered in tandem by Umpire.call_pitch().
+        These biases are triggered in tandem by Umpire.call_pitch(), by way of
+        a strike-zone table that is compiled once per game (see compile_strike_zone_table()).
 
         Primary source: http://www.sloansportsconference.com/wp-content/
         uploads/2014/02/2014_SSAC_What-Does-it-Take-to-Call-a-Strike.pdf
@@ -109,79 +111,23 @@ class Umpire(object):
         # pitcher gets expanded strike zone, etc.)
         # TODO biases from gambling on the game
 
+    def compile_strike_zone_table(self, home_team):
+        """Return this umpire's model of the strike zone, compiled for a game with the given home team."""
+        return StrikeZoneTable(umpire=self, home_team=home_team)
+
     def call_pitch(self, pitch):
         """Call a pitch that is not swung at either a strike or a ball."""
-        # First, start with a perfect model of the true strike zone
-        left_edge, right_edge = -2.83, 2.83
-        bottom_edge, top_edge = pitch.batter.strike_zone
-        # Pollute this model with edge biases
-        left_edge += self.pitch_call_left_edge_bias
-        right_edge += self.pitch_call_right_edge_bias
-        top_edge += self.pitch_call_top_edge_bias
-        bottom_edge += self.pitch_call_bottom_edge_bias
-        # Further pollute the model with count biases and
-        # previous-call biases, as appropriate; first, consider whether
-        # a count bias should be enacted, given the pitch context; if it
-        # is not applicable, consider applying a previous-call bias
-        # (they'll never both be applied simultaneously)
-        if pitch.count == 02 or pitch.count == 12 or pitch.count == 22:
-            # Constrict the strike zone
-            left_edge += self.pitch_call_two_strikes_bias
-            right_edge -= self.pitch_call_two_strikes_bias
-            top_edge -= self.pitch_call_two_strikes_bias
-            bottom_edge += self.pitch_call_two_strikes_bias
-        elif (pitch.count != 00 and pitch.count != 32 and
-                pitch.at_bat.pitches[-1].call == "Strike"):
-            # Constrict the strike zone
-            left_edge += self.pitch_call_just_called_strike_bias
-            right_edge -= self.pitch_call_just_called_strike_bias
-            top_edge -= self.pitch_call_just_called_strike_bias
-            bottom_edge += self.pitch_call_just_called_strike_bias
-        if pitch.count == 30 or pitch.count == 31:
-            # Expand the strike zone
-            left_edge -= self.pitch_call_three_balls_bias
-            right_edge += self.pitch_call_three_balls_bias
-            top_edge += self.pitch_call_three_balls_bias
-            bottom_edge -= self.pitch_call_three_balls_bias
-        elif (pitch.count != 00 and pitch.count != 32 and
-                pitch.at_bat.pitches[-1].call == "Ball"):
-            # Expand the strike zone
-            left_edge -= self.pitch_call_just_called_ball_bias
-            right_edge += self.pitch_call_just_called_ball_bias
-            top_edge += self.pitch_call_just_called_ball_bias
-            bottom_edge -= self.pitch_call_just_called_ball_bias
-        # Further pollute the model with left-handed hitter bias,
-        # if appropriate
-        if pitch.batter_left_handed:
-            left_edge += self.pitch_call_lefty_bias
-            right_edge += self.pitch_call_lefty_bias
-        # Further pollute the model with home-team--pitcher bias, if
-        # appropriate, which expands the strike zone at all edges
-        if pitch.pitcher.career.team is pitch.at_bat.game.home_team:
-            left_edge -= self.pitch_call_home_team_bias
-            right_edge += self.pitch_call_home_team_bias
-            top_edge += self.pitch_call_home_team_bias
-            bottom_edge -= self.pitch_call_home_team_bias
+        # Look up this umpire's biased model of the strike zone in the context of this pitch (see
+        # pitch_decision.StrikeZoneTable for how it's polluted by edge, count, previous-call,
+        # left-handed-hitter, and home-team biases)
+        strike_zone_table = pitch.at_bat.game.strike_zone_table
+        left_edge, right_edge, bottom_edge, top_edge = strike_zone_table[strike_zone_table.context(pitch)]
         # Crucially, account for the effects of pitch framing by altering
         # a heretofore perfect representation pitch's location at the
         # point that it crossed the plane over the front of home plate
-        # (good pitch framers bring the ball toward the center of the
-        # strike zone, while bad pitch framers pull it away from it); this
-        # is only enacted in borderline pitches
-        if -4 < pitch.actual_x < -2:
-            # Pull up toward [0, 0]
-            framed_x = pitch.actual_x + pitch.catcher.pitch_framing
-        elif 2 < pitch.actual_x < 4:
-            # Pull down toward [0, 0]
-            framed_x = pitch.actual_x - pitch.catcher.pitch_framing
-        else:
-            framed_x = pitch.actual_x
-        if -5 < pitch.actual_y < -3:
-            framed_y = pitch.actual_y + pitch.catcher.pitch_framing
-        elif 3 < pitch.actual_x < 5:
-            framed_y = pitch.actual_y - pitch.catcher.pitch_framing
-        else:
-            framed_y = pitch.actual_y
+        framed_x, framed_y = frame_pitch_location(
+            x=pitch.actual_x, y=pitch.actual_y, pitch_framing=pitch.catcher.pitch_framing
+        )
         # Finally, *to simulate umpire inconsistency*, pollute the
         # framed position of the pitch using the umpire's rating
         # for pitch call consistency as a standard deviation
@@ -0,0 +1,389 @@
+"""A deterministic, seeded benchmark suite for worldgen, season simulation, and single games.
+
+Each scenario is run in its own subprocess (so that its peak RSS is its own), with the global
+random-number generator seeded, and reports its wall time, its peak RSS, and the per-phase timings
+and counters recorded by the cosmos's instrumentation. Scenarios that start from a later point in
+history restore a cached snapshot of the cosmos (see Cosmos.save()), generating it first if need be.
+
+Usage:
+    python benchmark.py                                   # Run all scenarios
+    python benchmark.py --scenario games --scenario batted_balls
+    python benchmark.py --output results.json --seed 7
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+
+
+DEFAULT_SEED = 1854
+DEFAULT_SNAPSHOT_DIRECTORY = './benchmark_snapshots'
+SCENARIO_NAMES = (
+    'worldgen_1599_1700', 'worldgen_1700_1854', 'league_season', 'league_season_headless',
+    'league_season_parallel', 'games', 'batted_balls', 'batted_balls_batch',
+    'games_surrogate', 'productionist'
+)
+NUMBER_OF_STANDALONE_GAMES = 1000
+# The number of full-fidelity games whose at-bats the surrogate at-bat model is fitted from
+NUMBER_OF_SURROGATE_FITTING_GAMES = 200
+NUMBER_OF_BATTED_BALLS = 10000
+NUMBER_OF_GRAMMAR_LOADS = 5
+# The date on which the league that some scenarios form will be in the midst of its first season
+DATE_MIDSEASON = (1854, 6, 1)
+
+
+class Scenario(object):
+    """A benchmark scenario.
+
+    Subclasses prepare any state they need in prepare(), which isn't timed, and then do
+    the work being benchmarked in run(), which is.
+    """
+
+    name = None
+
+    def __init__(self, seed, snapshot_directory):
+        """Initialize a Scenario object."""
+        self.seed = seed
+        self.snapshot_directory = snapshot_directory
+        self.cosmos = None  # Its instrumentation will be reported, if this gets set
+        self.calibration_report = None  # This will be reported too, if it gets set
+
+    def prepare(self):
+        """Prepare the state this scenario needs."""
+        pass
+
+    def run(self):
+        """Do the work being benchmarked."""
+        raise NotImplementedError
+
+    def snapshot_path(self, year):
+        """Return the path to the cached snapshot of the benchmark cosmos at the beginning of the given year."""
+        return os.path.join(self.snapshot_directory, 'cosmos_{seed}_{year}.snapshot'.format(seed=self.seed, year=year))
+
+    def restore_cosmos(self, year):
+        """Restore the benchmark cosmos at the beginning of the given year, generating its snapshot if need be."""
+        from cosmos import Cosmos
+        path = self.snapshot_path(year=year)
+        if not os.path.exists(path):
+            generate_snapshot(seed=self.seed, snapshot_directory=self.snapshot_directory, year=year)
+        cosmos = Cosmos.load(path)
+        cosmos.debug = False
+        return cosmos
+
+    def instrument(self, cosmos):
+        """Attach enabled instrumentation to the given cosmos, and remember it for reporting."""
+        from utils.instrumentation import Instrumentation
+        cosmos.instrumentation = Instrumentation(enabled=True)
+        cosmos.instrumentation.begin_year(cosmos.year)
+        self.cosmos = cosmos
+
+
+class WorldgenFrom1599To1700(Scenario):
+    """Generate a fresh cosmos and progress it to 1700."""
+
+    name = 'worldgen_1599_1700'
+
+    def prepare(self):
+        """Instantiate a fresh cosmos."""
+        from cosmos import Cosmos
+        from utils.instrumentation import Instrumentation
+        self.cosmos = Cosmos(debug=False, instrumentation=Instrumentation(enabled=True), seed=self.seed)
+
+    def run(self):
+        """Progress the cosmos to 1700."""
+        self.cosmos.progress(until=1700)
+
+
+class WorldgenFrom1700To1854(Scenario):
+    """Progress the cosmos from 1700 to 1854."""
+
+    name = 'worldgen_1700_1854'
+
+    def prepare(self):
+        """Restore the cosmos as of 1700."""
+        self.instrument(self.restore_cosmos(year=1700))
+
+    def run(self):
+        """Progress the cosmos to 1854."""
+        self.cosmos.progress(until=1854)
+
+
+class LeagueSeasonScenario(Scenario):
+    """Form a league in 1854 and progress through its first full season."""
+
+    name = 'league_season'
+
+    def prepare(self):
+        """Restore the cosmos as of 1854 and form a league."""
+        self.instrument(self.restore_cosmos(year=1854))
+        self.league = form_benchmark_league(cosmos=self.cosmos)
+
+    def run(self):
+        """Progress the cosmos through the league's first season."""
+        self.cosmos.progress(until=1855)
+
+
+class HeadlessLeagueSeasonScenario(LeagueSeasonScenario):
+    """Form a league in 1854 and progress through its first full season, playing its games headlessly."""
+
+    name = 'league_season_headless'
+
+    def prepare(self):
+        """Restore the cosmos as of 1854 and form a league whose games will be played headlessly."""
+        self.instrument(self.restore_cosmos(year=1854))
+        self.cosmos.config.play_league_games_headlessly = True
+        self.league = form_benchmark_league(cosmos=self.cosmos)
+
+
+class ParallelLeagueSeasonScenario(LeagueSeasonScenario):
+    """Form a league in 1854 and progress through its first full season, playing each day's games in parallel."""
+
+    name = 'league_season_parallel'
+
+    def prepare(self):
+        """Restore the cosmos as of 1854 and form a league whose games will be played across worker processes."""
+        import multiprocessing
+        self.instrument(self.restore_cosmos(year=1854))
+        self.cosmos.config.play_league_games_headlessly = True
+        self.cosmos.config.number_of_game_worker_processes = multiprocessing.cpu_count()
+        self.league = form_benchmark_league(cosmos=self.cosmos)
+
+
+class StandaloneGames(Scenario):
+    """Play a batch of standalone games between teams in a league that's in midseason."""
+
+    name = 'games'
+
+    def prepare(self):
+        """Restore the cosmos as of 1854, form a league, and progress to midseason."""
+        cosmos = self.restore_cosmos(year=1854)
+        self.league = form_benchmark_league(cosmos=cosmos)
+        cosmos.progress(until=DATE_MIDSEASON)
+        self.instrument(cosmos)
+        self.teams = sorted(self.league.teams, key=lambda team: team.name)
+
+    def run(self):
+        """Play the games."""
+        self.games = self.play_games(number_of_games=NUMBER_OF_STANDALONE_GAMES)
+
+    def play_games(self, number_of_games):
+        """Play the given number of games between the league's teams, and return them."""
+        from baseball.game import Game
+        games = []
+        for i in xrange(number_of_games):
+            home_team = self.teams[i % len(self.teams)]
+            away_team = self.teams[(i+1) % len(self.teams)]
+            games.append(Game(series=None, home_team=home_team, away_team=away_team))
+        return games
+
+
+class SurrogateGames(StandaloneGames):
+    """Play the same batch of standalone games, but with at-bats sampled from a fitted surrogate model."""
+
+    name = 'games_surrogate'
+
+    def prepare(self):
+        """Play a batch of full-fidelity games, fit a surrogate at-bat model to them, and install it."""
+        super(SurrogateGames, self).prepare()
+        # Gather observations from this batch of games alone (rather than from those played on the way to midseason)
+        self.cosmos.at_bat_surrogate = None
+        self.cosmos.at_bat_observations = []
+        self.full_fidelity_games = self.play_games(number_of_games=NUMBER_OF_SURROGATE_FITTING_GAMES)
+        self.cosmos.fit_at_bat_surrogate()
+        # Play every game with surrogate at-bats, regardless of the attention paid to it
+        self.cosmos.config.minimum_attention_paid_to_a_game_for_full_fidelity = float('inf')
+
+    def run(self):
+        """Play the games, and then compare their at-bat outcomes with those of the full-fidelity games."""
+        from baseball.surrogate import compose_calibration_report
+        super(SurrogateGames, self).run()
+        self.calibration_report = compose_calibration_report(
+            full_fidelity_games=self.full_fidelity_games, surrogate_games=self.games
+        )
+
+
+class BattedBalls(Scenario):
+    """Compute a batch of batted-ball trajectories at a league ballpark."""
+
+    name = 'batted_balls'
+
+    def prepare(self):
+        """Restore the cosmos as of 1854, form a league, and sample launch conditions."""
+        from baseball.equipment import Baseball
+        cosmos = self.restore_cosmos(year=1854)
+        league = form_benchmark_league(cosmos=cosmos)
+        self.instrument(cosmos)
+        self.field = sorted(league.teams, key=lambda team: team.name)[0].ballpark.field
+        self.launch_conditions = [
+            (random.normalvariate(85, 15), random.uniform(-50, 50), random.uniform(-20, 60))
+            for _ in xrange(NUMBER_OF_BATTED_BALLS)
+        ]
+        self.ball = Baseball()
+
+    def run(self):
+        """Compute the trajectories."""
+        from baseball.batted_ball import BattedBall
+        for exit_speed, horizontal_launch_angle, vertical_launch_angle in self.launch_conditions:
+            BattedBall(
+                swing=BenchmarkSwing(field=self.field, ball=self.ball), exit_speed=exit_speed,
+                horizontal_launch_angle=horizontal_launch_angle, vertical_launch_angle=vertical_launch_angle
+            )
+
+
+class BattedBallsInABatch(BattedBalls):
+    """Compute the same batch of batted-ball trajectories, but all at once with the vectorized engine."""
+
+    name = 'batted_balls_batch'
+
+    def run(self):
+        """Compute the trajectories."""
+        from baseball.trajectory import compute_trajectories
+        compute_trajectories(field=self.field, ball_weight=self.ball.weight, launch_conditions=self.launch_conditions)
+
+
+class ProductionistGrammarLoad(Scenario):
+    """Load the Productionist dialogue grammar."""
+
+    name = 'productionist'
+
+    def run(self):
+        """Load the grammar a few times."""
+        from people.productionist import Productionist
+        for _ in xrange(NUMBER_OF_GRAMMAR_LOADS):
+            Productionist(game=None)
+
+
+class BenchmarkSwing(object):
+    """The bare minimum of a swing that a BattedBall needs in order to compute its trajectory."""
+
+    def __init__(self, field, ball):
+        """Initialize a BenchmarkSwing object."""
+        self.at_bat = BenchmarkAtBat(field=field)
+        self.bunt = False
+        self.ball = ball
+        self.batter = None
+        self.pitch = None
+        self.pitcher = None
+        self.result = None
+
+
+class BenchmarkAtBat(object):
+    """The bare minimum of an at-bat that a BattedBall needs in order to compute its trajectory."""
+
+    def __init__(self, field):
+        """Initialize a BenchmarkAtBat object."""
+        self.game = self
+        self.field = field
+        self.cosmos = field.city.cosmos
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        WorldgenFrom1599To1700, WorldgenFrom1700To1854, LeagueSeasonScenario, HeadlessLeagueSeasonScenario,
+        ParallelLeagueSeasonScenario, StandaloneGames, SurrogateGames, BattedBalls, BattedBallsInABatch,
+        ProductionistGrammarLoad
+    )
+}
+
+
+def form_benchmark_league(cosmos):
+    """Form the benchmark league, as test.py does."""
+    from baseball.league import League
+    usa = cosmos.countries[0]
+    return League(usa.find('New York'), cosmos.baseball_classifications[0])
+
+
+def generate_snapshot(seed, snapshot_directory, year):
+    """Generate the snapshot of the benchmark cosmos at the beginning of the given year."""
+    from cosmos import Cosmos
+    if not os.path.isdir(snapshot_directory):
+        os.makedirs(snapshot_directory)
+    if year == 1700:
+        random.seed(seed)
+        cosmos = Cosmos(debug=False, seed=seed)
+    else:  # year == 1854
+        scenario = Scenario(seed=seed, snapshot_directory=snapshot_directory)
+        cosmos = scenario.restore_cosmos(year=1700)
+        random.seed(seed)
+    cosmos.progress(until=year)
+    cosmos.save(os.path.join(snapshot_directory, 'cosmos_{seed}_{year}.snapshot'.format(seed=seed, year=year)))
+
+
+def run_scenario(name, seed, snapshot_directory):
+    """Run a single scenario in this process and return its results."""
+    scenario = SCENARIOS[name](seed=seed, snapshot_directory=snapshot_directory)
+    random.seed(seed)
+    scenario.prepare()
+    random.seed(seed)
+    start_time = time.time()
+    scenario.run()
+    wall_seconds = time.time() - start_time
+    results = {
+        'scenario': name,
+        'seed': seed,
+        'wall_seconds': wall_seconds,
+        # On Linux, ru_maxrss is in kilobytes
+        'peak_rss_kilobytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'instrumentation': scenario.cosmos.instrumentation.summary() if scenario.cosmos else None,
+        'trajectory_cache': scenario.cosmos.trajectory_cache.stats() if scenario.cosmos else None,
+        'calibration_report': scenario.calibration_report,
+    }
+    return results
+
+
+def run_scenario_in_subprocess(name, seed, snapshot_directory):
+    """Run a single scenario in a subprocess, so that its peak RSS is its own, and return its results."""
+    file_descriptor, results_path = tempfile.mkstemp(suffix='.json')
+    os.close(file_descriptor)
+    try:
+        subprocess.check_call([
+            sys.executable, os.path.abspath(__file__), '--in-process', '--scenario', name, '--seed', str(seed),
+            '--snapshot-dir', snapshot_directory, '--output', results_path
+        ])
+        with open(results_path) as f:
+            return json.load(f)[0]
+    finally:
+        os.remove(results_path)
+
+
+def current_commit():
+    """Return the hash of the current git commit, if there is one."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD']).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the national_pastime benchmark suite.")
+    parser.add_argument('--scenario', action='append', choices=SCENARIO_NAMES,
+                        help="A scenario to run (may be repeated); by default, all scenarios are run.")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIRECTORY)
+    parser.add_argument('--output', default=None, help="Path to write JSON results to (default: stdout).")
+    parser.add_argument('--in-process', action='store_true', help="Run scenarios in this process.")
+    args = parser.parse_args()
+    scenario_names = args.scenario or list(SCENARIO_NAMES)
+    if args.in_process:
+        all_results = [run_scenario(name, args.seed, args.snapshot_dir) for name in scenario_names]
+    else:
+        all_results = [run_scenario_in_subprocess(name, args.seed, args.snapshot_dir) for name in scenario_names]
+        commit = current_commit()
+        for results in all_results:
+            results['commit'] = commit
+    output = json.dumps(all_results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print output
+
+
+if __name__ == '__main__':
+    main()
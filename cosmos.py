@@ -1,5 +1,11 @@
+import os
+import sys
+import gzip
 import random
 import datetime
+import tempfile
+import threading
+import cPickle as pickle
 from utils.config import Config
 from data import CityData
 from places.city import City
@@ -8,81 +14,155 @@ from people.business import *
 from people.productionist import Productionist
 from people.thought import Thoughts, ThoughtPrototype
 from baseball.classification import Class, InformalPlay
+from utils.scheduler import SimulationScheduler
+from events.event_log import EventLog
+from places.registry import PopulationRegistry
+from utils.instrumentation import Instrumentation
+from utils.rng import RandomStream
+from utils.timekeeping import Calendar
+from baseball.trajectory import TrajectoryCache
+from baseball.surrogate import AtBatSurrogate, collect_observations
+from baseball.play_log import PlayLog
+from baseball.printout import BoxScoreCache
 
 CHANCE_OF_A_DAY_BEING_SIMULATED = 0.005
+CHANCE_OF_POPULATION_MANIPULATION = 0.03
+# Serializing a cosmos means walking a very deep object graph (people point to their relationships,
+# which point to other people, who point to their relationships, and so forth), so snapshots are
+# saved and loaded in a separate thread that has a big stack and a high recursion limit
+SNAPSHOT_RECURSION_LIMIT = 1000000
+SNAPSHOT_THREAD_STACK_SIZE = 512 * 1024 * 1024
+SNAPSHOT_COMPRESSION_LEVEL = 6
 
 
 class Cosmos(object):
     """A baseball cosmos."""
 
-    def __init__(self, debug=True):
-        """Initialize a Cosmos object."""
-        self.debug = debug
-        # Determine and display an official Baseball Cosmos ID :)
-        self.id = self._init_cosmos_id()
-        if debug:
-            print "Preparing {self}...".format(self=self)
-        # Load the config parameters
-        self.config = Config()
-        # Prepare Thoughts class
+    def __init__(self, debug=True, event_log=None, instrumentation=None, seed=None):
+        """Initialize a Cosmos object.
+
+        @param debug: Whether to print out debug information as the simulation proceeds.
+        @param event_log: An object that will store all in-game events, which must support append() and
+                          len(), and should support indexing by event number; if None is passed, an
+                          EventLog that spills older events to disk will be used.
+        @param instrumentation: An Instrumentation object that will time and count the phases of the
+                                simulation; if None is passed, a disabled one will be used.
+        @param seed: An integer seed from which every random-number stream in this cosmos will be derived;
+                     if None is passed, one will be drawn from the global random-number generator.
+        """
+        # Prepare the root of this cosmos's hierarchy of random-number streams (see utils.rng); the
+        # cosmos draws from this stream in everything it does, starting with its own initialization
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.random_stream = RandomStream(seed=self.seed)
+        with self.random_stream.activate():
+            self.debug = debug
+            # Determine and display an official Baseball Cosmos ID :)
+            self.id = self._init_cosmos_id()
+            if debug:
+                print "Preparing {self}...".format(self=self)
+            # Load the config parameters
+            self.config = Config()
+            # Prepare Thoughts class
+            self._init_thought_prototypes(config=self.config)
+            # Load the city data (specifies data about all cities that will eventually
+            # be established in this simulation)
+            self.city_data = CityData()
+            # Load the NLG module for this game instance, etc.
+            self.productionist = Productionist(game=self)
+            self.errors = []
+            self.problems = []
+            # This gets incremented each time a new person is born/generated,
+            # which affords a persistent ID for each person
+            self.current_person_id = 0
+            self.current_place_id = 0
+            # Determine whether baseball curses are real in this baseball cosmos
+            self.curses_are_real = random.random() < self.config.chance_baseball_curses_are_real
+            # Prepare attributes relating to time
+            # self.year = self.config.year_worldgen_begins
+            # self.true_year = self.config.year_worldgen_begins  # True year never gets changed during retconning
+            self.ordinal_date = datetime.date(*self.config.date_worldgen_begins).toordinal()  # N days since 01-01-0001
+            self.year = datetime.date(*self.config.date_worldgen_begins).year
+            self.true_year = self.year  # True year never gets changed during retconning
+            self.month = datetime.date(*self.config.date_worldgen_begins).month
+            self.day = datetime.date(*self.config.date_worldgen_begins).day
+            self.time_of_day = 'day'
+            # Prepare a calendar, which caches date conversions and hands out the date objects
+            # that get attached to events and such
+            self.calendar = Calendar()
+            self.date = self.get_date()
+            # Prepare instrumentation, which times and counts the phases of the simulation year by year
+            self.instrumentation = instrumentation if instrumentation is not None else Instrumentation(enabled=False)
+            self.instrumentation.begin_year(self.year)
+            # Prepare a scheduler that determines, for each city, the timesteps on which it will
+            # undergo population manipulation and have a day simulated in it
+            self.scheduler = SimulationScheduler(
+                chances=[
+                    ('manipulate population', CHANCE_OF_POPULATION_MANIPULATION),
+                    ('simulate timestep', CHANCE_OF_A_DAY_BEING_SIMULATED)
+                ]
+            )
+            # Prepare a listing of all in-game events, which will facilitate debugging later; by
+            # default, only recent events are held in memory, and older ones are spilled to disk
+            self.events = event_log if event_log is not None else EventLog()
+            # A game's event number allows the precise ordering of events that
+            # happened on the same timestep -- every time an event happens, it requests an
+            # event number from Game.assign_event_number(), which also increments the running counter
+            self.event_number = -1
+            # Prepare a listing of all people born on each day -- this is used to
+            # age people on their birthdays; we start with (2, 29) initialized because
+            # we need to perform a check every March 1 to ensure that all leap-year babies
+            # celebrate their birthday that day on non-leap years
+            self.birthdays = {(2, 29): set()}
+            # Prepare a number that will hold a single random number that is generated daily -- this
+            # facilitates certain things that should be determined randomly but remain constant across
+            # a timestep, e.g., whether a person locked their door before leaving home
+            self.random_number_this_timestep = random.random()
+            # self.establish_setting()
+            # self._sim_and_save_a_week_of_timesteps()
+            self.weather = None
+            # Prepare geographic listings, as well as a registry of all the people living in
+            # the cosmos, which is kept up to date by the registries of its countries
+            self.registry = PopulationRegistry()
+            self.countries = []
+            self.states = []
+            self.cities = []
+            # Instantiate a first country
+            Country(name='United States of America', cosmos=self)
+            # Prepare baseball-centric attributes
+            self.baseball_classifications = [
+                # TODO MAKE THIS BOTTOM-UP; HAVE AGENTS NEGOTIATE TO COMPOSE/MODIFY CLASSES
+                Class(cosmos=self, level='AAA'),
+                InformalPlay(cosmos=self)
+            ]
+            self.leagues = []  # Leagues based here
+            # Prepare a cache of batted-ball trajectories, which are expensive to compute
+            self.trajectory_cache = self._init_trajectory_cache(config=self.config)
+            # Prepare a slot for a surrogate model of at-bat outcomes, which may be fitted to the
+            # at-bats of full-fidelity games and then used to play out games that are paid little
+            # attention, along with the observations of at-bats that it will be fitted to
+            self.at_bat_surrogate = None
+            self.at_bat_observations = []
+            # Prepare an append-only, on-disk log of the play-by-play of every game
+            self.play_log = PlayLog()
+            # Prepare a cache of box scores, which are composed only when they're asked for
+            self.box_score_cache = BoxScoreCache(max_size=self.config.box_score_cache_max_size)
+
+    @staticmethod
+    def _init_trajectory_cache(config):
+        """Return a new trajectory cache, as specified in config.py."""
+        return TrajectoryCache(
+            max_size=config.trajectory_cache_max_size,
+            exit_speed_resolution=config.trajectory_cache_exit_speed_resolution,
+            launch_angle_resolution=config.trajectory_cache_launch_angle_resolution
+        )
+
+    @staticmethod
+    def _init_thought_prototypes(config):
+        """Prepare the thought prototypes that the Thoughts class will supply thoughts from."""
         Thoughts.thought_prototypes = [
             ThoughtPrototype(tag=spec[0], likelihood=spec[1], preconditions=spec[2], effects=spec[3])
-            for spec in self.config.thought_prototype_specifications
+            for spec in config.thought_prototype_specifications
         ]
-        # Load the city data (specifies data about all cities that will eventually
-        # be established in this simulation)
-        self.city_data = CityData()
-        # Load the NLG module for this game instance, etc.
-        self.productionist = Productionist(game=self)
-        self.errors = []
-        self.problems = []
-        # This gets incremented each time a new person is born/generated,
-        # which affords a persistent ID for each person
-        self.current_person_id = 0
-        self.current_place_id = 0
-        # Determine whether baseball curses are real in this baseball cosmos
-        self.curses_are_real = random.random() < self.config.chance_baseball_curses_are_real
-        # Prepare attributes relating to time
-        # self.year = self.config.year_worldgen_begins
-        # self.true_year = self.config.year_worldgen_begins  # True year never gets changed during retconning
-        self.ordinal_date = datetime.date(*self.config.date_worldgen_begins).toordinal()  # N days since 01-01-0001
-        self.year = datetime.date(*self.config.date_worldgen_begins).year
-        self.true_year = self.year  # True year never gets changed during retconning
-        self.month = datetime.date(*self.config.date_worldgen_begins).month
-        self.day = datetime.date(*self.config.date_worldgen_begins).day
-        self.time_of_day = 'day'
-        self.date = self.get_date()
-        # Prepare a listing of all in-game events, which will facilitate debugging later
-        self.events = []
-        # A game's event number allows the precise ordering of events that
-        # happened on the same timestep -- every time an event happens, it requests an
-        # event number from Game.assign_event_number(), which also increments the running counter
-        self.event_number = -1
-        # Prepare a listing of all people born on each day -- this is used to
-        # age people on their birthdays; we start with (2, 29) initialized because
-        # we need to perform a check every March 1 to ensure that all leap-year babies
-        # celebrate their birthday that day on non-leap years
-        self.birthdays = {(2, 29): set()}
-        # Prepare a number that will hold a single random number that is generated daily -- this
-        # facilitates certain things that should be determined randomly but remain constant across
-        # a timestep, e.g., whether a person locked their door before leaving home
-        self.random_number_this_timestep = random.random()
-        # self.establish_setting()
-        # self._sim_and_save_a_week_of_timesteps()
-        self.weather = None
-        # Prepare geographic listings
-        self.countries = []
-        self.states = []
-        self.cities = []
-        # Instantiate a first country
-        Country(name='United States of America', cosmos=self)
-        # Prepare baseball-centric attributes
-        self.baseball_classifications = [
-            # TODO MAKE THIS BOTTOM-UP; HAVE AGENTS NEGOTIATE TO COMPOSE/MODIFY CLASSES
-            Class(cosmos=self, level='AAA'),
-            InformalPlay(cosmos=self)
-        ]
-        self.leagues = []  # Leagues based here
 
     @staticmethod
     def _init_cosmos_id():
@@ -93,6 +173,77 @@ class Cosmos(object):
         """Return string representation."""
         return "Baseball Cosmos {cosmos_id}".format(cosmos_id=self.id)
 
+    def __getstate__(self):
+        """Return the state of this cosmos that will be serialized when it is saved.
+
+        The config is excluded, since it's full of lambda expressions (which can't be serialized),
+        and anyway it can simply be reloaded upon restoration.
+        """
+        state = dict(self.__dict__)
+        del state['config']
+        return state
+
+    def __setstate__(self, state):
+        """Restore this cosmos from its serialized state."""
+        self.__dict__.update(state)
+        self.config = Config()
+
+    def save(self, path):
+        """Save a snapshot of this cosmos to the given path, so that it may later be restored by Cosmos.load().
+
+        The full object graph is written out as a compressed pickle, which represents objects that are
+        shared across the graph only once; the pickle is streamed straight to disk, rather than being
+        built up in memory first. The state of the random-number generator is saved too, so that a
+        restored cosmos will progress exactly as this one would have.
+        """
+        if self.debug:
+            print "Saving {self} to {path}...".format(self=self, path=path)
+        snapshot_file = gzip.open(path, 'wb', SNAPSHOT_COMPRESSION_LEVEL)
+        try:
+            _run_with_deep_recursion(
+                lambda: pickle.dump((random.getstate(), self), snapshot_file, pickle.HIGHEST_PROTOCOL)
+            )
+        finally:
+            snapshot_file.close()
+
+    @classmethod
+    def load(cls, path, restore_random_state=True):
+        """Restore a cosmos from a snapshot that was saved to the given path by Cosmos.save().
+
+        @param path: The path to the snapshot file.
+        @param restore_random_state: Whether to restore the state that the random-number generator
+                                     was in when the snapshot was saved; if this is True, the restored
+                                     cosmos will progress exactly as the original one would have.
+        """
+        # Thoughts reattach their effects from the thought prototypes as they are restored, so
+        # the prototypes need to be prepared before the object graph is loaded
+        cls._init_thought_prototypes(config=Config())
+        snapshot_file = gzip.open(path, 'rb')
+        try:
+            random_state, cosmos = _run_with_deep_recursion(lambda: pickle.load(snapshot_file))
+        finally:
+            snapshot_file.close()
+        if restore_random_state:
+            random.setstate(random_state)
+        if cosmos.debug:
+            print "Restored {cosmos} from {path}".format(cosmos=cosmos, path=path)
+        return cosmos
+
+    def fork(self, n_variants=1):
+        """Return a list of independent copies of this cosmos, all restored from a single snapshot of it.
+
+        The variants share no objects with this cosmos or with one another, and so each may be
+        modified (e.g., given a different league configuration) and progressed separately.
+        """
+        file_descriptor, path = tempfile.mkstemp(suffix='.cosmos')
+        os.close(file_descriptor)
+        try:
+            self.save(path=path)
+            variants = [Cosmos.load(path=path, restore_random_state=False) for _ in xrange(n_variants)]
+        finally:
+            os.remove(path)
+        return variants
+
     @property
     def people(self):
         """Return a list of all people living in the game world."""
@@ -100,17 +251,13 @@ class Cosmos(object):
 
     @property
     def residents(self):
-        """Return a list of all people living in the game world."""
-        residents = []
-        for country in self.countries:
-            residents += list(country.residents)
-        return residents
+        """Return all people living in the game world."""
+        return self.registry
 
     @property
     def random_person(self):
         """Return a random person living in this game world."""
-        random_country = random.choice(self.countries)
-        return random.choice(list(random_country.residents))
+        return self.registry.random_person()
 
     @property
     def major_league_team_nicknames(self):
@@ -129,34 +276,22 @@ class Cosmos(object):
         self.event_number += 1
         return self.event_number
 
-    @staticmethod
-    def get_random_day_of_year(year):
+    def get_random_day_of_year(self, year):
         """Return a randomly chosen day in the given year."""
         ordinal_date_on_jan_1_of_this_year = datetime.date(year, 1, 1).toordinal()
         ordinal_date = (
             ordinal_date_on_jan_1_of_this_year + random.randint(0, 365)
         )
-        datetime_object = datetime.date.fromordinal(ordinal_date)
-        month, day = datetime_object.month, datetime_object.day
+        _, month, day = self.calendar.ymd(ordinal_date=ordinal_date)
         return month, day, ordinal_date
 
     def get_date(self, ordinal_date=None):
-        """Return a pretty-printed date for ordinal date."""
+        """Return the (shared, lazily pretty-printed) date object for ordinal date."""
         if not ordinal_date:
             ordinal_date = self.ordinal_date
-        year = datetime.date.fromordinal(ordinal_date).year
-        month = datetime.date.fromordinal(ordinal_date).month
-        day = datetime.date.fromordinal(ordinal_date).day
-        month_ordinals_to_names = {
-            1: "January", 2: "February", 3: "March", 4: "April", 5: "May", 6: "June", 7: "July",
-            8: "August", 9: "September", 10: "October", 11: "November", 12: "December"
-        }
-        date = "{} of {} {}, {}".format(
-            # Note: for retconning, the time of day will always be whatever the actual time of day
-            # is at the beginning of the true simulation ("day", I assume), but this shouldn't matter
-            self.time_of_day.title(), month_ordinals_to_names[month], day, year
-        )
-        return date
+        # Note: for retconning, the time of day will always be whatever the actual time of day
+        # is at the beginning of the true simulation ("day", I assume), but this shouldn't matter
+        return self.calendar.date(ordinal_date=ordinal_date, time_of_day=self.time_of_day)
 
     def progress(self, until=None):
         """Progress the cosmos until the specified date."""
@@ -176,38 +311,84 @@ class Cosmos(object):
 
     def _advance_n_timesteps(self, n_timesteps=1):
         """Simulate the passing of a chunk of time at a lower fidelity than normal."""
-        for i in xrange(n_timesteps):
-            self._advance_time()
-            for l in self.leagues:
-                l.operate()
-            for city in self.cities:
-                if random.random() < 0.03:
-                    city.manipulate_population()
-                if random.random() < CHANCE_OF_A_DAY_BEING_SIMULATED:
-                    self._simulate_a_timestep_in_a_city(city)
+        instrumentation = self.instrumentation
+        with self.random_stream.activate():
+            for i in xrange(n_timesteps):
+                with instrumentation.span('advance time'):
+                    self._advance_time()
+                instrumentation.count('timesteps')
+                # If enough at-bats have been observed, fit a surrogate model to them; this is only done
+                # between timesteps, so that every game on a given day is played with the same model
+                # (or lack thereof), whether the games are played serially or across worker processes
+                threshold = self.config.number_of_at_bats_to_fit_an_at_bat_surrogate_from
+                if self.at_bat_surrogate is None and threshold and len(self.at_bat_observations) >= threshold:
+                    self.fit_at_bat_surrogate()
+                with instrumentation.span('operate leagues'):
+                    for l in self.leagues:
+                        l.operate()
+                cities_to_simulate = []
+                with instrumentation.span('manipulate population'):
+                    for work, city in self.scheduler.work_due_now():
+                        if work == 'manipulate population':
+                            with city.random_stream.activate():
+                                city.manipulate_population()
+                            instrumentation.count('population manipulations')
+                        else:  # work == 'simulate timestep'
+                            cities_to_simulate.append(city)
+                if cities_to_simulate:
+                    with instrumentation.span('simulate cities'):
+                        self._simulate_a_timestep_in_cities(cities=cities_to_simulate)
+
+    @property
+    def gathering_at_bat_observations(self):
+        """Return whether the at-bats of full-fidelity games are being observed, to fit a surrogate model to."""
+        return self.at_bat_surrogate is None and self.config.number_of_at_bats_to_fit_an_at_bat_surrogate_from
+
+    def observe_at_bats(self, game):
+        """Gather observations of the at-bats of the given full-fidelity game, which has just ended."""
+        self.at_bat_observations += collect_observations(games=[game])
+
+    def fit_at_bat_surrogate(self):
+        """Fit a surrogate model of at-bat outcomes to the at-bats observed so far, and install it.
+
+        From then on, games that are paid little attention are played out with at-bats whose outcomes
+        are sampled from this model (see Game._init_determine_fidelity()).
+        """
+        if self.debug:
+            print "Fitting a surrogate at-bat model to {} at-bats...".format(len(self.at_bat_observations))
+        self.at_bat_surrogate = AtBatSurrogate.fit(observations=self.at_bat_observations)
+        self.at_bat_observations = []
 
     def _advance_time(self):
         """Advance time of day and date, if it's a new day."""
+        self.scheduler.advance()
         self.time_of_day = "night" if self.time_of_day == "day" else "day"
         self.weather = random.choice(['good', 'bad'])
         if self.time_of_day == "day":
             self.ordinal_date += 1
-            new_date_tuple = datetime.date.fromordinal(self.ordinal_date)
-            if new_date_tuple.year != self.year:
+            year, month, day = self.calendar.ymd(ordinal_date=self.ordinal_date)
+            if year != self.year:
                 # Happy New Year
-                self.true_year = new_date_tuple.year
-                self.year = new_date_tuple.year
+                self.true_year = year
+                self.year = year
+                self.instrumentation.begin_year(self.year)
                 if self.debug:
                     print "Updating each city's nearest cities..."
                 for city in self.cities:
                     city.set_nearest_cities()
-            self.month = new_date_tuple.month
-            self.day = new_date_tuple.day
+            self.month = month
+            self.day = day
             self.date = self.get_date()
             if self.debug:
                 print self.date
+            if (self.month, self.day) == (1, 1):
+                with self.instrumentation.span('simulate cities in aggregate'):
+                    for city in list(self.cities):
+                        if city.demographics:
+                            city.simulate_a_year_in_aggregate()
             self._handle_any_birthdays_today()
-            self._handle_any_city_establishments_today()
+            with self.instrumentation.span('establish cities'):
+                self._handle_any_city_establishments_today()
         else:  # Nighttime
             self.date = self.get_date()
         # Lastly, set a new random number for this timestep
@@ -231,33 +412,56 @@ class Cosmos(object):
         """Establish any cities that have been prescribed to be established today."""
         if self.ordinal_date in self.city_data.ordinal_dates_of_city_establishment:
             for city_specification in self.city_data.ordinal_dates_of_city_establishment.get(self.ordinal_date, set()):
-                City(cosmos=self, specification=city_specification)
+                city = City(cosmos=self, specification=city_specification)
+                if not city.demographics:
+                    # Cities being simulated in aggregate only get scheduled once they're promoted
+                    self.scheduler.schedule_city(city)
+
+    def _simulate_a_timestep_in_cities(self, cities):
+        """Simulate a timestep in each of the given cities, in turn.
+
+        Moves between cities (e.g., for a job found through Business._find_candidate_from_another_city())
+        are carried out as soon as they're prompted, so that a city that is simulated later in the batch
+        sees them.
+        """
+        for city in cities:
+            # Each city draws from its own random-number stream, so that the outcome of simulating
+            # it doesn't depend on how many random numbers were drawn while simulating other cities
+            with city.random_stream.activate():
+                self._simulate_a_timestep_in_a_city(city)
 
     def _simulate_a_timestep_in_a_city(self, city):
         """Simulate a timestep in the given city."""
+        instrumentation = self.instrumentation
+        instrumentation.count('simulated city timesteps')
+        instrumentation.count('people touched', len(city.residents))
         if city.cosmos.debug:
             print "Simulating a {} in {}...".format(self.time_of_day, city.full_name)
         # Simulate birth, death, retirement, college, and moving out of parents
-        for person in list(city.residents):
-            if city.cosmos.debug:
-                print "\t...simulating birth..."
-            if person.pregnant and self.ordinal_date >= person.due_date:
-                person.give_birth()
-            if city.cosmos.debug:
-                print "\t...simulating death..."
-            if person.age > max(65, random.random() * 100):
-                person.die(cause_of_death="Natural causes")
-            if city.cosmos.debug:
-                print "\t...simulating retirement and degree conferment..."
-            elif person.occupation and person.age > max(65, random.random() * 100):
-                person.retire()
-            elif person.adult and not person.occupation:
-                if person.age > 22:
-                    person.college_graduate = True
-            if city.cosmos.debug:
-                print "\t...simulating new adults moving out..."
-            elif person.age > 18 and person not in person.home.owners:
-                person.move_out_of_parents_home()
+        with instrumentation.span('life events'):
+            for person in list(city.residents):
+                if person not in city.residents:  # They died or moved away earlier in this loop
+                    continue
+                if city.cosmos.debug:
+                    print "\t...simulating birth..."
+                if person.pregnant and self.ordinal_date >= person.due_date:
+                    person.give_birth()
+                if city.cosmos.debug:
+                    print "\t...simulating death..."
+                if person.age > max(65, random.random() * 100):
+                    person.die(cause_of_death="Natural causes")
+                    continue
+                if city.cosmos.debug:
+                    print "\t...simulating retirement and degree conferment..."
+                elif person.occupation and person.age > max(65, random.random() * 100):
+                    person.retire()
+                elif person.adult and not person.occupation:
+                    if person.age > 22:
+                        person.college_graduate = True
+                if city.cosmos.debug:
+                    print "\t...simulating new adults moving out..."
+                elif person.age > 18 and person not in person.home.owners:
+                    person.move_out_of_parents_home()
         days_since_last_simulated_day = self.ordinal_date-city.last_simulated_day
         # Reset all Relationship interacted_this_timestep attributes
         for person in list(city.residents):
@@ -266,33 +470,36 @@ class Cosmos(object):
         # Have people go to the location they will be at this timestep
         if city.cosmos.debug:
                 print "\t...enacting NPC routines..."
-        for person in list(city.residents):
-            person.routine.enact()
+        with instrumentation.span('enact routines'):
+            for person in list(city.residents):
+                person.routine.enact()
         # Simulate sex  TODO sex outside out marriage
         if city.cosmos.debug:
                 print "\t...simulating sex..."
-        for person in list(city.residents):
-            if person.marriage and person.spouse.home is person.home:
-                chance_they_are_trying_to_conceive_this_year = (
-                    self.config.function_to_determine_chance_married_couple_are_trying_to_conceive(
-                        n_kids=len(person.marriage.children_produced)
+        with instrumentation.span('sex'):
+            for person in list(city.residents):
+                if person.marriage and person.spouse.home is person.home:
+                    chance_they_are_trying_to_conceive_this_year = (
+                        self.config.function_to_determine_chance_married_couple_are_trying_to_conceive(
+                            n_kids=len(person.marriage.children_produced)
+                        )
                     )
-                )
-                chance_they_are_trying_to_conceive_this_year /= CHANCE_OF_A_DAY_BEING_SIMULATED*365
-                if random.random() < chance_they_are_trying_to_conceive_this_year:
-                    person.have_sex(partner=person.spouse, protection=False)
+                    chance_they_are_trying_to_conceive_this_year /= CHANCE_OF_A_DAY_BEING_SIMULATED*365
+                    if random.random() < chance_they_are_trying_to_conceive_this_year:
+                        person.have_sex(partner=person.spouse, protection=False)
         # Have people observe their surroundings, which will cause knowledge to
         # build up, and have them socialize with other people also at that location --
         # this will cause relationships to form/progress and knowledge to propagate
         if city.cosmos.debug:
                 print "\t...simulating social interactions..."
-        for person in list(city.residents):
-            if person.age > 3:
-                # person.observe()
-                person.socialize(
-                    missing_timesteps_to_account_for=days_since_last_simulated_day*2,
-                    propagate_knowledge=False
-                )
+        with instrumentation.span('socialize'):
+            for person in list(city.residents):
+                if person.age > 3:
+                    # person.observe()
+                    person.socialize(
+                        missing_timesteps_to_account_for=days_since_last_simulated_day*2,
+                        propagate_knowledge=False
+                    )
         city.last_simulated_day = self.ordinal_date
 
     def find_by_hex(self, hex_value):
@@ -306,4 +513,30 @@ class Cosmos(object):
             )
             return person
         except StopIteration:
-            raise Exception('There is no one with that hex ID')
\ No newline at end of file
+            raise Exception('There is no one with that hex ID')
+
+
+def _run_with_deep_recursion(function):
+    """Call the given function in a thread with a big stack and a high recursion limit, and return its result."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = function()
+        except BaseException:
+            outcome['error'] = sys.exc_info()
+
+    original_recursion_limit = sys.getrecursionlimit()
+    original_stack_size = threading.stack_size(SNAPSHOT_THREAD_STACK_SIZE)
+    sys.setrecursionlimit(SNAPSHOT_RECURSION_LIMIT)
+    try:
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+    finally:
+        sys.setrecursionlimit(original_recursion_limit)
+        threading.stack_size(original_stack_size)
+    if 'error' in outcome:
+        error_type, error, traceback = outcome['error']
+        raise error_type, error, traceback
+    return outcome['result']
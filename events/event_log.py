@@ -0,0 +1,232 @@
+import os
+import gzip
+import shutil
+import weakref
+import tempfile
+import collections
+import cPickle as pickle
+
+
+class EventLog(object):
+    """A store for all the events that happen in a cosmos, which keeps only recent events in memory.
+
+    Events are appended in the order of their event numbers. Once more than a set number of events
+    are being held in memory, the oldest ones are spilled, a segment at a time, into append-only
+    files on disk, which hold a compact record of each event (its number, type, date, and description).
+    The log itself then no longer keeps those events alive; if nothing else in the cosmos references
+    a spilled event, it will be garbage collected, and requests for it will be answered by a lazy
+    SpilledEvent handle that loads its record from disk on demand. Spilled events are indexed
+    by event number, year, and type, so that history queries keep working.
+    """
+
+    def __init__(self, max_resident_events=100000, segment_size=25000, directory=None):
+        """Initialize an EventLog object.
+
+        @param max_resident_events: The maximum number of recent events to hold in memory; if this
+                                    is None, no events will ever be spilled to disk.
+        @param segment_size: The number of events to spill into each on-disk segment.
+        @param directory: The directory to write segments into; if this is None, a temporary
+                          directory will be created the first time a segment is spilled.
+        """
+        self.max_resident_events = max_resident_events
+        self.segment_size = segment_size
+        self.directory = directory
+        # The events currently held in memory, which are always the most recent ones
+        self.resident_events = collections.deque()
+        # The number of events that have been spilled to disk, which will always be the event
+        # number of the earliest resident event (since event numbers start at 0)
+        self.number_of_spilled_events = 0
+        # Paths to the segments on disk, in order; segment i holds the events numbered
+        # i*segment_size through (i+1)*segment_size-1
+        self.segment_paths = []
+        # Indices mapping years and event types to the numbers of spilled events
+        self.spilled_event_numbers_by_year = {}
+        self.spilled_event_numbers_by_type = {}
+        # Spilled events that are still alive elsewhere in the cosmos can still be handed out
+        self.live_spilled_events = weakref.WeakValueDictionary()
+        # The most recently loaded segment, which is cached because queries tend to be local
+        self._loaded_segment_number = None
+        self._loaded_segment = None
+
+    def __len__(self):
+        """Return the number of events in this log."""
+        return self.number_of_spilled_events + len(self.resident_events)
+
+    def __iter__(self):
+        """Iterate over all events in this log, in order."""
+        for event_number in xrange(self.number_of_spilled_events):
+            yield self.get(event_number)
+        for event in list(self.resident_events):
+            yield event
+
+    def __getitem__(self, event_number):
+        """Return the event with the given event number."""
+        return self.get(event_number)
+
+    def __getstate__(self):
+        """Return the state of this log that will be serialized when the cosmos is saved.
+
+        The records of spilled events are included, so that the snapshot does not depend on the
+        segment files on disk; __setstate__() writes them out again into a new directory.
+        """
+        state = dict(self.__dict__)
+        state['spilled_records'] = [self._load_segment(i) for i in xrange(len(self.segment_paths))]
+        state['segment_paths'] = []
+        state['directory'] = None
+        state['live_spilled_events'] = None
+        state['_loaded_segment_number'] = None
+        state['_loaded_segment'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore this log from its serialized state."""
+        spilled_records = state.pop('spilled_records')
+        self.__dict__.update(state)
+        self.live_spilled_events = weakref.WeakValueDictionary()
+        # Rebuild the segments and their indices from scratch
+        self.number_of_spilled_events = 0
+        self.spilled_event_numbers_by_year = {}
+        self.spilled_event_numbers_by_type = {}
+        for records in spilled_records:
+            self._write_segment(records=records)
+
+    def append(self, event):
+        """Append an event to this log, spilling the oldest resident events to disk if need be."""
+        self.resident_events.append(event)
+        if self.max_resident_events is not None and len(self.resident_events) > self.max_resident_events:
+            self._spill_a_segment()
+
+    def get(self, event_number):
+        """Return the event with the given event number.
+
+        If this event has been spilled and is no longer alive in memory, a SpilledEvent handle for
+        it will be returned.
+        """
+        if not 0 <= event_number < len(self):
+            raise IndexError("There is no event with event number {}".format(event_number))
+        if event_number >= self.number_of_spilled_events:
+            return self.resident_events[event_number-self.number_of_spilled_events]
+        live_event = self.live_spilled_events.get(event_number)
+        if live_event is not None:
+            return live_event
+        return SpilledEvent(event_log=self, event_number=event_number)
+
+    def events_in_year(self, year):
+        """Return all events that happened in the given year, in order."""
+        spilled = [self.get(n) for n in self.spilled_event_numbers_by_year.get(year, [])]
+        return spilled + [event for event in self.resident_events if event.year == year]
+
+    def events_of_type(self, event_type):
+        """Return all events of the given type, in order.
+
+        @param event_type: The event class, or the name of the event class, in question.
+        """
+        if not isinstance(event_type, basestring):
+            event_type = event_type.__name__
+        spilled = [self.get(n) for n in self.spilled_event_numbers_by_type.get(event_type, [])]
+        return spilled + [event for event in self.resident_events if event.__class__.__name__ == event_type]
+
+    def record(self, event_number):
+        """Return the on-disk record for a spilled event."""
+        segment_number = event_number // self.segment_size
+        return self._load_segment(segment_number)[event_number % self.segment_size]
+
+    def _spill_a_segment(self):
+        """Spill the oldest resident events into a new segment on disk."""
+        records = []
+        for _ in xrange(self.segment_size):
+            event = self.resident_events.popleft()
+            records.append(self._compose_record(event=event))
+            self.live_spilled_events[event.event_number] = event
+        self._write_segment(records=records)
+
+    def _write_segment(self, records):
+        """Write the given event records to a new segment on disk, and index them."""
+        if not self.directory:
+            self.directory = tempfile.mkdtemp(prefix='event_log_')
+        path = os.path.join(self.directory, 'segment_{:06d}.events'.format(len(self.segment_paths)))
+        segment_file = gzip.open(path, 'wb')
+        try:
+            pickle.dump(records, segment_file, pickle.HIGHEST_PROTOCOL)
+        finally:
+            segment_file.close()
+        self.segment_paths.append(path)
+        for record in records:
+            self.spilled_event_numbers_by_year.setdefault(record.year, []).append(record.event_number)
+            self.spilled_event_numbers_by_type.setdefault(record.event_type, []).append(record.event_number)
+        self.number_of_spilled_events += len(records)
+
+    def _load_segment(self, segment_number):
+        """Load the records in a segment on disk."""
+        if segment_number != self._loaded_segment_number:
+            segment_file = gzip.open(self.segment_paths[segment_number], 'rb')
+            try:
+                self._loaded_segment = pickle.load(segment_file)
+            finally:
+                segment_file.close()
+            self._loaded_segment_number = segment_number
+        return self._loaded_segment
+
+    @staticmethod
+    def _compose_record(event):
+        """Return a compact record of an event, to be written to disk."""
+        try:
+            description = str(event)
+        except Exception:  # Some events can't describe themselves once the world has moved on
+            description = event.__class__.__name__
+        return EventRecord(
+            event_number=event.event_number, event_type=event.__class__.__name__, year=event.year,
+            ordinal_date=event.ordinal_date, time_of_day=event.time_of_day, description=description
+        )
+
+    def delete_segments(self):
+        """Delete this log's segments on disk; spilled events will no longer be retrievable afterward."""
+        if self.directory and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.segment_paths = []
+
+
+EventRecord = collections.namedtuple(
+    'EventRecord', ['event_number', 'event_type', 'year', 'ordinal_date', 'time_of_day', 'description']
+)
+
+
+class SpilledEvent(object):
+    """A lazy handle for an event that has been spilled to disk by an EventLog."""
+
+    def __init__(self, event_log, event_number):
+        """Initialize a SpilledEvent object."""
+        self.event_log = event_log
+        self.event_number = event_number
+        self._record = None
+
+    def __str__(self):
+        """Return string representation."""
+        return self.record.description
+
+    @property
+    def record(self):
+        """Return the on-disk record of this event, loading it if necessary."""
+        if self._record is None:
+            self._record = self.event_log.record(event_number=self.event_number)
+        return self._record
+
+    @property
+    def event_type(self):
+        """Return the name of the class of this event."""
+        return self.record.event_type
+
+    @property
+    def year(self):
+        """Return the year this event happened."""
+        return self.record.year
+
+    @property
+    def ordinal_date(self):
+        """Return the ordinal date on which this event happened."""
+        return self.record.ordinal_date
+
+    @property
+    def time_of_day(self):
+        """Return the time of day at which this event happened."""
+        return self.record.time_of_day
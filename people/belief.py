@@ -2523,6 +2523,10 @@ class Facet(str):
         """Do str stuff."""
         return str.__new__(cls, value)
 
+    def __getnewargs__(self):
+        """Return the arguments with which to call __new__() when unpickling (only the value matters)."""
+        return (str(self), None, None, None, None, None)
+
     @property
     def accurate(self):
         """Return whether this belief is accurate."""
@@ -199,4 +199,8 @@ class Feature(float):
 
     def __new__(cls, value, inherited_from):
         """Do float stuff."""
-        return float.__new__(cls, value)
\ No newline at end of file
+        return float.__new__(cls, value)
+
+    def __getnewargs__(self):
+        """Return the arguments with which to call __new__() when unpickling (only the value matters)."""
+        return (float(self), None)
\ No newline at end of file
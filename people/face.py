@@ -332,4 +332,8 @@ class Feature(str):
 
     def __new__(cls, value, variant_id, inherited_from, exact_variant_inherited):
         """Do str stuff."""
-        return str.__new__(cls, value)
\ No newline at end of file
+        return str.__new__(cls, value)
+
+    def __getnewargs__(self):
+        """Return the arguments with which to call __new__() when unpickling (only the value matters)."""
+        return (str(self), None, None, None)
\ No newline at end of file
@@ -33,6 +33,10 @@ class Name(str):
         """Do str stuff."""
         return str.__new__(cls, value)
 
+    def __getnewargs__(self):
+        """Return the arguments with which to call __new__() when unpickling (only the value matters)."""
+        return (str(self), None, None, None)
+
     def _get_ethnicity_of_this_name(self):
         """Return the ethnicity of this name.
 
@@ -34,8 +34,6 @@ class Person(object):
         self.birth = birth
         if birth:
             self.city = self.birth.city
-            if self.city:
-                self.city.residents.add(self)
             # Set parents
             self.biological_mother = birth.biological_mother
             self.mother = birth.mother
@@ -97,6 +95,10 @@ class Person(object):
         self.commissioner = None
         self.team_owner = None
         self.umpire = None
+        # Now that we know whether this person has a baseball-player layer, register them as a resident
+        # of their city (this matters to the population registries, which keep track of players)
+        if self.birth and self.city:
+            self.city.residents.add(self)
         # Prepare name attributes that get set by event.Birth._name_baby() (or PersonExNihilo._init_name())
         self.first_name = None
         self.middle_name = None
@@ -1762,7 +1764,7 @@ class Person(object):
         # TODO make this reasoning more interesting
         # If you're desperate, just randomly choose a city somewhere in the cosmos
         if desperate:
-            return random.choice(self.cosmos.cities)
+            return random.choice([c for c in self.cosmos.cities if not c.demographics])
         if any(c for c in pool if c.underpopulated):
             city_to_move_to = random.choice([c for c in pool if c.underpopulated])
         else:
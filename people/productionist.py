@@ -29,6 +29,17 @@ class Productionist(object):
         # will need in order to inherit all the mark-up of these symbols
         self.symbols_expanded_to_produce_the_dialogue_template = set()
 
+    def __getstate__(self):
+        """Return the state of this object that will be serialized when the cosmos is saved.
+
+        The grammar is excluded, since it never changes and can simply be parsed again by __setstate__().
+        """
+        return {'game': self.game, 'debug': self.debug}
+
+    def __setstate__(self, state):
+        """Restore this object from its serialized state."""
+        self.__init__(game=state['game'], debug=state['debug'])
+
     @staticmethod
     def _init_parse_json_grammar_specification():
         """Parse a JSON grammar specification exported by Expressionist to instantiate symbols and rules."""
@@ -22,6 +22,23 @@ class Thought(Event):
             date=self.date[0].lower()+self.date[1:]
         )
 
+    def __getstate__(self):
+        """Return the state of this thought that will be serialized when the cosmos is saved.
+
+        Effects are lambda expressions, which can't be serialized, so they get excluded here and
+        then retrieved again from this thought's prototype by __setstate__().
+        """
+        state = dict(self.__dict__)
+        del state['effects']
+        return state
+
+    def __setstate__(self, state):
+        """Restore this thought from its serialized state."""
+        self.__dict__.update(state)
+        self.effects = next(
+            prototype.effects for prototype in Thoughts.thought_prototypes if prototype.tag == self.tag
+        )
+
     def execute(self):
         """Register the effects of this thought on its thinker."""
         for effect in self.effects:
@@ -3,6 +3,8 @@ import heapq
 import random
 from scipy import spatial
 from city_planning import CityPlan
+from places.registry import PopulationRegistry, ResidentSet
+from places.demographics import AggregatePopulation
 from people.business import *
 from people.person import PersonExNihilo
 from utils import utilities
@@ -28,13 +30,19 @@ class City(object):
         self.longitude = -specification.longitude  # Convert to a positive float (makes distance calculation easier)
         self.coordinates = self.latitude, self.longitude
         self.true_yearly_populations = specification.yearly_populations
+        # Prepare this city's own stream of random numbers, which it will draw from whenever it is
+        # simulated (its key is the number of cities established before it, which is deterministic)
+        self.random_stream = self.cosmos.random_stream.spawn('city', len(self.cosmos.cities))
         # Update geographic listings
         self.state.cities.append(self)
         self.country.cities.append(self)
         self.cosmos.cities.append(self)
         # Prepare various listings
         self.settlers = set()  # First people to live in this city
-        self.residents = set()
+        # Prepare a registry of the people living here, which is kept up to date by the resident
+        # set and which passes changes along to the registries of the state, country, and cosmos
+        self.registry = PopulationRegistry(parent=self.state.registry)
+        self.residents = ResidentSet(registry=self.registry)
         self.departed = set()  # People who left the city (i.e., left the simulation)
         self.deceased = set()  # People who died in in the city
         self.companies = set()
@@ -45,26 +53,15 @@ class City(object):
         self.teams = set()
         self.former_teams = set()
         self.leagues = []  # Leagues based here
-        # Generate a city plan
-        city_plan = None
-        print "\t...devising its city plan..."
-        while not city_plan:
-            city_plan = CityPlan(city=self)
-        while len(city_plan.tracts) < 2:
-            print "Re-rolling on a city plan for {} (not enough tracts)".format(self.full_name)
-            city_plan = CityPlan(city=self)
-        print "\t...establishing a city infrastructure..."
+        # Prepare attributes pertaining to the city's infrastructure, which get set by
+        # _init_build_infrastructure() once this city is simulated at full detail
         self.distances_between_lots = {}  # Maps (lot1, lot2) tuples to distance between them; built up lazily
-        self.streets = city_plan.streets
-        self.parcels = city_plan.parcels
-        self.lots = city_plan.lots
-        self.tracts = city_plan.tracts
-        for lot in self.lots | self.tracts:
-            lot.set_neighboring_lots()
-            lot.init_generate_address()
-        city_plan.determine_conventional_city_blocks()
-        self.blocks = city_plan.blocks
-        self.downtown = self._init_determine_downtown_lot()
+        self.streets = set()
+        self.parcels = set()
+        self.lots = set()
+        self.tracts = set()
+        self.blocks = set()
+        self.downtown = None
         self.mayor = None  # Currently being set by _init_get_established()
         self.last_simulated_day = self.cosmos.ordinal_date
         # These get set when these businesses get established (by their __init__() magic methods)
@@ -75,6 +72,9 @@ class City(object):
         self.police_station = None
         self.school = None
         self.university = None
+        # If this is a minor city, it will be simulated as an aggregate demographic model until
+        # it gets promoted to full detail (see promote())
+        self.demographics = None
         # This gets set by a call to set_ten_nearest_cities() upon new cities getting established
         self.nearest_cities = []
         self.set_nearest_cities()  # Necessary to do now so that people from other cities may start businesses here
@@ -83,8 +83,37 @@ class City(object):
         self.minimal_infrastructure = False
         self.overpopulated = False
         self.underpopulated = True
-        # Establish the city -- have people move in and start up businesses
-        self._init_get_established()
+        if self.cosmos.config.simulate_minor_cities_in_aggregate and self.minor:
+            print "\t...modeling its population in aggregate..."
+            self.demographics = AggregatePopulation(city=self)
+            # Nobody will move here while this city is simulated in aggregate
+            self.underpopulated = False
+        else:
+            self._init_build_infrastructure()
+            # Establish the city -- have people move in and start up businesses
+            self._init_get_established()
+
+    def _init_build_infrastructure(self):
+        """Devise a city plan and build out this city's infrastructure."""
+        # Generate a city plan
+        city_plan = None
+        print "\t...devising its city plan..."
+        while not city_plan:
+            city_plan = CityPlan(city=self)
+        while len(city_plan.tracts) < 2:
+            print "Re-rolling on a city plan for {} (not enough tracts)".format(self.full_name)
+            city_plan = CityPlan(city=self)
+        print "\t...establishing a city infrastructure..."
+        self.streets = city_plan.streets
+        self.parcels = city_plan.parcels
+        self.lots = city_plan.lots
+        self.tracts = city_plan.tracts
+        for lot in self.lots | self.tracts:
+            lot.set_neighboring_lots()
+            lot.init_generate_address()
+        city_plan.determine_conventional_city_blocks()
+        self.blocks = city_plan.blocks
+        self.downtown = self._init_determine_downtown_lot()
 
     def _init_determine_downtown_lot(self):
         """Return the lot located among the greatest density of lots."""
@@ -216,18 +245,25 @@ class City(object):
     @property
     def random_person(self):
         """Return a random person living in this city."""
-        return random.choice(list(self.residents))
+        return self.registry.random_person()
 
     @property
     def pop(self):
         """Return the number of NPCs living in the city."""
-        return len(self.residents)
+        return self.population
 
     @property
     def population(self):
         """Return the number of NPCs living in the city."""
+        if self.demographics:
+            return self.demographics.population
         return len(self.residents)
 
+    @property
+    def minor(self):
+        """Return whether this is a minor city this year."""
+        return self.true_yearly_populations[self.cosmos.year] == -99
+
     @property
     def vacant_lots(self):
         """Return all vacant lots in the city."""
@@ -263,17 +299,7 @@ class City(object):
     @property
     def free_agents(self):
         """Return all the baseball players in this city that are not under contract."""
-        free_agents = {
-            resident.player for resident in self.residents if resident.player and
-            not resident.player.career.retired and
-            not resident.player.career.team
-        }
-        for player in free_agents:
-            if player.career.retired:
-                free_agents.remove(player)
-            elif player.career.team and player in player.career.team.players:
-                free_agents.remove(player)
-        return free_agents
+        return self.registry.free_agents
 
     def distance_to(self, city):
         """Return the (approximate) Euclidean distance between another city and this one, in miles."""
@@ -299,6 +325,37 @@ class City(object):
         ]
         return businesses_of_this_type
 
+    def promote(self):
+        """Promote this city from being simulated as an aggregate demographic model to full detail.
+
+        This is called when a city gains a baseball team or a ballpark, when it becomes a major city,
+        or whenever a player's attention turns to it. At that point, the city gets its infrastructure
+        and gets established like any other city, and then it grows toward the population that its
+        aggregate model had reached.
+        """
+        if not self.demographics:
+            return
+        aggregate_population = self.demographics.population
+        self.demographics = None
+        print "Promoting {} to full detail".format(self.full_name)
+        with self.random_stream.activate():
+            self._init_build_infrastructure()
+            self._init_get_established()
+            self.underpopulated = True
+            growth_attempts_left = self.cosmos.config.max_number_of_growth_attempts_when_a_minor_city_is_promoted
+            while self.population < aggregate_population and growth_attempts_left:
+                self._cause_population_growth()
+                growth_attempts_left -= 1
+        self.cosmos.scheduler.schedule_city(self)
+
+    def simulate_a_year_in_aggregate(self):
+        """Advance this city's aggregate demographic model by a year, promoting it if it has become a major city."""
+        if not self.minor:
+            self.promote()
+            return
+        with self.random_stream.activate():
+            self.demographics.advance_year()
+
     def manipulate_population(self):
         """Attempt to manipulate the population of this city to reflect its true population this year."""
         if self.true_yearly_populations[self.cosmos.year] == -99:  # Minor city
@@ -1,4 +1,5 @@
-import random
+from places.registry import PopulationRegistry
+from baseball.market import FreeAgentMarket
 
 
 class Country(object):
@@ -8,6 +9,9 @@ class Country(object):
         """Instantiate a country object."""
         self.name = name
         self.cosmos = cosmos
+        # Prepare a registry of the people living in this country, which the registries of its
+        # states (and in turn their cities) will keep up to date
+        self.registry = PopulationRegistry(parent=cosmos.registry)
         self.states, self.federal_district = self._init_states_and_federal_district()
         self.capital = self.federal_district
         self.cities = []
@@ -54,10 +58,7 @@ class Country(object):
     @property
     def residents(self):
         """Return all residents of this country."""
-        residents = []
-        for state in self.states+[self.federal_district]:
-            residents += state.residents
-        return residents
+        return self.registry
 
     @property
     def deceased(self):
@@ -70,8 +71,7 @@ class Country(object):
     @property
     def population(self):
         """Return the number of NPCs living in this country."""
-        pop = sum(state.pop for state in self.states+[self.federal_district])
-        return pop
+        return len(self.registry)
 
     @property
     def pop(self):
@@ -81,22 +81,12 @@ class Country(object):
     @property
     def random_person(self):
         """Return a random person living in this country."""
-        return random.choice(list(self.residents))
+        return self.registry.random_person()
 
     @property
     def free_agents(self):
         """Return all the baseball players in this country that are not under contract."""
-        free_agents = {
-            resident.player for resident in self.residents if resident.player and
-            not resident.player.career.retired and
-            not resident.player.career.team
-        }
-        for player in free_agents:
-            if player.career.retired:
-                free_agents.remove(player)
-            elif player.career.team and player in player.career.team.players:
-                free_agents.remove(player)
-        return free_agents
+        return self.registry.free_agents
 
 
 class State(object):
@@ -106,6 +96,7 @@ class State(object):
         self.name = name
         self.cosmos = country.cosmos
         self.country = country
+        self.registry = PopulationRegistry(parent=country.registry)
         self.cities = []  # Gets appended to by establish_cities, which gets called each year by Country
         # Prepare baseball-centric attributes
         self.leagues = []  # Leagues based here
@@ -124,10 +115,7 @@ class State(object):
     @property
     def residents(self):
         """Return all residents of this state."""
-        residents = []
-        for city in self.cities:
-            residents += city.residents
-        return residents
+        return self.registry
 
     @property
     def deceased(self):
@@ -140,8 +128,7 @@ class State(object):
     @property
     def population(self):
         """Return all the NPCs living in this state."""
-        pop = sum(city.pop for city in self.cities)
-        return pop
+        return len(self.registry)
 
     @property
     def pop(self):
@@ -151,22 +138,32 @@ class State(object):
     @property
     def random_person(self):
         """Return a random person living in this state."""
-        return random.choice(list(self.residents))
+        return self.registry.random_person()
 
     @property
     def free_agents(self):
         """Return all the baseball players in this state that are not under contract."""
-        free_agents = {
-            resident.player for resident in self.residents if resident.player and
-            not resident.player.career.retired and
-            not resident.player.career.team
-        }
-        for player in free_agents:
-            if player.career.retired:
-                free_agents.remove(player)
-            elif player.career.team and player in player.career.team.players:
-                free_agents.remove(player)
-        return free_agents
+        return self.registry.free_agents
+
+    @property
+    def free_agent_market(self):
+        """Return the market of free agents in this state, building it the first time it's needed."""
+        if self.registry.market is None:
+            self.registry.market = FreeAgentMarket(registry=self.registry, cosmos=self.cosmos)
+        return self.registry.market
+
+    @property
+    def city_with_the_most_aggregate_prospects(self):
+        """Return the city in this state being simulated in aggregate that has the most prospects, if any."""
+        city_with_the_most_prospects = None
+        most_prospects = 0
+        for city in self.cities:
+            if city.demographics:
+                number_of_prospects = sum(city.demographics.prospects.itervalues())
+                if number_of_prospects > most_prospects:
+                    city_with_the_most_prospects = city
+                    most_prospects = number_of_prospects
+        return city_with_the_most_prospects
 
 
 class FederalDistrict(State):
@@ -0,0 +1,124 @@
+import random
+from collections import Counter
+
+
+class AggregatePopulation(object):
+    """An aggregate demographic model of the population of a city that is being simulated at low detail.
+
+    Most of the cities in a cosmos are minor cities that never matter to baseball, and simulating
+    each of them as a full-fledged town (with Person objects, routines, relationships, and mental
+    models) is where most of the time and memory of worldgen would otherwise go. A city that has no
+    baseball team, no ballpark, and no player attention instead keeps just the counts of its people
+    by birth year, sex, and occupation, which get advanced once a year by rates that mirror the ones
+    the full simulation produces. Males of playing age are tracked as prospects, which the baseball
+    layer can look at without the city having to be promoted to full detail.
+    """
+
+    def __init__(self, city):
+        """Initialize an AggregatePopulation object.
+
+        @param city: The city whose population this models.
+        """
+        self.city = city
+        # Maps (birth year, sex, occupation) cohorts to the number of people in them; occupation
+        # is an Occupation subclass, or None for children, retirees, and the unemployed
+        self.cohorts = Counter()
+        # Tallies of what's happened in this population over the years
+        self.number_of_births = 0
+        self.number_of_deaths = 0
+        self.number_of_departures = 0
+        self._have_settlers_arrive(n=city.cosmos.config.desired_maximum_number_of_npcs_in_minor_cities)
+
+    def __len__(self):
+        """Return the number of people in this population."""
+        return sum(self.cohorts.itervalues())
+
+    @property
+    def population(self):
+        """Return the number of people in this population."""
+        return len(self)
+
+    @property
+    def prospects(self):
+        """Return a dictionary mapping birth years to the number of males of playing age born in them."""
+        youngest, oldest = self.city.cosmos.config.age_range_of_prospects_in_aggregate_minor_cities
+        year = self.city.cosmos.year
+        prospects = Counter()
+        for (birth_year, sex, _), count in self.cohorts.iteritems():
+            if sex == 'male' and youngest <= year-birth_year <= oldest:
+                prospects[birth_year] += count
+        return prospects
+
+    def _have_settlers_arrive(self, n):
+        """Have n settlers (of working age) arrive in this population."""
+        year = self.city.cosmos.year
+        for _ in xrange(n):
+            birth_year = year - random.randint(18, 55)
+            sex = random.choice(('male', 'female'))
+            self.cohorts[(birth_year, sex, self._choose_an_occupation())] += 1
+
+    def _choose_an_occupation(self):
+        """Return an occupation, chosen according to the frequencies specified in config.py."""
+        occupations_and_frequencies = self.city.cosmos.config.occupations_in_aggregate_minor_cities
+        x = random.random() * sum(frequency for _, frequency in occupations_and_frequencies)
+        for occupation, frequency in occupations_and_frequencies:
+            x -= frequency
+            if x < 0:
+                return occupation
+        return occupations_and_frequencies[-1][0]
+
+    def _sorted_cohorts(self):
+        """Return this population's cohorts in a deterministic order.
+
+        Occupations are classes, which hash by memory address, so iterating over the cohorts
+        directly would draw random numbers in a different order from run to run.
+        """
+        return sorted(
+            self.cohorts, key=lambda cohort: (cohort[0], cohort[1], cohort[2].__name__ if cohort[2] else '')
+        )
+
+    def advance_year(self):
+        """Advance this population by a year (births, deaths, retirements, new adults, and departures)."""
+        config = self.city.cosmos.config
+        year = self.city.cosmos.year
+        # The full simulation decides whether someone dies (or retires) on each timestep that
+        # their city is simulated, so we compound that per-timestep chance over the number of
+        # timesteps a city gets simulated on in a year, on average
+        number_of_simulated_timesteps_per_year = 2 * 365 * config.chance_of_a_timestep_being_simulated
+        updated_cohorts = Counter()
+        for birth_year, sex, occupation in self._sorted_cohorts():
+            count = self.cohorts[(birth_year, sex, occupation)]
+            age = year - birth_year
+            if age > 65:
+                chance_of_death_or_retirement = 1 - (1 - min(1.0, age/100.)) ** number_of_simulated_timesteps_per_year
+            else:
+                chance_of_death_or_retirement = 0.0
+            for _ in xrange(count):
+                if random.random() < chance_of_death_or_retirement:
+                    self.number_of_deaths += 1
+                    continue
+                new_occupation = occupation
+                if occupation and random.random() < chance_of_death_or_retirement:
+                    new_occupation = None  # Retirement
+                elif not occupation and age == 18:
+                    new_occupation = self._choose_an_occupation()
+                if sex == 'female' and 18 <= age <= 45:
+                    if random.random() < config.chance_a_woman_gives_birth_some_year_in_an_aggregate_minor_city:
+                        updated_cohorts[(year, random.choice(('male', 'female')), None)] += 1
+                        self.number_of_births += 1
+                updated_cohorts[(birth_year, sex, new_occupation)] += 1
+        self.cohorts = updated_cohorts
+        # Like a full-detail minor city, keep this population near the desired maximum for minor
+        # cities, by having people (adults) leave town or, if everyone's gone, settlers arrive
+        if not self.cohorts:
+            self._have_settlers_arrive(n=config.desired_maximum_number_of_npcs_in_minor_cities)
+        number_of_people_to_leave = len(self) - config.desired_maximum_number_of_npcs_in_minor_cities
+        adult_cohorts = [cohort for cohort in self._sorted_cohorts() if year-cohort[0] >= 18]
+        while number_of_people_to_leave > 0 and adult_cohorts:
+            cohort = random.choice(adult_cohorts)
+            self.cohorts[cohort] -= 1
+            if not self.cohorts[cohort]:
+                del self.cohorts[cohort]
+                adult_cohorts.remove(cohort)
+            self.number_of_departures += 1
+            number_of_people_to_leave -= 1
@@ -0,0 +1,156 @@
+import random
+
+
+class PopulationRegistry(object):
+    """An incrementally maintained registry of the people living in some place.
+
+    Registries are nested (city, state, country, cosmos), and each one passes the people who
+    are added to or removed from it up to its parent. People are held in an indexable array,
+    with a mapping from each person to their position in the array, so that counting, membership
+    checks, additions, removals (which swap in the last person), and random sampling are all O(1).
+    """
+
+    def __init__(self, parent=None):
+        """Initialize a PopulationRegistry object.
+
+        @param parent: The registry of the place that encloses this one, if any.
+        """
+        self.parent = parent
+        self.people = []
+        self.positions = {}  # Maps each person to their index in self.people
+        # People who have a baseball-player layer
+        self.players = set()
+        # The people here who are baseball free agents, held like self.people is, so that they may
+        # be counted and sampled in O(1); kept up to date as people come and go, and as players
+        # sign, are released, and retire (see update_free_agency())
+        self.free_agent_people = []
+        self.free_agent_positions = {}
+        # A market that ranks the free agents here by how scouts would grade them (see baseball.market);
+        # this is only built for the places that scouts search, and isn't saved in snapshots
+        self.market = None
+
+    def __len__(self):
+        """Return the number of people in this registry."""
+        return len(self.people)
+
+    def __contains__(self, person):
+        """Return whether the given person is in this registry."""
+        return person in self.positions
+
+    def __iter__(self):
+        """Iterate over the people in this registry.
+
+        This iterates over a copy, so that people may move or die while it's being iterated over.
+        """
+        return iter(list(self.people))
+
+    def __nonzero__(self):
+        """Return whether anyone is in this registry."""
+        return bool(self.people)
+
+    def __getstate__(self):
+        """Return the state of this registry that will be serialized when the cosmos is saved."""
+        state = dict(self.__dict__)
+        state['market'] = None
+        return state
+
+    def add(self, person):
+        """Add a person to this registry and to its ancestors."""
+        if person in self.positions:
+            return
+        self.positions[person] = len(self.people)
+        self.people.append(person)
+        if person.player:
+            self.players.add(person)
+            if self.free_agent_people is not None and person.player.free_agent:
+                self._add_free_agent(person)
+        if self.parent is not None:
+            self.parent.add(person)
+
+    def remove(self, person):
+        """Remove a person from this registry and from its ancestors."""
+        position = self.positions.pop(person)
+        last_person = self.people.pop()
+        if last_person is not person:
+            # Move the last person into the vacated position
+            self.people[position] = last_person
+            self.positions[last_person] = position
+        self.players.discard(person)
+        if self.free_agent_positions and person in self.free_agent_positions:
+            self._remove_free_agent(person)
+        if self.parent is not None:
+            self.parent.remove(person)
+
+    def update_free_agency(self, person):
+        """Bring the listings of free agents here and in the enclosing places up to date with the given person."""
+        if person in self.positions:
+            listed = person in self.free_agent_positions
+            if person.player.free_agent and not listed:
+                self._add_free_agent(person)
+            elif listed and not person.player.free_agent:
+                self._remove_free_agent(person)
+        if self.parent is not None:
+            self.parent.update_free_agency(person)
+
+    def _add_free_agent(self, person):
+        """List the given person as a free agent here."""
+        self.free_agent_positions[person] = len(self.free_agent_people)
+        self.free_agent_people.append(person)
+        if self.market is not None:
+            self.market.add(player=person.player)
+
+    def _remove_free_agent(self, person):
+        """Remove the given person from the listing of free agents here."""
+        position = self.free_agent_positions.pop(person)
+        last_person = self.free_agent_people.pop()
+        if last_person is not person:
+            self.free_agent_people[position] = last_person
+            self.free_agent_positions[last_person] = position
+
+    def random_person(self):
+        """Return a random person in this registry."""
+        return random.choice(self.people)
+
+    def sample(self, k):
+        """Return a random sample of (at most) k people in this registry."""
+        return random.sample(self.people, min(k, len(self.people)))
+
+    @property
+    def free_agents(self):
+        """Return all the baseball players in this registry that are not under contract."""
+        return {person.player for person in self.free_agent_people}
+
+    def sample_free_agents(self, k):
+        """Return a random sample of (at most) k of the baseball players in this registry that are not under contract."""
+        return [
+            person.player for person in
+            random.sample(self.free_agent_people, min(k, len(self.free_agent_people)))
+        ]
+
+
+class ResidentSet(set):
+    """The set of residents of a city, which keeps that city's population registry up to date."""
+
+    def __init__(self, iterable=(), registry=None):
+        """Initialize a ResidentSet object.
+
+        @param iterable: People to initialize the set with (these will not be added to the registry).
+        @param registry: The PopulationRegistry of the city whose residents these are.
+        """
+        super(ResidentSet, self).__init__(iterable)
+        self.registry = registry
+
+    def add(self, person):
+        """Add a resident."""
+        super(ResidentSet, self).add(person)
+        self.registry.add(person)
+
+    def remove(self, person):
+        """Remove a resident."""
+        super(ResidentSet, self).remove(person)
+        self.registry.remove(person)
+
+    def discard(self, person):
+        """Remove a resident, if they are one."""
+        if person in self:
+            self.remove(person)
@@ -68,4 +68,9 @@ c.progress(until=(1901, 1, 1))
 # print game
 # game._transpire()
 
-# c = Cosmos(); c._advance_n_timesteps(300); from baseball.league import League; League(max(c.cities, key=lambda c: c.pop))
\ No newline at end of file
+# c = Cosmos(); c._advance_n_timesteps(300); from baseball.league import League; League(max(c.cities, key=lambda c: c.pop))
+# Save a snapshot of the cosmos, which can later be restored (or forked into variants) instead of
+# progressing a fresh cosmos all over again
+# c.save('cosmos_1901.snapshot')
+# c = Cosmos.load('cosmos_1901.snapshot')
+# variant_a, variant_b = c.fork(n_variants=2)
@@ -0,0 +1,104 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import cPickle as pickle
+import benchmark
+from cosmos import Cosmos
+
+
+# The seed of the benchmark cosmos that the test season is played in, the date the season is played
+# from, and the number of days that are compared
+SEED = 1854
+START = (1700, 5, 1)
+NUMBER_OF_DAYS = 14
+
+
+def operate_league(league, number_of_days):
+    """Advance time by the given number of days, having only the given league conduct its operations.
+
+    The rest of the cosmos is left as it is, since the everyday lives of its people (who iterate over
+    sets of objects created along the way, whose order varies from process to process) wouldn't play
+    out the same in any two processes, whether games were played in parallel or not.
+    """
+    cosmos = league.cosmos
+    with cosmos.random_stream.activate():
+        for _ in xrange(2*number_of_days):
+            cosmos._advance_time()
+            league.operate()
+
+
+def summarize(league):
+    """Return a summary of everything that a league's games have left behind, to be compared across runs."""
+    cosmos = league.cosmos
+    players = sorted((player for team in league.teams for player in team.players), key=lambda p: p.person.id)
+    return {
+        'results': list(league.season.results),
+        'records': [cosmos.play_log.read(game.play_log_entry) for team in league.teams for game in team.season.games],
+        'players': [
+            (
+                player.person.id, list(player.career.statistics.totals), player.person.mood.composure,
+                player.person.personality.confidence, player.career.statistics.left_on_base
+            )
+            for player in players
+        ],
+        'umpires': sorted((umpire.person.id, list(umpire.career.statistics.totals)) for umpire in league.umpires),
+        'batters': [team.roster.batter.person.id if team.roster.batter else None for team in league.teams],
+        'leaders': [
+            [(player.person.id, value) for player, value in league.season.leaderboards.leaders(category, n=10)]
+            for category in ('batting_average', 'home_runs', 'rbi', 'pitching_strikeouts', 'pitching_wins')
+        ],
+    }
+
+
+class TestGamePool(unittest.TestCase):
+    """Tests of playing a league's games across worker processes (see baseball/game_pool.py)."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generate the benchmark cosmos as of 1700."""
+        cls.directory = tempfile.mkdtemp()
+        benchmark.generate_snapshot(seed=SEED, snapshot_directory=cls.directory, year=1700)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Delete the snapshot of the benchmark cosmos."""
+        shutil.rmtree(cls.directory)
+
+    def test_parallel_games_play_out_as_serial_games_do(self):
+        """Test that a league's games play out exactly the same whether they're played serially or in parallel.
+
+        The process is forked once the season is underway, so that the serial run (in the child) and the
+        parallel run (in the parent) start out from the very same state.
+        """
+        cosmos = Cosmos.load(os.path.join(self.directory, 'cosmos_{seed}_1700.snapshot'.format(seed=SEED)))
+        cosmos.debug = False
+        cosmos.config.play_league_games_headlessly = True
+        random.seed(SEED)
+        league = benchmark.form_benchmark_league(cosmos=cosmos)
+        cosmos.progress(until=START)
+        number_of_games_before = len(league.season.results)
+        path_to_serial_summary = os.path.join(self.directory, 'serial')
+        pid = os.fork()
+        if pid == 0:
+            try:
+                cosmos.config.number_of_game_worker_processes = 1
+                operate_league(league=league, number_of_days=NUMBER_OF_DAYS)
+                with open(path_to_serial_summary, 'wb') as f:
+                    pickle.dump(summarize(league=league), f, 2)
+            finally:
+                os._exit(0)
+        cosmos.config.number_of_game_worker_processes = 2
+        operate_league(league=league, number_of_days=NUMBER_OF_DAYS)
+        os.waitpid(pid, 0)
+        parallel_summary = summarize(league=league)
+        with open(path_to_serial_summary, 'rb') as f:
+            serial_summary = pickle.load(f)
+        self.assertGreater(len(parallel_summary['results']), number_of_games_before)
+        for key in sorted(serial_summary):
+            self.assertEqual(serial_summary[key], parallel_summary[key], msg=key)
+
+
+if __name__ == '__main__':
+    unittest.main()
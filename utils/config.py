@@ -49,7 +49,7 @@ class Config(object):
             BaseballTeamOwner, BaseballManager, BaseballScout
         )
         #       LEAGUE FORMATION/EXPANSION/ETC.
-        self.city_utility_to_a_league = lambda city: len(city.residents)*2
+        self.city_utility_to_a_league = lambda city: city.population*2
         self.city_utility_penalty_for_already_being_in_league = 0.1
         self.chance_a_city_accepts_offer_to_join_league = lambda city: 0.8/(len(city.teams)+1)
         self.number_of_charter_teams_for_a_league = lambda year: random.choice([6, 8, 10, 12])  # TODO make this cooler
@@ -96,6 +96,12 @@ class Config(object):
         )
         #       ROSTER LIMITS
         self.temp_roster_limit = 14  # TODO YOU HAVE DATA TO MAKE THIS BETTER; USE BASEBALL.CLASS.PY
+        # When securing a player, a scout considers the best free agent in his team's state, along with
+        # this many free agents drawn at random from around the country
+        self.number_of_free_agents_a_scout_considers_from_around_the_country = 1000
+        # If his team's state has fewer free agents than this, a scout turns to the prospects of the
+        # state's cities that are being simulated in aggregate (see simulate_minor_cities_in_aggregate)
+        self.minimum_number_of_free_agents_in_a_state_before_scouting_aggregate_cities = 50
         #       NAMES
         # League names
         self.countrywide_baseball_league_prefixes = (
@@ -134,8 +140,45 @@ class Config(object):
         self.determine_opening_day = lambda: [4, random.randint(10, 22)]
         self.determine_regular_season_terminus = lambda: [10, random.randint(2, 8)]
         self.chance_of_a_doubleheader = lambda year: 0.1  # TODO GREAT ARTICLES EXIST ABOUT THIS
+        # Whether leagues play their games headlessly by default, i.e., with the very same on-field
+        # play, but without audiences, radio broadcasts, or box scores (unless one is asked for), which
+        # is much faster for simulating seasons in bulk; a league (or a season) may override this
+        self.play_league_games_headlessly = False
+        # Whether the play-by-play of every game is recorded to the cosmos's play log, from which
+        # any game's at-bats, box score, or play-by-play call may be rebuilt (see play_log.py)
+        self.record_play_by_play = True
+        # Box scores are composed only when they're asked for, and the most recently read ones are
+        # held in a cache of this many (see printout.BoxScoreCache)
+        self.box_score_cache_max_size = 200
+        # The number of worker processes across which a day's headless league games may be played
+        # in parallel (see game_pool.GamePool); if this is 1, they're played serially
+        self.number_of_game_worker_processes = 1
+        # The attention paid to a game played in a given year (see Game._init_determine_fidelity());
+        # nobody was paying much attention to the games played before baseball was formalized
+        self.attention_paid_to_a_game = lambda year: 0.25 if year < 1845 else 1.0
+        # Games that are paid less attention than this are played out with surrogate at-bats, whose
+        # outcomes are sampled from a model fitted to full-fidelity at-bats (see surrogate.py), so long
+        # as the cosmos has such a model (cosmos.at_bat_surrogate); otherwise, every game gets full fidelity
+        self.minimum_attention_paid_to_a_game_for_full_fidelity = 0.5
+        # Until it has a surrogate model, the cosmos gathers observations of the at-bats of its full-fidelity
+        # games, and once it has this many, it fits a model to them and installs it (see
+        # Cosmos.fit_at_bat_surrogate()); if this is None, a model is only ever fitted on request
+        self.number_of_at_bats_to_fit_an_at_bat_surrogate_from = 20000
+        #       LEADERBOARDS
+        # To qualify for a season's batting title, a player needs this many plate appearances per
+        # game his team has played; to appear among the career batting-average leaders, he needs
+        # this many career hits
+        self.minimum_plate_appearances_per_team_game_to_qualify_for_batting_title = 3.1
+        self.minimum_career_hits_to_qualify_for_batting_average_leaderboard = 100
         #       BASEBALL FANDOM
         self.chance_someone_goes_to_a_local_game = 0.1
+        #       BATTED-BALL PHYSICS
+        # Batted-ball trajectories are cached, keyed by launch conditions quantized to these
+        # resolutions; the launch conditions of a batted ball get snapped to them, so that cached
+        # trajectories are exact (a resolution of 0 turns off quantization for that quantity)
+        self.trajectory_cache_exit_speed_resolution = 0.5  # mph
+        self.trajectory_cache_launch_angle_resolution = 0.5  # Degrees
+        self.trajectory_cache_max_size = 10000  # Number of trajectories (each takes up about 3 KB)
         #       ATTRIBUTES (this jazz was determined empirically)
         self.set_percentage_above_or_below_average = lambda diff_from_avg: abs(normal(0, diff_from_avg))
         # Intangibles
@@ -206,6 +249,18 @@ class Config(object):
             Farm
         )
         self.desired_maximum_number_of_npcs_in_minor_cities = 15
+        # Minor cities that have no baseball team, ballpark, or player attention may be simulated as
+        # aggregate demographic models (counts of people by birth year, sex, and occupation), rather
+        # than as full-fledged towns, until something promotes them to full detail; this is off by
+        # default, since a promoted city is filled with people who have no families or histories
+        self.simulate_minor_cities_in_aggregate = False
+        self.occupations_in_aggregate_minor_cities = (
+            # (Occupation, relative frequency)
+            (Farmer, 4), (Farmhand, 4), (Owner, 1), (Laborer, 2), (Cashier, 1), (Blacksmith, 1)
+        )
+        self.chance_a_woman_gives_birth_some_year_in_an_aggregate_minor_city = 0.12
+        self.age_range_of_prospects_in_aggregate_minor_cities = (16, 30)  # Males in this range are prospects
+        self.max_number_of_growth_attempts_when_a_minor_city_is_promoted = 10
         self.number_of_neighbors_needed_to_never_leave_town = 50
         self.max_number_of_miles_to_travel_a_town_over = lambda year: 15 if year < 1915 else 70
         self.year_air_travel_becomes_prominent = 1955
@@ -0,0 +1,145 @@
+import json
+import time
+
+
+class Instrumentation(object):
+    """An instrumentation layer that times named spans and tallies counters, year by year.
+
+    Spans nest, and each is recorded under the full path of spans that enclose it, e.g.,
+    ('simulate cities', 'socialize'), so that per-year summaries can be dumped either as JSON
+    or as a collapsed-stack file that flame-graph tools can render. When instrumentation is
+    disabled, span() returns a shared no-op context manager and count() returns immediately.
+    """
+
+    def __init__(self, enabled=False):
+        """Initialize an Instrumentation object."""
+        self.enabled = enabled
+        self.year = None
+        # Maps each year to a dictionary mapping span paths (tuples of span names) to a
+        # [total seconds, seconds spent in child spans, number of calls] list
+        self.spans_by_year = {}
+        # Maps each year to a dictionary mapping counter names to counts
+        self.counters_by_year = {}
+        # The spans that are currently open, innermost last, as [name, start time, child seconds] lists
+        self._open_spans = []
+
+    def begin_year(self, year):
+        """Begin attributing spans and counts to the given year."""
+        self.year = year
+
+    def span(self, name):
+        """Return a context manager that times a span with the given name."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(instrumentation=self, name=name)
+
+    def count(self, name, n=1):
+        """Increment the counter with the given name."""
+        if not self.enabled:
+            return
+        counters = self.counters_by_year.setdefault(self.year, {})
+        counters[name] = counters.get(name, 0) + n
+
+    def absorb(self, spans_by_year, counters_by_year):
+        """Add in the spans and counts recorded by another instrumentation layer (e.g., one in a worker process)."""
+        for year, spans in spans_by_year.iteritems():
+            records = self.spans_by_year.setdefault(year, {})
+            for path, (seconds, child_seconds, calls) in spans.iteritems():
+                record = records.setdefault(path, [0.0, 0.0, 0])
+                record[0] += seconds
+                record[1] += child_seconds
+                record[2] += calls
+        for year, counters in counters_by_year.iteritems():
+            counts = self.counters_by_year.setdefault(year, {})
+            for name, n in counters.iteritems():
+                counts[name] = counts.get(name, 0) + n
+
+    def _open_span(self, name):
+        """Open a span."""
+        self._open_spans.append([name, time.time(), 0.0])
+
+    def _close_span(self):
+        """Close the innermost open span and record it."""
+        name, start_time, child_seconds = self._open_spans[-1]
+        seconds = time.time() - start_time
+        path = tuple(span[0] for span in self._open_spans)
+        self._open_spans.pop()
+        if self._open_spans:
+            self._open_spans[-1][2] += seconds
+        record = self.spans_by_year.setdefault(self.year, {}).setdefault(path, [0.0, 0.0, 0])
+        record[0] += seconds
+        record[1] += child_seconds
+        record[2] += 1
+
+    def summary(self):
+        """Return a dictionary summarizing, for each year, the time and calls per span and the counts per counter."""
+        summary = {}
+        for year in sorted(set(self.spans_by_year) | set(self.counters_by_year)):
+            spans = {}
+            for path, (seconds, child_seconds, calls) in self.spans_by_year.get(year, {}).iteritems():
+                spans[';'.join(path)] = {
+                    'seconds': seconds, 'self_seconds': seconds-child_seconds, 'calls': calls
+                }
+            summary[year] = {'spans': spans, 'counters': dict(self.counters_by_year.get(year, {}))}
+        return summary
+
+    def dump_json(self, path):
+        """Write the per-year summary to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2, sort_keys=True)
+
+    def dump_collapsed_stacks(self, path, year=None):
+        """Write a collapsed-stack file (one 'span;span;span microseconds' line per path) for flame graphs.
+
+        @param path: The path to write the file to.
+        @param year: The year to dump; if None, all years are aggregated.
+        """
+        self_microseconds = {}
+        years = [year] if year is not None else self.spans_by_year.keys()
+        for y in years:
+            for span_path, (seconds, child_seconds, _) in self.spans_by_year.get(y, {}).iteritems():
+                self_microseconds[span_path] = (
+                    self_microseconds.get(span_path, 0) + int(round((seconds-child_seconds)*1000000))
+                )
+        with open(path, 'w') as f:
+            for span_path in sorted(self_microseconds):
+                f.write('{} {}\n'.format(';'.join(span_path), self_microseconds[span_path]))
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        self.spans_by_year = {}
+        self.counters_by_year = {}
+
+
+class Span(object):
+    """A context manager that times a span for an Instrumentation object."""
+
+    def __init__(self, instrumentation, name):
+        """Initialize a Span object."""
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        """Open this span."""
+        self.instrumentation._open_span(name=self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close this span."""
+        self.instrumentation._close_span()
+        return False
+
+
+class NullSpan(object):
+    """A context manager that does nothing, which is handed out when instrumentation is disabled."""
+
+    def __enter__(self):
+        """Do nothing."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Do nothing."""
+        return False
+
+
+NULL_SPAN = NullSpan()
@@ -0,0 +1,88 @@
+import array
+import random
+import hashlib
+
+
+class RandomStream(object):
+    """An independent, seeded stream of random numbers for one unit of the simulation.
+
+    Streams form a hierarchy (e.g., cosmos -> city, cosmos -> league -> game): each child's seed is
+    derived deterministically from its parent's seed and a key naming the child, so a unit's stream
+    doesn't depend on how many numbers any other unit has drawn. This means that simulating units in
+    a different order (or in parallel) yields identical results, and that a unit, e.g., a single game,
+    can be re-simulated in isolation from its seed.
+
+    Nearly all of the simulation draws from the module-level functions in 'random', so rather than
+    threading a generator through every call, a stream is activated around the work of its unit:
+    activation swaps the stream's state into the global generator, and deactivation swaps it back
+    out (restoring whatever stream was active before, so activations may nest).
+    """
+
+    def __init__(self, seed):
+        """Initialize a RandomStream object.
+
+        @param seed: An integer seed for this stream.
+        """
+        self.seed = seed
+        # The state of this stream's generator, which gets set the first time it's deactivated;
+        # until then, activating the stream seeds the global generator from self.seed. This
+        # is stored compactly (see compact_state()), since there may be many streams.
+        self.state = None
+
+    def spawn(self, *key):
+        """Return a child stream whose seed is derived from this stream's seed and the given key."""
+        return RandomStream(seed=derive_seed(self.seed, *key))
+
+    def activate(self):
+        """Return a context manager under which the global generator draws from this stream."""
+        return StreamActivation(stream=self)
+
+    def release(self):
+        """Discard this stream's state (e.g., once its unit is finished), keeping only its seed."""
+        self.state = None
+
+
+class StreamActivation(object):
+    """A context manager that swaps a stream's state into the global random-number generator."""
+
+    def __init__(self, stream):
+        """Initialize a StreamActivation object."""
+        self.stream = stream
+        self.state_before_activation = None
+
+    def __enter__(self):
+        """Activate the stream."""
+        self.state_before_activation = random.getstate()
+        if self.stream.state is None:
+            random.seed(self.stream.seed)
+        else:
+            random.setstate(expand_state(self.stream.state))
+        return self.stream
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Deactivate the stream, restoring the state the global generator was in beforehand."""
+        self.stream.state = compact_state(random.getstate())
+        random.setstate(self.state_before_activation)
+        self.state_before_activation = None
+        return False
+
+
+def derive_seed(parent_seed, *key):
+    """Return a seed derived deterministically from a parent seed and a key."""
+    digest = hashlib.sha1(repr((parent_seed,) + key)).hexdigest()
+    return int(digest[:16], 16)
+
+
+def compact_state(state):
+    """Return a compact version of a state returned by random.getstate().
+
+    The generator's internal state is a tuple of 625 Python ints, which we pack into an array.
+    """
+    version, internal_state, gauss_next = state
+    return version, array.array('L', internal_state), gauss_next
+
+
+def expand_state(compacted_state):
+    """Return a state that random.setstate() accepts, given a state compacted by compact_state()."""
+    version, internal_state, gauss_next = compacted_state
+    return version, tuple(internal_state), gauss_next
@@ -0,0 +1,77 @@
+import math
+import heapq
+import random
+
+
+class SimulationScheduler(object):
+    """A priority-queue scheduler for the recurring work that gets done in each city.
+
+    Rather than rolling dice for every city on every timestep to decide whether some kind of
+    work (e.g., population manipulation) happens there, the scheduler samples the number of
+    timesteps until that work next comes due from the geometric distribution matching its
+    per-timestep chance of occurring. The main loop then only touches cities that have work due,
+    which gives the same statistical behavior as rolling dice every timestep.
+    """
+
+    def __init__(self, chances):
+        """Initialize a SimulationScheduler object.
+
+        @param chances: A list of (tag, chance) tuples specifying each kind of recurring work and
+                        the per-timestep chance of it occurring in a given city; work items that
+                        come due for a city on the same timestep are issued in this order.
+        """
+        self.chances = chances
+        # The current timestep; this gets incremented by advance(), which the cosmos
+        # calls every time it advances its time of day
+        self.timestep = 0
+        # A heap of (timestep due, city number, work number, city) tuples; the city number
+        # preserves the order in which cities were established, so that work due on the same
+        # timestep is carried out in the same order as if we were looping over all cities
+        self.queue = []
+        self.number_of_cities_scheduled = 0
+
+    def __len__(self):
+        """Return the number of work items currently scheduled."""
+        return len(self.queue)
+
+    def advance(self):
+        """Advance to the next timestep."""
+        self.timestep += 1
+
+    def schedule_city(self, city):
+        """Begin scheduling recurring work for a newly established city.
+
+        Work may come due for the city as soon as the current timestep.
+        """
+        city_number = self.number_of_cities_scheduled
+        self.number_of_cities_scheduled += 1
+        for work_number in xrange(len(self.chances)):
+            self._schedule(city=city, city_number=city_number, work_number=work_number, earliest=self.timestep)
+
+    def _schedule(self, city, city_number, work_number, earliest):
+        """Schedule the next occurrence of some kind of work in a city, no sooner than the given timestep."""
+        chance = self.chances[work_number][1]
+        if chance <= 0:
+            return  # This work never happens
+        timestep_due = earliest + self.sample_number_of_timesteps_until_success(chance=chance)
+        heapq.heappush(self.queue, (timestep_due, city_number, work_number, city))
+
+    @staticmethod
+    def sample_number_of_timesteps_until_success(chance):
+        """Return the number of failed per-timestep dice rolls that would precede the first success.
+
+        This is a draw from a geometric distribution, which we sample by inverse transform.
+        """
+        if chance >= 1.0:
+            return 0
+        return int(math.log(1.0 - random.random()) / math.log(1.0 - chance))
+
+    def work_due_now(self):
+        """Generate (tag, city) tuples for all work due this timestep, in order.
+
+        Each work item is rescheduled as it's issued, so every item is issued exactly once.
+        """
+        while self.queue and self.queue[0][0] <= self.timestep:
+            _, city_number, work_number, city = heapq.heappop(self.queue)
+            self._schedule(city=city, city_number=city_number, work_number=work_number, earliest=self.timestep+1)
+            yield self.chances[work_number][0], city
@@ -0,0 +1,127 @@
+import weakref
+import datetime
+
+
+MONTH_NAMES = (
+    None, "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December"
+)
+
+
+class Calendar(object):
+    """A calendar service that converts ordinal dates and hands out shared date objects.
+
+    The calendar caches the year, month, and day of each ordinal date (computing a whole year's
+    worth at a time), so that datetime.date.fromordinal() needn't be called over and over, and it
+    interns Date objects, so that every event (and whereabout, relationship, etc.) recorded on a
+    given timestep shares a single date object, whose pretty-printed string is only composed if
+    it's ever actually needed.
+    """
+
+    def __init__(self):
+        """Initialize a Calendar object."""
+        self.year_month_and_day = {}  # Maps ordinal dates to (year, month, day) tuples
+        # Maps (ordinal date, time of day) tuples to Date objects; dates that nothing
+        # references any longer will drop out of this
+        self.dates = weakref.WeakValueDictionary()
+
+    def __getstate__(self):
+        """Return the state of this calendar that will be serialized when the cosmos is saved."""
+        return {}
+
+    def __setstate__(self, state):
+        """Restore this calendar (with empty caches)."""
+        self.__init__()
+
+    def ymd(self, ordinal_date):
+        """Return the year, month, and day of the given ordinal date."""
+        try:
+            return self.year_month_and_day[ordinal_date]
+        except KeyError:
+            self._cache_the_year_containing(ordinal_date=ordinal_date)
+            return self.year_month_and_day[ordinal_date]
+
+    def _cache_the_year_containing(self, ordinal_date):
+        """Cache the year, month, and day of every ordinal date in the year containing the given one."""
+        year = datetime.date.fromordinal(ordinal_date).year
+        ordinal_date_on_jan_1 = datetime.date(year, 1, 1).toordinal()
+        ordinal_date_on_jan_1_of_next_year = datetime.date(year+1, 1, 1).toordinal()
+        for ordinal in xrange(ordinal_date_on_jan_1, ordinal_date_on_jan_1_of_next_year):
+            date = datetime.date.fromordinal(ordinal)
+            self.year_month_and_day[ordinal] = (date.year, date.month, date.day)
+
+    def date(self, ordinal_date, time_of_day):
+        """Return the (shared) Date object for the given ordinal date and time of day."""
+        key = (ordinal_date, time_of_day)
+        date = self.dates.get(key)
+        if date is None:
+            year, month, day = self.ymd(ordinal_date=ordinal_date)
+            date = Date(ordinal_date=ordinal_date, time_of_day=time_of_day, year=year, month=month, day=day)
+            self.dates[key] = date
+        return date
+
+
+class Date(object):
+    """A date and time of day, e.g., 'Day of August 19, 1599'.
+
+    Date objects stand in for the pretty-printed date strings that used to be stored on events
+    (and elsewhere): they behave like those strings when printed, formatted, sliced, concatenated,
+    or compared, but the string itself is only composed the first time it's needed.
+    """
+
+    __slots__ = ('ordinal_date', 'time_of_day', 'year', 'month', 'day', '_string', '__weakref__')
+
+    def __init__(self, ordinal_date, time_of_day, year, month, day):
+        """Initialize a Date object."""
+        self.ordinal_date = ordinal_date
+        self.time_of_day = time_of_day
+        self.year = year
+        self.month = month
+        self.day = day
+        self._string = None
+
+    def __str__(self):
+        """Return string representation."""
+        if self._string is None:
+            self._string = "{} of {} {}, {}".format(
+                self.time_of_day.title(), MONTH_NAMES[self.month], self.day, self.year
+            )
+        return self._string
+
+    def __repr__(self):
+        """Return the representation of this date."""
+        return repr(str(self))
+
+    def __format__(self, format_spec):
+        """Return this date formatted as a string."""
+        return format(str(self), format_spec)
+
+    def __len__(self):
+        """Return the length of this date's string representation."""
+        return len(str(self))
+
+    def __getitem__(self, key):
+        """Index or slice this date's string representation."""
+        return str(self)[key]
+
+    def __add__(self, other):
+        """Concatenate this date's string representation with a string."""
+        return str(self) + other
+
+    def __radd__(self, other):
+        """Concatenate a string with this date's string representation."""
+        return other + str(self)
+
+    def __eq__(self, other):
+        """Return whether this date is the same as another date (or date string)."""
+        if isinstance(other, Date):
+            return (self.ordinal_date, self.time_of_day) == (other.ordinal_date, other.time_of_day)
+        return str(self) == other
+
+    def __ne__(self, other):
+        """Return whether this date differs from another date (or date string)."""
+        return not self == other
+
+    def __hash__(self):
+        """Return a hash consistent with this date's string representation."""
+        return hash(str(self))